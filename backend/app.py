@@ -1,15 +1,63 @@
-from flask import Flask, request, jsonify, send_from_directory
+import time
+
+_import_started = time.perf_counter()
+
+from flask import Flask, Request, Response, g, request, jsonify, send_file, send_from_directory
 from flask_cors import CORS
 import os
 import logging
+import shutil
+import uuid
+import numpy as np
 from werkzeug.utils import secure_filename
 from config import Config
 from database.db_connection import DatabaseConnection
 from services.csv_processor import CSVProcessor
+from services.inverse_solver import InverseSolver
 from services.corrosion_calculator import CorrosionRateCalculator
 from services.model_trainer import CorrosionModelTrainer
+from services.background_jobs import BackgroundJobManager
+from services.cache_registry import CacheRegistry
+from services.calculation_cache import CalculationCache
+from services.chart_renderer import ChartRenderer
+from services.metrics import Metrics
+from services.rate_percentiles import DEFAULT_FRACTIONS, GROUPINGS, RatePercentiles
+from services.remaining_life import RemainingLifeEngine, csv_chunks, database_chunks, parquet_chunks
+from services.request_profiler import RequestProfiler
+from services.sample_reservoir import SampleReservoir
+from services.sensitivity import SensitivityAnalysis
+from services.startup import Startup
+from services.statistics_series import SERIES, StatisticsSeries
+from services.table_reader import FORMATS as TABLE_FORMATS
+from services.uncertainty import UncertaintyPropagation
+from services.sample_queries import (
+    DATA_VERSION_QUERY,
+    MATERIALS_QUERY,
+    MEDIUMS_QUERY,
+    STATISTICS_QUERIES,
+    build_samples_count_query,
+    build_samples_query,
+    data_version,
+    json_safe_rows,
+    medium_names,
+    merge_materials,
+    parse_sample_filters,
+)
+
+class _Request(Request):
+    """Request with a larger upload limit for the routes that take long time series."""
+
+    LARGE_UPLOAD_ENDPOINTS = {'remaining_life'}
+
+    @property
+    def max_content_length(self):
+        if self.endpoint in self.LARGE_UPLOAD_ENDPOINTS:
+            return Config.LIFE_MAX_CONTENT_LENGTH
+        return super().max_content_length
+
 
 app = Flask(__name__)
+app.request_class = _Request
 CORS(app)
 app.config['UPLOAD_FOLDER'] = Config.UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = Config.MAX_CONTENT_LENGTH
@@ -23,33 +71,90 @@ logger = logging.getLogger(__name__)
 
 db = DatabaseConnection()
 
-CURATED_MATERIALS = [
-    'API 5L X65',
-    'Carbon Steel',
-    'Stainless Steel 316',
-    'Duplex Stainless Steel',
-    'Low Alloy Steel',
-]
+@app.before_request
+def _start_request_timer():
+    g.request_started = time.perf_counter()
+    if RequestProfiler.enabled and RequestProfiler.should_profile(request.path, request.headers):
+        g.profiler = RequestProfiler.start()
+
+
+@app.after_request
+def _record_request_metrics(response):
+    started = g.get('request_started')
+    if started is not None:
+        duration = time.perf_counter() - started
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        Metrics.http_request_duration.observe(
+            duration, route, request.method, response.status_code
+        )
+        profiler = g.pop('profiler', None)
+        if profiler is not None:
+            profile_id = RequestProfiler.finish(
+                profiler, route, request.method, response.status_code, duration
+            )
+            if profile_id:
+                response.headers['X-Profile-Id'] = profile_id
+    return response
+
+
+@app.teardown_request
+def _finish_abandoned_profiler(exc):
+    """Stop a profiler that after_request never reached (unhandled exception), so the next one can start."""
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        duration = time.perf_counter() - g.get('request_started', time.perf_counter())
+        RequestProfiler.finish(profiler, route, request.method, 500, duration)
 
 
-def _json_safe_rows(rows):
-    """Convert Decimal values returned by MySQL into JSON-safe floats."""
-    import decimal
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Expose process metrics in the Prometheus text format."""
+    return Response(Metrics.render(), mimetype='text/plain; version=0.0.4')
 
-    for row in rows:
-        for key, value in row.items():
-            if isinstance(value, decimal.Decimal):
-                row[key] = float(value)
-    return rows
+@app.route('/api/profiles', methods=['GET'])
+def list_profiles():
+    """List saved request profiles, newest first."""
+    if not RequestProfiler.is_authorized(request.headers):
+        return jsonify({'error': 'Profiling access denied'}), 403
+    return jsonify({'profiles': RequestProfiler.list_profiles()}), 200
+
+
+@app.route('/api/profiles/<profile_id>', methods=['GET'])
+def get_profile(profile_id):
+    """Download a saved profile as a pstats file, or as text with ?format=text."""
+    if not RequestProfiler.is_authorized(request.headers):
+        return jsonify({'error': 'Profiling access denied'}), 403
+    path = RequestProfiler.profile_path(profile_id)
+    if not path:
+        return jsonify({'error': 'Profile not found'}), 404
+    if request.args.get('format') == 'text':
+        try:
+            limit, sort_by = RequestProfiler.parse_text_options(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        return Response(RequestProfiler.render_text(path, limit, sort_by), mimetype='text/plain')
+    return send_file(
+        os.path.abspath(path),
+        mimetype='application/octet-stream',
+        as_attachment=True,
+        download_name=f"{profile_id}.prof",
+    )
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
     return jsonify({'status': 'healthy', 'message': 'Corrosion Rate API is running'})
 
+@app.route('/api/ready', methods=['GET'])
+def readiness_check():
+    """Readiness endpoint: 200 once the start-up warm-up has completed."""
+    report = Startup.report(model_version=CorrosionRateCalculator.model_version())
+    return jsonify(report), 200 if report['ready'] else 503
+
 @app.route('/api/upload-csv', methods=['POST'])
 def upload_csv():
-    """Upload and process CSV file"""
+    """Upload and process a CSV, Parquet or Arrow IPC file"""
     try:
         if 'file' not in request.files:
             return jsonify({'error': 'No file provided'}), 400
@@ -58,14 +163,14 @@ def upload_csv():
         if file.filename == '':
             return jsonify({'error': 'No file selected'}), 400
         
-        if file and file.filename.endswith('.csv'):
+        if file and os.path.splitext(file.filename)[1].lower() in TABLE_FORMATS:
             filename = secure_filename(file.filename)
             filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
             file.save(filepath)
             
-            # Process CSV
+            # Process the file (columnar formats are read selectively)
             processor = CSVProcessor()
-            processed_data = processor.process_corrosion_csv(filepath)
+            processed_data = processor.process_corrosion_file(filepath)
 
             try:
                 upload_query = """
@@ -80,6 +185,7 @@ def upload_csv():
                 logger.error(f"Error saving upload metadata: {e}")
             
             # Save to database
+            save_started = time.perf_counter()
             saved_count = 0
             for data in processed_data:
                 try:
@@ -107,6 +213,17 @@ def upload_csv():
                 except Exception as e:
                     logger.error(f"Error saving record: {e}")
                     continue
+
+            save_seconds = time.perf_counter() - save_started
+            Metrics.upload_rows.inc(amount=saved_count)
+            if save_seconds > 0:
+                Metrics.upload_rows_per_second.set(value=saved_count / save_seconds)
+
+            # Fold the new rows into the percentile sketches
+            try:
+                RatePercentiles.catch_up(db)
+            except Exception as e:
+                logger.warning(f"Could not update percentile sketches: {e}")
             
             return jsonify({
                 'message': 'File uploaded and processed successfully',
@@ -114,7 +231,7 @@ def upload_csv():
                 'rows_saved': saved_count
             }), 200
         
-        return jsonify({'error': 'Invalid file type. Please upload a CSV file'}), 400
+        return jsonify({'error': 'Invalid file type. Please upload a CSV, Parquet or Arrow file'}), 400
         
     except Exception as e:
         logger.error(f"Error uploading CSV: {e}")
@@ -122,9 +239,16 @@ def upload_csv():
 
 @app.route('/api/calculate-corrosion-rate', methods=['POST'])
 def calculate_corrosion_rate():
-    """Calculate corrosion rate from input parameters"""
+    """
+    Calculate corrosion rate from input parameters.
+    Inputs given as distributions (or a 'monte_carlo' options object) switch to
+    a Monte Carlo run that returns the rate distribution; those runs are not saved.
+    """
     try:
         data = request.json
+
+        if UncertaintyPropagation.is_probabilistic(data):
+            return _calculate_monte_carlo(data)
         
         material = data.get('material')
         temperature = data.get('temperature')
@@ -175,6 +299,167 @@ def calculate_corrosion_rate():
         return jsonify({'error': str(e)}), 500
 
 
+def _calculate_monte_carlo(data):
+    options = data.get('monte_carlo') or {}
+    if not data.get('material'):
+        return jsonify({'error': 'Material and temperature are required'}), 400
+    try:
+        percentiles = options.get('percentiles')
+        result = UncertaintyPropagation.run(
+            inputs=data,
+            material=data.get('material'),
+            medium=data.get('medium'),
+            samples=int(options.get('samples', 100_000)),
+            thresholds=options.get('thresholds') or [],
+            percentiles=percentiles if percentiles else (0.05, 0.25, 0.5, 0.75, 0.95, 0.99),
+            seed=options.get('seed'),
+        )
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({'error': f"Invalid Monte Carlo request: {e}"}), 400
+    return jsonify(result), 200
+
+
+@app.route('/api/inverse-solve', methods=['POST'])
+def inverse_solve():
+    """
+    Operating limit of one variable for a batch of target corrosion rates.
+    Body: solve_for (temperature, ph, nacl_percentage), target_rates, conditions
+    (the other variables: numbers, {"min", "max"} bands, or per-target lists),
+    optional material, medium and range [min, max].
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        result = InverseSolver.solve(
+            solve_for=data.get('solve_for'),
+            target_rates=data.get('target_rates', []),
+            conditions=data.get('conditions') or {},
+            material=data.get('material') or '',
+            medium=data.get('medium'),
+            search_range=data.get('range'),
+        )
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({'error': f"Invalid inverse-solve request: {e}"}), 400
+    except Exception as e:
+        logger.error(f"Error solving operating limits: {e}", exc_info=True)
+        return jsonify({'error': str(e)}), 500
+
+    targets = np.atleast_1d(np.asarray(data['target_rates'], dtype=float))
+    return jsonify({
+        'solve_for': result['solve_for'],
+        'bound': result['bound'],
+        'method': result['method'],
+        'model': result['model'],
+        'range': list(result['search_range']),
+        'results': [
+            {
+                'target_rate': float(target),
+                'limit': None if np.isnan(limit) else round(float(limit), 4),
+                'status': status,
+            }
+            for target, limit, status in zip(targets, result['limit'], result['status'])
+        ],
+    }), 200
+
+
+@app.route('/api/remaining-life', methods=['POST'])
+def remaining_life():
+    """
+    Cumulative wall loss and remaining life over a condition time series.
+    Either upload a CSV or Parquet file ('file', with form fields; up to
+    LIFE_MAX_CONTENT_LENGTH rather than the 16 MB of other uploads) or post
+    JSON with an asset_id whose readings are in condition_readings.
+    Parameters: allowance_mm (required), initial_loss_mm, projection_window_days.
+    """
+    upload = request.files.get('file')
+    options = request.form if upload else (request.get_json(silent=True) or {})
+    try:
+        allowance_mm = float(options['allowance_mm'])
+        initial_loss_mm = float(options.get('initial_loss_mm', 0))
+        window_days = float(options.get('projection_window_days', 365))
+    except (KeyError, TypeError, ValueError):
+        return jsonify({'error': 'allowance_mm is required; allowance_mm, initial_loss_mm and '
+                                 'projection_window_days must be numbers'}), 400
+
+    model_data = CorrosionRateCalculator._load_or_train_model()
+    if not model_data:
+        return jsonify({'error': 'No trained model is available'}), 500
+
+    filepath = None
+    try:
+        if upload:
+            extension = os.path.splitext(upload.filename or '')[1].lower()
+            if extension not in ('.csv', '.parquet'):
+                return jsonify({'error': 'Invalid file type. Please upload a CSV or Parquet file'}), 400
+            filepath = os.path.join(
+                app.config['UPLOAD_FOLDER'], f"{uuid.uuid4().hex}_{secure_filename(upload.filename)}"
+            )
+            upload.save(filepath)
+            chunks = csv_chunks(filepath) if extension == '.csv' else parquet_chunks(filepath)
+        elif options.get('asset_id'):
+            chunks = database_chunks(db, str(options['asset_id']))
+        else:
+            return jsonify({'error': 'Upload a file or give an asset_id'}), 400
+
+        started = time.perf_counter()
+        result = RemainingLifeEngine.project(
+            chunks,
+            allowance_mm=allowance_mm,
+            parameters=model_data['parameters'],
+            initial_loss_mm=initial_loss_mm,
+            projection_window_days=window_days,
+        )
+        result['model_version'] = CorrosionRateCalculator.model_version()
+        result['seconds'] = round(time.perf_counter() - started, 3)
+        return jsonify(result), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error projecting remaining life: {e}", exc_info=True)
+        return jsonify({'error': str(e)}), 500
+    finally:
+        if filepath and os.path.exists(filepath):
+            os.remove(filepath)
+
+
+@app.route('/api/sensitivity', methods=['GET'])
+def get_sensitivity():
+    """
+    First-order and total Sobol indices of temperature, pH and NaCl for the
+    trained model. Query parameters: temperature, ph, nacl_percentage as
+    'min,max' envelope ranges, samples (base sample count) and seed.
+    """
+    try:
+        envelope = SensitivityAnalysis.parse_envelope(request.args)
+        samples = int(request.args.get('samples', 2 ** 17))
+        seed = int(request.args.get('seed', 0))
+    except ValueError as e:
+        return jsonify({'error': f"Invalid sensitivity request: {e}"}), 400
+
+    model_data = CorrosionRateCalculator._load_or_train_model()
+    if not model_data:
+        return jsonify({'error': 'No trained model is available'}), 500
+    try:
+        result = SensitivityAnalysis.analyze(
+            model_data['parameters'],
+            CorrosionRateCalculator.model_version(),
+            envelope=envelope,
+            base_samples=samples,
+            seed=seed,
+        )
+        return jsonify(result), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error computing sensitivity indices: {e}", exc_info=True)
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/calculation-cache', methods=['GET'])
+def get_calculation_cache_stats():
+    """Hit/miss statistics of the calculation result cache."""
+    return jsonify(CalculationCache.stats()), 200
+
+
 @app.route('/api/model-info', methods=['GET'])
 def get_model_info():
     """Return the currently trained corrosion model metadata."""
@@ -203,49 +488,23 @@ def train_model():
 
 @app.route('/api/samples', methods=['GET'])
 def get_samples():
-    """Get all corrosion samples with optional filters"""
+    """
+    Get all corrosion samples with optional filters.
+    With count=exact or count=approx only the number of matching samples is
+    returned; approx estimates it from the sample reservoir with a 95% interval.
+    """
+    count_mode = request.args.get('count')
+    if count_mode is not None:
+        return _count_samples(count_mode)
+
     try:
-        material = request.args.get('material')
-        min_temp = request.args.get('min_temp')
-        max_temp = request.args.get('max_temp')
-        min_ph = request.args.get('min_ph')
-        max_ph = request.args.get('max_ph')
-        medium = request.args.get('medium')
-        
-        query = "SELECT * FROM corrosion_samples WHERE 1=1"
-        params = []
-        
-        if material:
-            query += " AND material LIKE %s"
-            params.append(f"%{material}%")
-        
-        if min_temp:
-            query += " AND temperature >= %s"
-            params.append(float(min_temp))
-        
-        if max_temp:
-            query += " AND temperature <= %s"
-            params.append(float(max_temp))
-        
-        if min_ph:
-            query += " AND ph >= %s"
-            params.append(float(min_ph))
-        
-        if max_ph:
-            query += " AND ph <= %s"
-            params.append(float(max_ph))
-        
-        if medium:
-            query += " AND medium LIKE %s"
-            params.append(f"%{medium}%")
-        
-        query += " ORDER BY created_at DESC LIMIT 1000"
+        query, params = build_samples_query(request.args)
         
         try:
             results = db.execute_query(query, tuple(params) if params else None)
             
             # Convert Decimal to float for JSON serialization
-            results = _json_safe_rows(results)
+            results = json_safe_rows(results)
         except Exception as db_error:
             logger.error(f"Database error in get_samples: {db_error}")
             # Check if table exists
@@ -270,118 +529,201 @@ def get_samples():
         }), 500
 
 
-@app.route('/api/clear-database', methods=['DELETE'])
-def clear_database():
-    """Clear imported samples, calculations, upload history, and uploaded files."""
+def _count_samples(mode):
+    if mode not in ('exact', 'approx'):
+        return jsonify({'error': 'count must be exact or approx'}), 400
     try:
-        deleted_counts = {}
-        deleted_counts['calculated_corrosion_rates'] = db.execute_query(
-            "DELETE FROM calculated_corrosion_rates"
-        )
-        deleted_counts['corrosion_samples'] = db.execute_query(
-            "DELETE FROM corrosion_samples"
-        )
-        deleted_counts['csv_uploads'] = db.execute_query("DELETE FROM csv_uploads")
+        filters = parse_sample_filters(request.args)
+    except ValueError:
+        return jsonify({'error': 'Temperature and pH filters must be numbers'}), 400
 
-        for table_name in (
-            'calculated_corrosion_rates',
-            'corrosion_samples',
-            'csv_uploads',
-        ):
-            try:
-                db.execute_query(f"ALTER TABLE {table_name} AUTO_INCREMENT = 1")
-            except Exception as e:
-                logger.warning(f"Could not reset AUTO_INCREMENT for {table_name}: {e}")
-
-        removed_files = 0
-        upload_dir = app.config['UPLOAD_FOLDER']
-        if os.path.isdir(upload_dir):
-            for filename in os.listdir(upload_dir):
-                file_path = os.path.join(upload_dir, filename)
-                if os.path.isfile(file_path):
-                    try:
-                        os.remove(file_path)
-                        removed_files += 1
-                    except Exception as e:
-                        logger.warning(f"Could not remove upload file {file_path}: {e}")
-
-        deleted_counts['upload_files'] = removed_files
+    try:
+        if mode == 'exact':
+            query, params = build_samples_count_query(request.args)
+            count = int(db.execute_query(query, tuple(params) if params else None)[0]['count'])
+            return jsonify({'count': count, 'approximate': False}), 200
 
+        state = SampleReservoir.snapshot(db)
+        estimate = SampleReservoir.count(state, filters)
         return jsonify({
-            'message': 'Database records cleared successfully',
-            'deleted_counts': deleted_counts
+            'count': estimate['estimate'],
+            'ci_low': estimate['ci_low'],
+            'ci_high': estimate['ci_high'],
+            'sample_hits': estimate['sample_hits'],
+            'approximate': SampleReservoir.describe(state),
         }), 200
+    except Exception as e:
+        logger.error(f"Error counting samples: {e}", exc_info=True)
+        return jsonify({'error': str(e)}), 500
+
+
+CLEARABLE_TABLES = (
+    # Children before parents so the FK from calculated_corrosion_rates stays valid.
+    'calculated_corrosion_rates',
+    'corrosion_samples',
+    'csv_uploads',
+    'rate_sketch_batches',
+)
+
+
+def _run_clear_database(report_progress):
+    """Truncate all data tables, drop uploaded files and invalidate caches."""
+    report_progress(0.05, 'Estimating row counts')
+    try:
+        # Table statistics, not COUNT(*): counting would scan every table first.
+        deleted_counts = db.estimate_row_counts(CLEARABLE_TABLES)
+    except Exception as e:
+        logger.warning(f"Could not estimate row counts: {e}")
+        deleted_counts = {table_name: None for table_name in CLEARABLE_TABLES}
+
+    # Swap the upload folder for an empty one first so new uploads are not
+    # mixed with files that are about to be deleted.
+    upload_dir = app.config['UPLOAD_FOLDER']
+    trash_dir = None
+    if os.path.isdir(upload_dir):
+        trash_dir = f"{upload_dir.rstrip(os.sep)}.trash-{uuid.uuid4().hex}"
+        os.rename(upload_dir, trash_dir)
+    os.makedirs(upload_dir, exist_ok=True)
+
+    def on_truncated(done, total, table_name):
+        report_progress(0.1 + 0.6 * done / total, f'Truncated {table_name}')
+
+    try:
+        db.truncate_tables(CLEARABLE_TABLES, progress_callback=on_truncated)
+    except Exception:
+        # The clear failed: put the uploaded files back (with any uploaded meanwhile).
+        if trash_dir:
+            for name in os.listdir(upload_dir):
+                shutil.move(os.path.join(upload_dir, name), os.path.join(trash_dir, name))
+            os.rmdir(upload_dir)
+            os.rename(trash_dir, upload_dir)
+        raise
+
+    report_progress(0.75, 'Invalidating caches')
+    deleted_counts['invalidated_caches'] = CacheRegistry.invalidate_all()
+
+    removed_files = 0
+    if trash_dir:
+        report_progress(0.8, 'Removing uploaded files')
+        removed_files = sum(len(files) for _, _, files in os.walk(trash_dir))
+        shutil.rmtree(trash_dir, ignore_errors=True)
+    deleted_counts['upload_files'] = removed_files
+
+    return {
+        'message': 'Database records cleared successfully',
+        'deleted_counts': deleted_counts,
+        # Row counts come from table statistics
+        'deleted_counts_estimated': True,
+    }
+
+
+@app.route('/api/clear-database', methods=['DELETE'])
+def clear_database():
+    """Start clearing samples, calculations, upload history and uploaded files."""
+    try:
+        # Shared, so every worker can report its progress and a second clear joins this one
+        job = BackgroundJobManager.submit('clear-database', _run_clear_database, shared=True)
+        return jsonify({
+            'message': 'Database clear started',
+            'job': job,
+            'status_url': f"/api/jobs/{job['id']}"
+        }), 202
     except Exception as e:
         logger.error(f"Error clearing database: {e}")
         return jsonify({'error': str(e)}), 500
 
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Return the status and progress of a background job."""
+    job = BackgroundJobManager.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job), 200
+
 @app.route('/api/statistics', methods=['GET'])
 def get_statistics():
-    """Get statistics for visualization"""
+    """
+    Get statistics for visualization.
+    pH and temperature series are binned and downsampled server-side;
+    query parameters: max_points, bins, bin_width.
+    approx=1 estimates everything from the sample reservoir instead, with
+    95% intervals and the sample size under 'approximate'.
+    """
     try:
-        # Corrosion rate vs pH
-        ph_query = """
-            SELECT ph, AVG(corrosion_rate_mm_per_yr) as avg_rate
-            FROM corrosion_samples
-            WHERE ph IS NOT NULL AND corrosion_rate_mm_per_yr IS NOT NULL
-            GROUP BY ph
-            ORDER BY ph
-        """
-        ph_data = db.execute_query(ph_query)
-        
-        # Corrosion rate vs Temperature
-        temp_query = """
-            SELECT temperature, AVG(corrosion_rate_mm_per_yr) as avg_rate
-            FROM corrosion_samples
-            WHERE temperature IS NOT NULL AND corrosion_rate_mm_per_yr IS NOT NULL
-            GROUP BY temperature
-            ORDER BY temperature
-        """
-        temp_data = db.execute_query(temp_query)
-        
-        # Corrosion rate vs Medium
-        medium_query = """
-            SELECT medium, AVG(corrosion_rate_mm_per_yr) as avg_rate, COUNT(*) as count
-            FROM corrosion_samples
-            WHERE medium IS NOT NULL AND corrosion_rate_mm_per_yr IS NOT NULL
-            GROUP BY medium
-            ORDER BY avg_rate DESC
-        """
-        medium_data = db.execute_query(medium_query)
-        
-        # Material comparison
-        material_query = """
-            SELECT material, AVG(corrosion_rate_mm_per_yr) as avg_rate, COUNT(*) as count
-            FROM corrosion_samples
-            WHERE material IS NOT NULL AND corrosion_rate_mm_per_yr IS NOT NULL
-            GROUP BY material
-            ORDER BY avg_rate DESC
-        """
-        material_data = db.execute_query(material_query)
-        ph_data = _json_safe_rows(ph_data)
-        temp_data = _json_safe_rows(temp_data)
-        medium_data = _json_safe_rows(medium_data)
-        material_data = _json_safe_rows(material_data)
-        
-        return jsonify({
-            'ph_vs_rate': ph_data,
-            'temperature_vs_rate': temp_data,
-            'medium_vs_rate': medium_data,
-            'material_comparison': material_data
-        }), 200
+        options = StatisticsSeries.parse_options(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        if request.args.get('approx', '').lower() in ('1', 'true'):
+            state = SampleReservoir.snapshot(db)
+            return jsonify(SampleReservoir.statistics(state, options)), 200
+
+        statistics = {}
+        resolution = {}
+        for name, column in SERIES.items():
+            range_row = db.execute_query(StatisticsSeries.range_query(column))[0]
+            query, params, plan = StatisticsSeries.series_query(column, range_row, options)
+            rows = db.execute_query(query, params) if query else []
+            statistics[name] = StatisticsSeries.build_points(column, rows, plan, options)
+            resolution[name] = StatisticsSeries.describe(plan)
+        for name, query in STATISTICS_QUERIES.items():
+            statistics[name] = json_safe_rows(db.execute_query(query))
+        statistics['resolution'] = resolution
+        return jsonify(statistics), 200
         
     except Exception as e:
         logger.error(f"Error fetching statistics: {e}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/statistics/percentiles', methods=['GET'])
+def get_rate_percentiles():
+    """
+    Corrosion-rate percentiles per group from the quantile sketches.
+    Query parameters: group (all, material, medium, condition), q (e.g. 0.5,0.9,0.99),
+    limit, mode (sketch, exact, compare).
+    """
+    grouping = request.args.get('group', 'material')
+    mode = request.args.get('mode', 'sketch')
+    if grouping not in GROUPINGS:
+        return jsonify({'error': f"group must be one of {', '.join(GROUPINGS)}"}), 400
+    if mode not in ('sketch', 'exact', 'compare'):
+        return jsonify({'error': 'mode must be sketch, exact or compare'}), 400
+    try:
+        fractions = [float(q) for q in request.args.get('q', '').split(',') if q.strip()] or list(DEFAULT_FRACTIONS)
+        limit = int(request.args.get('limit', 100))
+    except ValueError:
+        return jsonify({'error': 'q must be comma-separated fractions and limit an integer'}), 400
+    if not all(0 <= q <= 1 for q in fractions):
+        return jsonify({'error': 'q values must be between 0 and 1'}), 400
+    if limit < 1:
+        return jsonify({'error': 'limit must be at least 1'}), 400
+
+    try:
+        CacheRegistry.observe_data_version(db.execute_query(DATA_VERSION_QUERY)[0])
+        result = {'group': grouping, 'quantiles': fractions, 'mode': mode}
+        if mode == 'exact':
+            result['groups'] = RatePercentiles.exact_percentiles(db, grouping, fractions, limit)
+            return jsonify(result), 200
+
+        result['groups'] = RatePercentiles.percentiles(db, grouping, fractions, limit)
+        result['error_bound'] = RatePercentiles.error_bound()
+        if mode == 'compare':
+            result['observed_max_rank_error'] = RatePercentiles.compare_with_exact(
+                db, grouping, result['groups'], fractions
+            )
+        return jsonify(result), 200
+
+    except Exception as e:
+        logger.error(f"Error computing percentiles: {e}", exc_info=True)
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/materials', methods=['GET'])
 def get_materials():
     """Get list of available materials"""
     try:
-        query = "SELECT DISTINCT material FROM corrosion_samples WHERE material IS NOT NULL"
-        results = db.execute_query(query)
-        db_materials = [r['material'] for r in results if r.get('material')]
-        materials = list(dict.fromkeys(CURATED_MATERIALS + sorted(db_materials)))
+        materials = merge_materials(db.execute_query(MATERIALS_QUERY))
         return jsonify({'materials': materials}), 200
     except Exception as e:
         logger.error(f"Error fetching materials: {e}")
@@ -391,18 +733,61 @@ def get_materials():
 def get_mediums():
     """Get list of available mediums"""
     try:
-        query = "SELECT DISTINCT medium FROM corrosion_samples WHERE medium IS NOT NULL"
-        results = db.execute_query(query)
-        mediums = [r['medium'] for r in results if r['medium']]
+        mediums = medium_names(db.execute_query(MEDIUMS_QUERY))
         return jsonify({'mediums': mediums}), 200
     except Exception as e:
         logger.error(f"Error fetching mediums: {e}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/charts', methods=['GET'])
+def list_charts():
+    """List the charts that /api/charts/<name> can render"""
+    return jsonify({
+        'charts': ChartRenderer.chart_names(),
+        'formats': list(ChartRenderer.FORMATS),
+    }), 200
+
+@app.route('/api/charts/<name>', methods=['GET'])
+def get_chart(name):
+    """
+    Render a research chart for the current data.
+    Query parameters: width, height (pixels), dpi, format (png, svg, pdf).
+    """
+    try:
+        params = ChartRenderer.parse_params(name, request.args)
+    except KeyError:
+        return jsonify({'error': f'Unknown chart: {name}', 'charts': ChartRenderer.chart_names()}), 404
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        version_row = db.execute_query(DATA_VERSION_QUERY)[0]
+        CacheRegistry.observe_data_version(version_row)
+        version = data_version([version_row])
+        body, source = ChartRenderer.get(name, params, version)
+    except Exception as e:
+        logger.error(f"Error rendering chart {name}: {e}", exc_info=True)
+        return jsonify({'error': str(e), 'message': 'Failed to render chart'}), 500
+
+    if source == 'pending':
+        response = jsonify({'status': 'rendering', 'message': 'Chart is being rendered, retry shortly'})
+        response.headers['Retry-After'] = '2'
+        return response, 202
+    if source == 'empty':
+        return jsonify({'error': 'No data available for this chart'}), 404
+
+    response = Response(body, mimetype=ChartRenderer.FORMATS[params['format']])
+    response.headers['X-Chart-Cache'] = source
+    response.headers['X-Data-Version'] = version
+    return response
+
 @app.route('/dashboard')
 def dashboard():
     """Serve dashboard HTML page"""
     return send_from_directory('static', 'dashboard.html')
 
+Startup.record_import(time.perf_counter() - _import_started)
+
 if __name__ == '__main__':
+    Startup.warm_up(db)
     app.run(host='0.0.0.0', port=Config.FLASK_PORT, debug=(Config.FLASK_ENV == 'development'))
@@ -0,0 +1,150 @@
+"""
+asyncio serving path for the I/O-bound read endpoints.
+
+Serves ``/api/samples``, ``/api/statistics``, ``/api/materials`` and
+``/api/mediums`` with the same SQL and JSON as ``app.py``, but on an async
+database driver, so one process keeps thousands of slow clients in flight
+and the statistics queries run concurrently. Writes, uploads and
+calculations stay on the Flask app; a reverse proxy sends the read paths here.
+
+Usage:
+    hypercorn async_app:app --bind 0.0.0.0:5002
+"""
+
+import asyncio
+import logging
+import time
+
+from quart import Quart, Response, g, jsonify, request
+from quart_cors import cors
+
+from config import Config
+from database.async_db_connection import AsyncDatabaseConnection
+from services.metrics import Metrics
+from services.sample_queries import (
+    MATERIALS_QUERY,
+    MEDIUMS_QUERY,
+    STATISTICS_QUERIES,
+    build_samples_query,
+    json_safe_rows,
+    medium_names,
+    merge_materials,
+)
+from services.statistics_series import SERIES, StatisticsSeries
+
+app = cors(Quart(__name__))
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+db = AsyncDatabaseConnection()
+
+
+@app.before_request
+async def _start_request_timer():
+    g.request_started = time.perf_counter()
+
+
+@app.after_request
+async def _record_request_metrics(response):
+    started = g.get('request_started')
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        Metrics.http_request_duration.observe(
+            time.perf_counter() - started, route, request.method, response.status_code
+        )
+    return response
+
+
+@app.after_serving
+async def _close_database():
+    await db.close()
+
+
+@app.route('/metrics', methods=['GET'])
+async def metrics():
+    """Expose process metrics in the Prometheus text format."""
+    return Response(Metrics.render(), mimetype='text/plain; version=0.0.4')
+
+
+@app.route('/api/health', methods=['GET'])
+async def health_check():
+    """Health check endpoint"""
+    return jsonify({'status': 'healthy', 'message': 'Corrosion Rate async API is running'})
+
+
+@app.route('/api/samples', methods=['GET'])
+async def get_samples():
+    """Get all corrosion samples with optional filters"""
+    try:
+        query, params = build_samples_query(request.args)
+        results = await db.execute_query(query, tuple(params) if params else None)
+        return jsonify({'samples': json_safe_rows(results)}), 200
+    except Exception as e:
+        logger.error(f"Error fetching samples: {e}", exc_info=True)
+        return jsonify({
+            'error': str(e),
+            'message': 'Failed to fetch samples from database'
+        }), 500
+
+
+async def _statistics_series(column, options):
+    range_row = (await db.execute_query(StatisticsSeries.range_query(column)))[0]
+    query, params, plan = StatisticsSeries.series_query(column, range_row, options)
+    rows = await db.execute_query(query, params) if query else []
+    return StatisticsSeries.build_points(column, rows, plan, options), StatisticsSeries.describe(plan)
+
+
+@app.route('/api/statistics', methods=['GET'])
+async def get_statistics():
+    """Get statistics for visualization; the independent queries run concurrently."""
+    try:
+        options = StatisticsSeries.parse_options(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        series_names = list(SERIES)
+        query_names = list(STATISTICS_QUERIES)
+        results = await asyncio.gather(
+            *(_statistics_series(SERIES[name], options) for name in series_names),
+            *(db.execute_query(STATISTICS_QUERIES[name]) for name in query_names),
+        )
+        statistics = {}
+        resolution = {}
+        for name, (points, plan) in zip(series_names, results):
+            statistics[name] = points
+            resolution[name] = plan
+        for name, rows in zip(query_names, results[len(series_names):]):
+            statistics[name] = json_safe_rows(rows)
+        statistics['resolution'] = resolution
+        return jsonify(statistics), 200
+    except Exception as e:
+        logger.error(f"Error fetching statistics: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/materials', methods=['GET'])
+async def get_materials():
+    """Get list of available materials"""
+    try:
+        materials = merge_materials(await db.execute_query(MATERIALS_QUERY))
+        return jsonify({'materials': materials}), 200
+    except Exception as e:
+        logger.error(f"Error fetching materials: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/mediums', methods=['GET'])
+async def get_mediums():
+    """Get list of available mediums"""
+    try:
+        mediums = medium_names(await db.execute_query(MEDIUMS_QUERY))
+        return jsonify({'mediums': mediums}), 200
+    except Exception as e:
+        logger.error(f"Error fetching mediums: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
+if __name__ == '__main__':
+    app.run(host='0.0.0.0', port=Config.ASYNC_PORT)
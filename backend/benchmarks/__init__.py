@@ -0,0 +1 @@
+"""Performance benchmarks and synthetic data generators for the corrosion backend."""
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+HTTP load generator for the calculation and read APIs.
+
+Worker threads keep one persistent HTTP connection each and issue a
+weighted mix of requests whose inputs are sampled from the bundled
+datasets. Each concurrency step reports per-route throughput, error
+rate, p50/p95/p99 latency and a latency histogram. A step-load ramp stops
+at the saturation point, when adding workers no longer buys throughput or
+latency and errors exceed their limits.
+
+Usage:
+    python -m benchmarks.load_test --url http://localhost:5001 --concurrency 8 --duration 30
+    python -m benchmarks.load_test --serve --ramp 1,2,4,8,16,32 --duration 10 --output load.json
+"""
+
+import argparse
+import bisect
+import http.client
+import json
+import math
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+
+# Upper bounds of the latency histogram buckets in milliseconds.
+HISTOGRAM_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, math.inf)
+
+ROUTES = ("calculate", "samples", "statistics", "materials", "mediums")
+DEFAULT_MIX = "calculate=6,samples=2,statistics=2"
+
+
+class InputSampler:
+    """Draw realistic request inputs from the bundled CSV datasets."""
+
+    def __init__(self, seed=None):
+        from services.csv_processor import CSVProcessor
+        from services.model_trainer import CorrosionModelTrainer
+
+        project_root = CorrosionModelTrainer._project_root()
+        self.records = []
+        for filename in (
+            "NaCl_50samples_corrosion_table_with_sources.csv",
+            "corrosion_50_points_full.csv",
+        ):
+            path = os.path.join(project_root, filename)
+            if os.path.exists(path):
+                self.records.extend(CSVProcessor.process_corrosion_csv(path))
+        if not self.records:
+            raise RuntimeError("No bundled datasets found to sample inputs from")
+        self.rng = random.Random(seed)
+
+    def calculation_payload(self):
+        record = self.rng.choice(self.records)
+        return {
+            "material": record["material"],
+            "temperature": record["temperature"],
+            "ph": record.get("ph", 7.0),
+            "nacl_percentage": record.get("nacl_percentage"),
+            "medium": record.get("medium"),
+        }
+
+    def samples_query(self):
+        record = self.rng.choice(self.records)
+        params = {}
+        if self.rng.random() < 0.5:
+            params["material"] = record["material"]
+        if self.rng.random() < 0.5:
+            params["min_temp"] = max(0.0, record["temperature"] - 10)
+            params["max_temp"] = record["temperature"] + 10
+        if "ph" in record and self.rng.random() < 0.3:
+            params["min_ph"] = max(0.0, record["ph"] - 1)
+            params["max_ph"] = record["ph"] + 1
+        return params
+
+
+def build_request(route, sampler):
+    """Return (method, path, body) for one request of the given route kind."""
+    if route == "calculate":
+        body = json.dumps(sampler.calculation_payload())
+        return "POST", "/api/calculate-corrosion-rate", body
+    if route == "samples":
+        query = sampler.samples_query()
+        return "GET", "/api/samples" + (f"?{urlencode(query)}" if query else ""), None
+    if route == "statistics":
+        return "GET", "/api/statistics", None
+    if route == "materials":
+        return "GET", "/api/materials", None
+    if route == "mediums":
+        return "GET", "/api/mediums", None
+    raise ValueError(f"Unknown route in mix: {route}")
+
+
+class RouteStats:
+    def __init__(self):
+        self.latencies_ms = []
+        self.errors = 0
+        self.status_counts = {}
+
+    def record(self, latency_ms, status):
+        self.latencies_ms.append(latency_ms)
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        if status == "error" or status >= 400:
+            self.errors += 1
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(math.ceil(fraction * len(sorted_values))) - 1)
+    return sorted_values[max(0, index)]
+
+
+def _histogram(latencies_ms):
+    counts = [0] * len(HISTOGRAM_BUCKETS_MS)
+    for latency in latencies_ms:
+        counts[bisect.bisect_left(HISTOGRAM_BUCKETS_MS, latency)] += 1
+    return {
+        ("+Inf" if math.isinf(bound) else f"<={bound}ms"): count
+        for bound, count in zip(HISTOGRAM_BUCKETS_MS, counts)
+    }
+
+
+def summarize(stats, elapsed_s):
+    summary = {}
+    for route, route_stats in stats.items():
+        latencies = sorted(route_stats.latencies_ms)
+        count = len(latencies)
+        summary[route] = {
+            "requests": count,
+            "errors": route_stats.errors,
+            "error_rate": route_stats.errors / count if count else 0.0,
+            "throughput_rps": count / elapsed_s if elapsed_s else 0.0,
+            "mean_ms": statistics.fmean(latencies) if latencies else None,
+            "p50_ms": _percentile(latencies, 0.50),
+            "p95_ms": _percentile(latencies, 0.95),
+            "p99_ms": _percentile(latencies, 0.99),
+            "max_ms": latencies[-1] if latencies else None,
+            "status_counts": {str(k): v for k, v in route_stats.status_counts.items()},
+            "histogram": _histogram(latencies),
+        }
+
+    all_latencies = sorted(
+        latency for route_stats in stats.values() for latency in route_stats.latencies_ms
+    )
+    total = len(all_latencies)
+    errors = sum(route_stats.errors for route_stats in stats.values())
+    summary["_total"] = {
+        "requests": total,
+        "errors": errors,
+        "error_rate": errors / total if total else 0.0,
+        "throughput_rps": total / elapsed_s if elapsed_s else 0.0,
+        "p50_ms": _percentile(all_latencies, 0.50),
+        "p95_ms": _percentile(all_latencies, 0.95),
+        "p99_ms": _percentile(all_latencies, 0.99),
+        "histogram": _histogram(all_latencies),
+    }
+    return summary
+
+
+def _worker(base_url, mix, sampler, deadline, stats, lock, seed, timeout):
+    parts = urlsplit(base_url)
+    connection_class = (
+        http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+    )
+    connection = connection_class(parts.hostname, parts.port, timeout=timeout)
+    routes, weights = zip(*mix)
+    rng = random.Random(seed)
+    local = {route: RouteStats() for route in routes}
+    headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
+
+    while time.perf_counter() < deadline:
+        route = rng.choices(routes, weights)[0]
+        with lock:
+            method, path, body = build_request(route, sampler)
+        started = time.perf_counter()
+        try:
+            connection.request(method, parts.path.rstrip("/") + path, body=body, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            status = response.status
+        except Exception:
+            status = "error"
+            connection.close()
+        local[route].record((time.perf_counter() - started) * 1000, status)
+
+    connection.close()
+    with lock:
+        for route, route_stats in local.items():
+            merged = stats.setdefault(route, RouteStats())
+            merged.latencies_ms.extend(route_stats.latencies_ms)
+            merged.errors += route_stats.errors
+            for status, count in route_stats.status_counts.items():
+                merged.status_counts[status] = merged.status_counts.get(status, 0) + count
+
+
+def run_step(base_url, mix, sampler, concurrency, duration_s, timeout):
+    stats = {}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration_s
+    started = time.perf_counter()
+    threads = [
+        threading.Thread(
+            target=_worker,
+            args=(base_url, mix, sampler, deadline, stats, lock, index, timeout),
+            daemon=True,
+        )
+        for index in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarize(stats, time.perf_counter() - started)
+
+
+def parse_mix(value):
+    mix = []
+    for item in value.split(","):
+        route, _, weight = item.partition("=")
+        mix.append((route.strip(), float(weight or 1)))
+    unknown = [route for route, _ in mix if route not in ROUTES]
+    if unknown:
+        raise ValueError(f"Unknown route(s) in mix: {unknown}; choose from {ROUTES}")
+    return mix
+
+
+def start_local_server(seed_rows):
+    """Serve the app in-process on a free port, backed by a scratch SQLite database."""
+    workdir = tempfile.mkdtemp(prefix="corrosion-load-")
+    os.environ["DB_BACKEND"] = "sqlite"
+    os.environ["SQLITE_PATH"] = os.path.join(workdir, "load.sqlite3")
+    os.environ["CORROSION_MODEL_PATH"] = os.path.join(workdir, "model.json")
+
+    from werkzeug.serving import make_server
+
+    import app as backend_app
+    from benchmarks.run_benchmarks import _seed_samples
+
+    backend_app.app.config["UPLOAD_FOLDER"] = os.path.join(workdir, "uploads")
+    _seed_samples(backend_app.db, seed_rows)
+
+    server = make_server("127.0.0.1", 0, backend_app.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}", server
+
+
+def _print_step(concurrency, summary):
+    total = summary["_total"]
+    print(
+        f"\nconcurrency={concurrency:<4} rps={total['throughput_rps']:9.1f} "
+        f"p50={total['p50_ms'] or 0:8.2f}ms p95={total['p95_ms'] or 0:8.2f}ms "
+        f"p99={total['p99_ms'] or 0:8.2f}ms errors={total['error_rate']:.2%}"
+    )
+    for route, route_summary in summary.items():
+        if route == "_total":
+            continue
+        print(
+            f"  {route:<12} rps={route_summary['throughput_rps']:9.1f} "
+            f"p50={route_summary['p50_ms'] or 0:8.2f}ms "
+            f"p95={route_summary['p95_ms'] or 0:8.2f}ms "
+            f"p99={route_summary['p99_ms'] or 0:8.2f}ms "
+            f"errors={route_summary['error_rate']:.2%}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the corrosion API")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", default="http://localhost:5001")
+    target.add_argument(
+        "--serve", action="store_true", help="Start the app in-process on SQLite"
+    )
+    parser.add_argument("--seed-rows", type=int, default=10_000)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="route=weight list")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--ramp", help="Comma separated concurrency steps")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per step")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--max-p99-ms", type=float, default=1000.0)
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument(
+        "--min-gain",
+        type=float,
+        default=0.05,
+        help="Relative throughput gain below which a ramp step counts as saturated",
+    )
+    parser.add_argument("--output", help="Write results as JSON")
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    server = None
+    base_url = args.url
+    if args.serve:
+        base_url, server = start_local_server(args.seed_rows)
+    sampler = InputSampler(seed=0)
+
+    steps = [int(step) for step in args.ramp.split(",")] if args.ramp else [args.concurrency]
+    results = []
+    saturation = None
+    best_rps = 0.0
+    for concurrency in steps:
+        summary = run_step(base_url, mix, sampler, concurrency, args.duration, args.timeout)
+        _print_step(concurrency, summary)
+        results.append({"concurrency": concurrency, "routes": summary})
+
+        total = summary["_total"]
+        over_limits = (
+            (total["p99_ms"] or 0) > args.max_p99_ms
+            or total["error_rate"] > args.max_error_rate
+        )
+        no_gain = best_rps and total["throughput_rps"] < best_rps * (1 + args.min_gain)
+        if args.ramp and (over_limits or no_gain):
+            saturation = {
+                "concurrency": concurrency,
+                "reason": "latency/error limits exceeded" if over_limits else "throughput plateau",
+                "sustainable_rps": best_rps if over_limits else max(best_rps, total["throughput_rps"]),
+            }
+            print(f"\nSaturated at concurrency={concurrency}: {saturation['reason']}")
+            break
+        best_rps = max(best_rps, total["throughput_rps"])
+
+    if args.output:
+        report = {
+            "target": base_url,
+            "mix": dict(mix),
+            "duration_per_step_s": args.duration,
+            "steps": results,
+            "saturation": saturation,
+        }
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+        print(f"\nWrote results to {args.output}")
+
+    if server:
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
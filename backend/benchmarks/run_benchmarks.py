@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark suite for the corrosion backend.
+
+Times the CSV processor, model training, vectorized prediction (including
+the large-array prediction kernel against the plain numpy expression), the
+calculator and every Flask route (through the test client) on synthetic
+datasets. The API runs against a scratch SQLite database, so no MySQL
+server is needed and the real model file is never touched.
+
+Usage:
+    python -m benchmarks.run_benchmarks run --sizes 100,10000 --output bench.json
+    python -m benchmarks.run_benchmarks run --large --output bench_large.json
+    python -m benchmarks.run_benchmarks compare baseline.json bench.json --threshold 0.1
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+DEFAULT_SIZES = (100, 10_000, 1_000_000)
+# Opt-in with --large: row-by-row CSV processing and training take hours at this size
+LARGE_SIZES = (10_000_000,)
+
+# Work per call that does not grow with the dataset is capped to keep runs short.
+MAX_CALCULATOR_CALLS = 10_000
+MAX_UPLOAD_ROWS = 10_000
+
+
+def _time_call(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def _record(results, name, rows, timings, ops=None):
+    median = statistics.median(timings)
+    entry = {
+        "name": name,
+        "rows": rows,
+        "repeat": len(timings),
+        "min_s": min(timings),
+        "median_s": median,
+        "mean_s": statistics.fmean(timings),
+    }
+    if ops:
+        entry["ops"] = ops
+        entry["ops_per_s"] = ops / median if median else None
+    results.append(entry)
+    print(f"  {name:<55} rows={rows:<10} median={median * 1000:10.2f} ms")
+    return entry
+
+
+def _prepare_environment(workdir):
+    """Point the backend at scratch storage before any backend module is imported."""
+    os.environ["DB_BACKEND"] = "sqlite"
+    os.environ["SQLITE_PATH"] = os.path.join(workdir, "bench.sqlite3")
+    os.environ["CORROSION_MODEL_PATH"] = os.path.join(workdir, "model.json")
+
+
+def _benchmark_library(results, sizes, workdir, repeat):
+    import numpy as np
+
+    from benchmarks.synthetic_data import write_dataset
+    from services.corrosion_calculator import CorrosionRateCalculator
+    from services.csv_processor import CSVProcessor
+    from services.model_trainer import CorrosionModelTrainer
+
+    for rows in sizes:
+        print(f"\nLibrary benchmarks at {rows} rows")
+        full_csv = write_dataset(
+            os.path.join(workdir, f"full_{rows}.csv"), rows, schema="full"
+        )
+        nacl_csv = write_dataset(
+            os.path.join(workdir, f"nacl_{rows}.csv"), rows, schema="nacl"
+        )
+
+        timings = _time_call(lambda: CSVProcessor.process_corrosion_csv(full_csv), repeat)
+        _record(results, "csv_processor.process_corrosion_csv", rows, timings, ops=rows)
+
+        model_path = os.path.join(workdir, f"model_{rows}.json")
+        timings = _time_call(
+            lambda: CorrosionModelTrainer.train_from_csv(nacl_csv, model_path), repeat
+        )
+        _record(results, "model_trainer.train_from_csv", rows, timings, ops=rows)
+
+        with open(model_path, "r", encoding="utf-8") as file:
+            parameters = json.load(file)["parameters"]
+        rng = np.random.default_rng(0)
+        chloride = rng.uniform(0.1, 10.0, rows)
+        temperature_k = rng.uniform(5.0, 90.0, rows) + 273.15
+        ph = rng.uniform(3.0, 10.0, rows)
+        timings = _time_call(
+            lambda: CorrosionModelTrainer.predict(chloride, temperature_k, ph, parameters),
+            repeat,
+        )
+        _record(results, "model_trainer.predict", rows, timings, ops=rows)
+        _benchmark_prediction_kernel(results, rows, chloride, temperature_k, ph, parameters, repeat)
+
+        calls = min(rows, MAX_CALCULATOR_CALLS)
+
+        def run_calculator():
+            for i in range(calls):
+                CorrosionRateCalculator.calculate_corrosion_rate(
+                    material="API 5L X65",
+                    temperature=float(temperature_k[i] - 273.15),
+                    ph=float(ph[i]),
+                    nacl_percentage=float(chloride[i]),
+                )
+
+        timings = _time_call(run_calculator, repeat)
+        _record(results, "calculator.calculate_corrosion_rate", rows, timings, ops=calls)
+
+        for path in (full_csv, nacl_csv):
+            os.remove(path)
+
+
+def _numpy_expression(chloride, temperature_k, ph, parameters):
+    """The model as a plain numpy expression (full-size temporaries, float64)."""
+    import numpy as np
+
+    return np.maximum(
+        parameters["A"]
+        * np.power(chloride, parameters["b"])
+        * np.exp(-parameters["K"] / temperature_k)
+        * np.exp(parameters["c"] * ph),
+        1e-6,
+    )
+
+
+def _benchmark_prediction_kernel(results, rows, chloride, temperature_k, ph, parameters, repeat):
+    import numpy as np
+
+    from services.prediction_kernel import PredictionKernel
+
+    timings = _time_call(lambda: _numpy_expression(chloride, temperature_k, ph, parameters), repeat)
+    _record(results, "prediction.numpy_expression", rows, timings, ops=rows)
+    reference = _numpy_expression(chloride, temperature_k, ph, parameters)
+
+    inputs32 = [values.astype(np.float32) for values in (chloride, temperature_k, ph)]
+    # The web default is one thread; measure what the batch tools get with one per CPU
+    workers = os.cpu_count() or 1
+    cases = [("float64", 1, np.float64, (chloride, temperature_k, ph))]
+    if workers > 1:
+        cases.append(("float64", workers, np.float64, (chloride, temperature_k, ph)))
+    cases.append(("float32", workers, np.float32, inputs32))
+    for label, threads, dtype, inputs in cases:
+        kernel = PredictionKernel(parameters, dtype=dtype)
+        out = np.empty(rows, dtype=dtype)
+        timings = _time_call(lambda: kernel.predict(*inputs, out=out, workers=threads), repeat)
+        entry = _record(
+            results, f"prediction_kernel.predict[{label},workers={threads}]", rows, timings, ops=rows
+        )
+        entry["max_relative_error"] = float(np.max(np.abs(out / reference - 1.0)))
+
+
+def _seed_samples(db, rows):
+    from benchmarks.synthetic_data import iter_sample_records
+
+    insert_query = """
+        INSERT INTO corrosion_samples
+        (sample_id, material, medium, nacl_percentage, temperature, ph,
+         corrosion_rate_mm_per_yr, corrosion_rate_mpy, method, source, notes)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    """
+    for chunk in iter_sample_records(rows):
+        db.execute_many(insert_query, chunk)
+
+
+def _wait_for_job(client, job_id):
+    while True:
+        job = client.get(f"/api/jobs/{job_id}").get_json()
+        if job["status"] in ("completed", "failed"):
+            return job
+        time.sleep(0.01)
+
+
+def _benchmark_routes(results, sizes, workdir, repeat):
+    import app as backend_app
+    from benchmarks.synthetic_data import write_dataset
+
+    flask_app = backend_app.app
+    flask_app.config["UPLOAD_FOLDER"] = os.path.join(workdir, "uploads")
+    os.makedirs(flask_app.config["UPLOAD_FOLDER"], exist_ok=True)
+    client = flask_app.test_client()
+    db = backend_app.db
+
+    calculation = {
+        "material": "API 5L X65",
+        "temperature": 40,
+        "ph": 6.5,
+        "nacl_percentage": 3.5,
+        "medium": "Seawater",
+    }
+    read_routes = [
+        ("GET /api/health", lambda: client.get("/api/health")),
+        ("GET /api/samples", lambda: client.get("/api/samples")),
+        (
+            "GET /api/samples (filtered)",
+            lambda: client.get("/api/samples?material=X65&min_temp=20&max_ph=8"),
+        ),
+        ("GET /api/statistics", lambda: client.get("/api/statistics")),
+        ("GET /api/materials", lambda: client.get("/api/materials")),
+        ("GET /api/mediums", lambda: client.get("/api/mediums")),
+        ("GET /api/model-info", lambda: client.get("/api/model-info")),
+        (
+            "POST /api/calculate-corrosion-rate",
+            lambda: client.post("/api/calculate-corrosion-rate", json=calculation),
+        ),
+        ("POST /api/train-model", lambda: client.post("/api/train-model")),
+    ]
+
+    for rows in sizes:
+        print(f"\nRoute benchmarks at {rows} rows")
+        _seed_samples(db, rows)
+
+        for name, call in read_routes:
+            _record(results, name, rows, _time_call(call, repeat))
+
+        upload_rows = min(rows, MAX_UPLOAD_ROWS)
+        upload_csv = write_dataset(
+            os.path.join(workdir, "upload.csv"), upload_rows, schema="full"
+        )
+
+        def upload():
+            with open(upload_csv, "rb") as file:
+                client.post("/api/upload-csv", data={"file": (file, "upload.csv")})
+
+        _record(
+            results, "POST /api/upload-csv", rows, _time_call(upload, repeat), ops=upload_rows
+        )
+
+        def clear():
+            response = client.delete("/api/clear-database")
+            _wait_for_job(client, response.get_json()["job"]["id"])
+
+        # Clearing empties the table, so it is timed once per size and last.
+        _record(results, "DELETE /api/clear-database", rows, _time_call(clear, 1))
+
+
+def _git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+def run(args):
+    sizes = [int(size) for size in args.sizes.split(",")]
+    if args.large:
+        sizes += [size for size in LARGE_SIZES if size not in sizes]
+    workdir = tempfile.mkdtemp(prefix="corrosion-bench-")
+    _prepare_environment(workdir)
+
+    results = []
+    started = time.time()
+    if not args.skip_library:
+        _benchmark_library(results, sizes, workdir, args.repeat)
+    if not args.skip_routes:
+        _benchmark_routes(results, sizes, workdir, args.repeat)
+
+    report = {
+        "meta": {
+            "created_at": started,
+            "duration_s": time.time() - started,
+            "git_revision": _git_revision(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "sizes": sizes,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    print(f"\nWrote {len(results)} results to {args.output}")
+    return 0
+
+
+def compare(args):
+    with open(args.baseline, "r", encoding="utf-8") as file:
+        baseline = json.load(file)
+    with open(args.current, "r", encoding="utf-8") as file:
+        current = json.load(file)
+
+    baseline_index = {(r["name"], r["rows"]): r for r in baseline["results"]}
+    regressions = []
+    print(f"{'benchmark':<55} {'rows':>10} {'base ms':>12} {'new ms':>12} {'change':>9}")
+    for result in current["results"]:
+        key = (result["name"], result["rows"])
+        base = baseline_index.get(key)
+        if not base or not base["median_s"]:
+            continue
+        change = result["median_s"] / base["median_s"] - 1.0
+        flag = ""
+        if change > args.threshold:
+            flag = "  REGRESSION"
+            regressions.append({"name": key[0], "rows": key[1], "change": change})
+        print(
+            f"{key[0]:<55} {key[1]:>10} {base['median_s'] * 1000:>12.2f} "
+            f"{result['median_s'] * 1000:>12.2f} {change:>+8.1%}{flag}"
+        )
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}")
+        return 1
+    print("\nNo regressions")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Corrosion backend benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the benchmark suite")
+    run_parser.add_argument(
+        "--sizes",
+        default=",".join(str(size) for size in DEFAULT_SIZES),
+        help="Comma separated dataset sizes in rows",
+    )
+    run_parser.add_argument(
+        "--large",
+        action="store_true",
+        help=f"Also run {', '.join(str(size) for size in LARGE_SIZES)} rows (takes hours)",
+    )
+    run_parser.add_argument("--repeat", type=int, default=3)
+    run_parser.add_argument("--output", default="benchmark_results.json")
+    run_parser.add_argument("--skip-library", action="store_true")
+    run_parser.add_argument("--skip-routes", action="store_true")
+    run_parser.set_defaults(func=run)
+
+    compare_parser = subparsers.add_parser("compare", help="Compare two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Relative slowdown of the median that counts as a regression",
+    )
+    compare_parser.set_defaults(func=compare)
+
+    args = parser.parse_args()
+    sys.exit(args.func(args))
+
+
+if __name__ == "__main__":
+    main()
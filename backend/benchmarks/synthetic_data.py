@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Generate synthetic corrosion datasets with the same columns as the bundled CSVs.
+
+Rates follow the Arrhenius power-law model with log-normal noise, so the
+files can be uploaded, trained on and scored like the real data. Rows are
+written in chunks, which keeps memory flat even for 10^7-row files.
+
+Usage:
+    python -m benchmarks.synthetic_data --rows 10000 --schema nacl --output /tmp/nacl.csv
+"""
+
+import argparse
+import csv
+import os
+
+import numpy as np
+
+NACL_COLUMNS = [
+    "Sample ID",
+    "Material",
+    "NaCl (wt%)",
+    "Temperature (°C)",
+    "pH",
+    "Estimated Corrosion Rate (mm/yr)",
+    "Estimated Corrosion Rate (mpy)",
+    "Notes",
+    "Source",
+]
+
+FULL_COLUMNS = [
+    "#",
+    "Material",
+    "Environment",
+    "Temp (°C)",
+    "NaCl (%)",
+    "pH",
+    "Corrosion_mm_per_yr",
+    "Corrosion_mpy",
+    "Method",
+    "Source",
+]
+
+SCHEMAS = {"nacl": NACL_COLUMNS, "full": FULL_COLUMNS}
+
+MATERIALS = [
+    "API 5L X65",
+    "Carbon Steel",
+    "Stainless Steel 316",
+    "Duplex Stainless Steel",
+    "Low Alloy Steel",
+]
+AERATION = ["aerated", "deaerated", "CO2-saturated"]
+METHODS = ["weight loss", "potentiostat/flow-loop", "LPR", "EIS"]
+SOURCES = ["Synthetic benchmark data"]
+
+# Parameters close to the bundled trained model, used when none are supplied.
+DEFAULT_PARAMETERS = {"A": 6.67e6, "b": 0.175, "K": 3835.0, "c": -0.90}
+
+
+def generate_columns(rows, rng, parameters=None, start=0):
+    """Return a dict of numpy arrays describing ``rows`` synthetic samples."""
+    parameters = parameters or DEFAULT_PARAMETERS
+    nacl = np.round(rng.uniform(0.1, 10.0, rows), 2)
+    temperature = np.round(rng.uniform(5.0, 90.0, rows), 2)
+    ph = np.round(rng.uniform(3.0, 10.0, rows), 2)
+    rate = (
+        parameters["A"]
+        * np.power(nacl, parameters["b"])
+        * np.exp(-parameters["K"] / (temperature + 273.15))
+        * np.exp(parameters["c"] * ph)
+        * rng.lognormal(0.0, 0.15, rows)
+    )
+    rate = np.round(np.maximum(rate, 1e-4), 4)
+    return {
+        "index": np.arange(start + 1, start + rows + 1),
+        "material": rng.integers(0, len(MATERIALS), rows),
+        "aeration": rng.integers(0, len(AERATION), rows),
+        "method": rng.integers(0, len(METHODS), rows),
+        "nacl": nacl,
+        "temperature": temperature,
+        "ph": ph,
+        "rate_mm": rate,
+        "rate_mpy": np.round(rate * 39.37, 3),
+    }
+
+
+def _format_rows(schema, columns):
+    if schema == "nacl":
+        for i in range(len(columns["index"])):
+            yield [
+                f"SYN-{columns['index'][i]}",
+                MATERIALS[columns["material"][i]],
+                columns["nacl"][i],
+                columns["temperature"][i],
+                columns["ph"][i],
+                columns["rate_mm"][i],
+                columns["rate_mpy"][i],
+                "",
+                SOURCES[0],
+            ]
+    else:
+        for i in range(len(columns["index"])):
+            nacl = columns["nacl"][i]
+            temperature = columns["temperature"][i]
+            environment = (
+                f"{nacl:g}% NaCl, {AERATION[columns['aeration'][i]]}, {temperature:g}°C"
+            )
+            yield [
+                columns["index"][i],
+                MATERIALS[columns["material"][i]],
+                environment,
+                temperature,
+                nacl,
+                columns["ph"][i],
+                columns["rate_mm"][i],
+                columns["rate_mpy"][i],
+                METHODS[columns["method"][i]],
+                SOURCES[0],
+            ]
+
+
+def write_dataset(path, rows, schema="nacl", seed=42, chunk_size=200_000, parameters=None):
+    """Write a synthetic CSV with the columns of ``schema`` ('nacl' or 'full')."""
+    if schema not in SCHEMAS:
+        raise ValueError(f"Unknown schema: {schema}")
+
+    rng = np.random.default_rng(seed)
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(SCHEMAS[schema])
+        for start in range(0, rows, chunk_size):
+            count = min(chunk_size, rows - start)
+            columns = generate_columns(count, rng, parameters, start=start)
+            writer.writerows(_format_rows(schema, columns))
+    return path
+
+
+def iter_sample_records(rows, seed=42, chunk_size=50_000):
+    """Yield chunks of ``corrosion_samples`` insert tuples for seeding a database."""
+    rng = np.random.default_rng(seed)
+    for start in range(0, rows, chunk_size):
+        count = min(chunk_size, rows - start)
+        columns = generate_columns(count, rng, start=start)
+        chunk = []
+        for i in range(count):
+            nacl = float(columns["nacl"][i])
+            temperature = float(columns["temperature"][i])
+            chunk.append(
+                (
+                    f"SYN-{columns['index'][i]}",
+                    MATERIALS[columns["material"][i]],
+                    f"{nacl:g}% NaCl, {AERATION[columns['aeration'][i]]}",
+                    nacl,
+                    temperature,
+                    float(columns["ph"][i]),
+                    float(columns["rate_mm"][i]),
+                    float(columns["rate_mpy"][i]),
+                    METHODS[columns["method"][i]],
+                    SOURCES[0],
+                    None,
+                )
+            )
+        yield chunk
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, required=True)
+    parser.add_argument("--schema", choices=sorted(SCHEMAS), default="nacl")
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    write_dataset(args.output, args.rows, schema=args.schema, seed=args.seed)
+    print(f"Wrote {args.rows} rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,11 +9,73 @@ class Config:
     DB_USER = os.getenv('DB_USER', 'root')
     DB_PASSWORD = os.getenv('DB_PASSWORD', '')
     DB_NAME = os.getenv('DB_NAME', 'corrosion_db')
+    # 'mysql' (default) or 'sqlite' for the embedded, server-less backend
+    DB_BACKEND = os.getenv('DB_BACKEND', 'mysql')
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 5))
+    SQLITE_PATH = os.getenv(
+        'SQLITE_PATH',
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), 'database', 'corrosion.sqlite3')
+    )
     FLASK_ENV = os.getenv('FLASK_ENV', 'development')
     FLASK_PORT = int(os.getenv('FLASK_PORT', 5001))
+    # async_app.py serves the read endpoints on its own port
+    ASYNC_PORT = int(os.getenv('ASYNC_PORT', 5002))
+    ASYNC_DB_POOL_SIZE = int(os.getenv('ASYNC_DB_POOL_SIZE', 20))
     
     UPLOAD_FOLDER = 'uploads'
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
+
+    # Per-request profiling: send the token in X-Profile-Token, or sample a share of requests
+    PROFILE_ADMIN_TOKEN = os.getenv('PROFILE_ADMIN_TOKEN', '')
+    PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', 0))
+    PROFILE_DIR = os.getenv('PROFILE_DIR', 'profiles')
+    PROFILE_MAX_FILES = int(os.getenv('PROFILE_MAX_FILES', 50))
+    # Serve /api/profiles without a token (local debugging only); off unless set to 1
+    PROFILE_OPEN_ACCESS = os.getenv('PROFILE_OPEN_ACCESS', '0') == '1'
+
+    # Background jobs started with shared=True: one JSON status file per job, read by every web worker
+    JOB_STATE_DIR = os.getenv('JOB_STATE_DIR', 'job_state')
+    JOB_STATE_MAX_FILES = int(os.getenv('JOB_STATE_MAX_FILES', 50))
+
+    # Research visualizations: grid points per axis of the 3-D surface chart
+    SURFACE_RESOLUTION = int(os.getenv('SURFACE_RESOLUTION', 60))
+
+    # /api/charts rendering: worker processes, render timeout and cache sizes
+    CHART_RENDER_WORKERS = int(os.getenv('CHART_RENDER_WORKERS', 1))
+    CHART_RENDER_TIMEOUT = float(os.getenv('CHART_RENDER_TIMEOUT', 30))
+    CHART_CACHE_DIR = os.getenv('CHART_CACHE_DIR', 'chart_cache')
+    CHART_CACHE_MAX_FILES = int(os.getenv('CHART_CACHE_MAX_FILES', 200))
+    CHART_CACHE_MAX_BYTES = int(os.getenv('CHART_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+
+    # Corrosion-rate percentile sketches: KLL accuracy parameter and batch rows kept before compaction
+    SKETCH_K = int(os.getenv('SKETCH_K', 200))
+    SKETCH_COMPACT_BATCHES = int(os.getenv('SKETCH_COMPACT_BATCHES', 16))
+
+    # Approximate statistics: rows kept in the in-memory uniform sample of corrosion_samples
+    RESERVOIR_SIZE = int(os.getenv('RESERVOIR_SIZE', 20000))
+
+    # Remaining-life projection: condition readings read per chunk, and the upload size limit of
+    # /api/remaining-life (a 10-year, 1-minute series is ~5.3M rows, about 250 MB of CSV)
+    LIFE_CHUNK_ROWS = int(os.getenv('LIFE_CHUNK_ROWS', 500000))
+    LIFE_MAX_CONTENT_LENGTH = int(os.getenv('LIFE_MAX_CONTENT_LENGTH', 1024 * 1024 * 1024))
+
+    # Sobol sensitivity analysis: threads evaluating sample chunks
+    SENSITIVITY_WORKERS = int(os.getenv('SENSITIVITY_WORKERS', 1))
+
+    # Monte Carlo calculations: upper bound on samples per request
+    MONTE_CARLO_MAX_SAMPLES = int(os.getenv('MONTE_CARLO_MAX_SAMPLES', 5000000))
+
+    # Calculation result cache: LRU entries (0 disables) and time-to-live in seconds (0 = no expiry)
+    CALC_CACHE_SIZE = int(os.getenv('CALC_CACHE_SIZE', 4096))
+    CALC_CACHE_TTL = float(os.getenv('CALC_CACHE_TTL', 0))
+
+    # Large-array model scoring: threads used by the prediction kernel (0 = one per CPU);
+    # keep 1 for the web app, where every gunicorn worker would start its own threads
+    PREDICT_WORKERS = int(os.getenv('PREDICT_WORKERS', 1))
+
+    # Offline bulk scoring (score_conditions.py): rows per chunk and worker processes (0 = one per CPU)
+    SCORE_CHUNK_ROWS = int(os.getenv('SCORE_CHUNK_ROWS', 250000))
+    SCORE_WORKERS = int(os.getenv('SCORE_WORKERS', 0))
     
     @staticmethod
     def get_db_config():
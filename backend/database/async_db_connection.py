@@ -0,0 +1,102 @@
+import asyncio
+import logging
+import time
+
+from config import Config
+from services.metrics import Metrics
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDatabaseConnection:
+    """
+    asyncio counterpart of ``DatabaseConnection`` for the async read API.
+
+    MySQL goes through an ``aiomysql`` connection pool; the embedded SQLite
+    backend through ``aiosqlite``. Queries use the same ``%s`` paramstyle as
+    the synchronous code, so both apps share their SQL.
+    """
+
+    def __init__(self, backend_name=None):
+        self.backend_name = (backend_name or Config.DB_BACKEND).lower()
+        self._pool = None
+        self._pool_lock = None
+        self._sqlite_ready = False
+
+    async def _get_pool(self):
+        import aiomysql
+
+        if self._pool_lock is None:
+            self._pool_lock = asyncio.Lock()
+        async with self._pool_lock:
+            if self._pool is None:
+                self._pool = await aiomysql.create_pool(
+                    host=Config.DB_HOST,
+                    port=Config.DB_PORT,
+                    user=Config.DB_USER,
+                    password=Config.DB_PASSWORD,
+                    db=Config.DB_NAME,
+                    minsize=1,
+                    maxsize=Config.ASYNC_DB_POOL_SIZE,
+                    autocommit=True,
+                )
+        return self._pool
+
+    async def execute_query(self, query, params=None):
+        statement = Metrics.statement_type(query)
+        started = time.perf_counter()
+        if self.backend_name == 'mysql':
+            result = await self._execute_mysql(query, params, statement)
+        elif self.backend_name == 'sqlite':
+            result = await self._execute_sqlite(query, params, statement)
+        else:
+            raise ValueError(f"Unsupported DB_BACKEND: {self.backend_name}")
+
+        Metrics.db_query_duration.observe(time.perf_counter() - started, statement)
+        Metrics.db_query_rows.observe(
+            len(result) if statement == 'SELECT' else max(result, 0), statement
+        )
+        return result
+
+    async def _execute_mysql(self, query, params, statement):
+        import aiomysql
+
+        pool = await self._get_pool()
+        async with pool.acquire() as connection:
+            async with connection.cursor(aiomysql.DictCursor) as cursor:
+                try:
+                    await cursor.execute(query, params or ())
+                except Exception as e:
+                    logger.error(f"Error executing query: {e}")
+                    raise
+                if statement == 'SELECT':
+                    return list(await cursor.fetchall())
+                return cursor.rowcount
+
+    async def _execute_sqlite(self, query, params, statement):
+        import aiosqlite
+
+        if not self._sqlite_ready:
+            # The synchronous backend owns schema creation.
+            from database.sqlite_backend import SQLiteBackend
+
+            await asyncio.to_thread(SQLiteBackend(Config.SQLITE_PATH).warm_up)
+            self._sqlite_ready = True
+
+        async with aiosqlite.connect(Config.SQLITE_PATH, timeout=30) as connection:
+            connection.row_factory = aiosqlite.Row
+            try:
+                cursor = await connection.execute(query.replace('%s', '?'), params or ())
+            except Exception as e:
+                logger.error(f"Error executing query: {e}")
+                raise
+            if statement == 'SELECT':
+                return [dict(row) for row in await cursor.fetchall()]
+            await connection.commit()
+            return cursor.rowcount
+
+    async def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            await self._pool.wait_closed()
+            self._pool = None
@@ -1,48 +1,63 @@
-import mysql.connector
-from mysql.connector import Error
 from config import Config
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
+
+def create_backend(name=None):
+    """Instantiate the storage backend selected by ``DB_BACKEND``."""
+    name = (name or Config.DB_BACKEND).lower()
+    if name == 'mysql':
+        from database.mysql_backend import MySQLBackend
+        return MySQLBackend()
+    if name == 'sqlite':
+        from database.sqlite_backend import SQLiteBackend
+        return SQLiteBackend()
+    raise ValueError(f"Unsupported DB_BACKEND: {name}")
+
+
 class DatabaseConnection:
     _instance = None
     
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(DatabaseConnection, cls).__new__(cls)
+            cls._instance.backend = create_backend()
+            logger.info(f"Using {cls._instance.backend.name} storage backend")
+            if hasattr(os, 'register_at_fork'):
+                # Prefork servers: every worker opens its own connections.
+                os.register_at_fork(after_in_child=cls._instance.reset_after_fork)
         return cls._instance
-    
+
+    def reset_after_fork(self):
+        self.backend.reset_after_fork()
+
+    def use_backend(self, backend):
+        """Swap the storage backend, e.g. to point benchmarks at a scratch database."""
+        self.backend = backend
+
     def get_connection(self):
-        try:
-            db_config = Config.get_db_config()
-            connection = mysql.connector.connect(**db_config)
-            logger.info("Database connection established")
-            return connection
-        except Error as e:
-            logger.error(f"Error connecting to MySQL: {e}")
-            raise
+        return self.backend.get_connection()
     
     def close_connection(self, connection):
-        if connection and connection.is_connected():
-            connection.close()
-            logger.info("Database connection closed")
+        self.backend.close_connection(connection)
     
     def execute_query(self, query, params=None):
-        connection = self.get_connection()
-        cursor = connection.cursor(dictionary=True)
-        try:
-            cursor.execute(query, params or ())
-            if query.strip().upper().startswith('SELECT'):
-                result = cursor.fetchall()
-            else:
-                connection.commit()
-                result = cursor.rowcount
-            return result
-        except Error as e:
-            connection.rollback()
-            logger.error(f"Error executing query: {e}")
-            raise
-        finally:
-            cursor.close()
-            self.close_connection(connection)
+        return self.backend.execute_query(query, params)
+
+    def execute_many(self, query, rows):
+        return self.backend.execute_many(query, rows)
+
+    def execute_transaction(self, statements):
+        return self.backend.execute_transaction(statements)
+
+    def warm_up(self):
+        self.backend.warm_up()
+
+    def truncate_tables(self, table_names, progress_callback=None):
+        """Empty the given tables, children first, as fast as the backend allows."""
+        self.backend.truncate_tables(table_names, progress_callback)
+
+    def estimate_row_counts(self, table_names):
+        return self.backend.estimate_row_counts(table_names)
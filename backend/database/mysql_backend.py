@@ -0,0 +1,117 @@
+import logging
+import threading
+
+import mysql.connector
+from mysql.connector import Error
+from mysql.connector.errors import PoolError
+from mysql.connector.pooling import MySQLConnectionPool
+
+from config import Config
+from database.storage_backend import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+
+class MySQLBackend(StorageBackend):
+    """MySQL server backend using ``mysql.connector``."""
+
+    name = "mysql"
+    error_types = (Error,)
+
+    def __init__(self):
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    def _get_pool(self):
+        if self._pool is None and Config.DB_POOL_SIZE > 0:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = MySQLConnectionPool(
+                        pool_name="corrosion_pool",
+                        pool_size=Config.DB_POOL_SIZE,
+                        **Config.get_db_config()
+                    )
+        return self._pool
+
+    def get_connection(self):
+        try:
+            pool = self._get_pool()
+            if pool is not None:
+                try:
+                    return pool.get_connection()
+                except PoolError:
+                    # All pooled connections are busy; fall back to a direct one.
+                    pass
+            db_config = Config.get_db_config()
+            connection = mysql.connector.connect(**db_config)
+            logger.info("Database connection established")
+            return connection
+        except Error as e:
+            logger.error(f"Error connecting to MySQL: {e}")
+            raise
+
+    def reset_after_fork(self):
+        # Drop the parent's pool without closing it: the sockets are shared with
+        # the parent, and a close here would end the parent's sessions too.
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    def warm_up(self):
+        """Open the connection pool and check one connection."""
+        self._get_pool()
+        super().warm_up()
+
+    def close_connection(self, connection):
+        # Pooled connections go back to the pool on close(), even dropped ones:
+        # skipping it would shrink the pool for good. The pool reconnects them.
+        if not connection:
+            return
+        try:
+            connection.close()
+        except Error as e:
+            logger.debug(f"Error closing connection: {e}")
+
+    def dict_cursor(self, connection):
+        return connection.cursor(dictionary=True)
+
+    def estimate_row_counts(self, table_names):
+        """InnoDB's statistics estimate; COUNT(*) would scan every table."""
+        placeholders = ", ".join(["%s"] * len(table_names))
+        rows = self.execute_query(f"""
+            SELECT TABLE_NAME AS table_name, TABLE_ROWS AS table_rows
+            FROM information_schema.TABLES
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME IN ({placeholders})
+        """, tuple(table_names))
+        estimates = {row['table_name']: row['table_rows'] for row in rows}
+        return {
+            table_name: int(estimates[table_name]) if estimates.get(table_name) is not None else None
+            for table_name in table_names
+        }
+
+    def truncate_tables(self, table_names, progress_callback=None):
+        """
+        Empty tables with TRUNCATE on a single connection.
+
+        TRUNCATE drops and recreates the table storage instead of deleting row
+        by row, so it does not grow the undo log and also resets AUTO_INCREMENT.
+        Foreign key checks are disabled for the session so a parent table can be
+        truncated after its children; pass child tables first.
+        """
+        connection = self.get_connection()
+        cursor = connection.cursor()
+        try:
+            cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+            for index, table_name in enumerate(table_names, start=1):
+                cursor.execute(f"TRUNCATE TABLE {table_name}")
+                if progress_callback:
+                    progress_callback(index, len(table_names), table_name)
+        except Error as e:
+            logger.error(f"Error truncating tables: {e}")
+            raise
+        finally:
+            try:
+                cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+            except Error:
+                pass
+            cursor.close()
+            self.close_connection(connection)
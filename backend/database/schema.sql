@@ -22,7 +22,8 @@ CREATE TABLE IF NOT EXISTS corrosion_samples (
     INDEX idx_material (material),
     INDEX idx_temperature (temperature),
     INDEX idx_ph (ph),
-    INDEX idx_medium (medium)
+    INDEX idx_medium (medium),
+    INDEX idx_updated_at (updated_at)
 );
 
 -- Table for storing calculated corrosion rates
@@ -55,3 +56,23 @@ CREATE TABLE IF NOT EXISTS csv_uploads (
     status VARCHAR(50) DEFAULT 'pending'
 );
 
+-- Append-only KLL quantile sketches of corrosion rates; each batch covers a range of sample ids
+CREATE TABLE IF NOT EXISTS rate_sketch_batches (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    first_sample_id INT NOT NULL,
+    last_sample_id INT NOT NULL,
+    sample_count INT NOT NULL,
+    sketches LONGTEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Operating-condition time series per asset, read by the remaining-life projection
+CREATE TABLE IF NOT EXISTS condition_readings (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    asset_id VARCHAR(100) NOT NULL,
+    recorded_at DATETIME NOT NULL,
+    temperature DOUBLE,
+    ph DOUBLE,
+    nacl_percentage DOUBLE,
+    INDEX idx_asset_time (asset_id, recorded_at, id)
+);
@@ -0,0 +1,80 @@
+-- Corrosion Rate Database Schema (SQLite)
+-- Mirrors schema.sql for the embedded backend (DB_BACKEND=sqlite).
+
+CREATE TABLE IF NOT EXISTS corrosion_samples (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    sample_id VARCHAR(100),
+    material VARCHAR(100) NOT NULL,
+    medium VARCHAR(100),
+    nacl_percentage DECIMAL(10, 2),
+    temperature DECIMAL(10, 2) NOT NULL,
+    ph DECIMAL(10, 2),
+    corrosion_rate_mm_per_yr DECIMAL(10, 4),
+    corrosion_rate_mpy DECIMAL(10, 4),
+    method VARCHAR(255),
+    source VARCHAR(500),
+    environment_description TEXT,
+    notes TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_material ON corrosion_samples (material);
+CREATE INDEX IF NOT EXISTS idx_temperature ON corrosion_samples (temperature);
+CREATE INDEX IF NOT EXISTS idx_ph ON corrosion_samples (ph);
+CREATE INDEX IF NOT EXISTS idx_medium ON corrosion_samples (medium);
+CREATE INDEX IF NOT EXISTS idx_updated_at ON corrosion_samples (updated_at);
+
+CREATE TRIGGER IF NOT EXISTS trg_corrosion_samples_updated_at
+AFTER UPDATE ON corrosion_samples
+FOR EACH ROW WHEN NEW.updated_at = OLD.updated_at
+BEGIN
+    UPDATE corrosion_samples SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
+END;
+
+CREATE TABLE IF NOT EXISTS calculated_corrosion_rates (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    sample_id INTEGER REFERENCES corrosion_samples(id) ON DELETE CASCADE,
+    material VARCHAR(100) NOT NULL,
+    medium VARCHAR(100),
+    temperature DECIMAL(10, 2) NOT NULL,
+    ph DECIMAL(10, 2),
+    nacl_percentage DECIMAL(10, 2),
+    calculated_rate_mm_per_yr DECIMAL(10, 4),
+    calculated_rate_mpy DECIMAL(10, 4),
+    equation_used VARCHAR(255),
+    input_data TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_calc_material ON calculated_corrosion_rates (material);
+CREATE INDEX IF NOT EXISTS idx_calc_temperature ON calculated_corrosion_rates (temperature);
+CREATE INDEX IF NOT EXISTS idx_calc_ph ON calculated_corrosion_rates (ph);
+
+CREATE TABLE IF NOT EXISTS csv_uploads (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    filename VARCHAR(255) NOT NULL,
+    file_path VARCHAR(500),
+    rows_imported INT DEFAULT 0,
+    upload_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    status VARCHAR(50) DEFAULT 'pending'
+);
+
+-- Append-only KLL quantile sketches of corrosion rates; each batch covers a range of sample ids
+CREATE TABLE IF NOT EXISTS rate_sketch_batches (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    first_sample_id INT NOT NULL,
+    last_sample_id INT NOT NULL,
+    sample_count INT NOT NULL,
+    sketches TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Operating-condition time series per asset, read by the remaining-life projection
+CREATE TABLE IF NOT EXISTS condition_readings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    asset_id VARCHAR(100) NOT NULL,
+    recorded_at TIMESTAMP NOT NULL,
+    temperature REAL,
+    ph REAL,
+    nacl_percentage REAL
+);
+CREATE INDEX IF NOT EXISTS idx_asset_time ON condition_readings (asset_id, recorded_at, id);
@@ -0,0 +1,106 @@
+import logging
+import math
+import os
+import sqlite3
+import threading
+
+from config import Config
+from database.storage_backend import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), 'schema_sqlite.sql')
+
+
+def _dict_row_factory(cursor, row):
+    return {column[0]: value for column, value in zip(cursor.description, row)}
+
+
+def _has_math_functions():
+    """SQLite builds without SQLITE_ENABLE_MATH_FUNCTIONS lack FLOOR, used by binned aggregates."""
+    try:
+        sqlite3.connect(':memory:').execute("SELECT FLOOR(1.5)")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+HAS_MATH_FUNCTIONS = _has_math_functions()
+
+
+class SQLiteBackend(StorageBackend):
+    """Embedded, in-process backend for single-machine deployments and benchmarks."""
+
+    name = "sqlite"
+    error_types = (sqlite3.Error,)
+
+    def __init__(self, path=None):
+        self.path = path or Config.SQLITE_PATH
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+
+    def get_connection(self):
+        try:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.row_factory = _dict_row_factory
+            connection.execute("PRAGMA foreign_keys = ON")
+            if not HAS_MATH_FUNCTIONS:
+                connection.create_function(
+                    "FLOOR", 1, lambda x: None if x is None else math.floor(x), deterministic=True
+                )
+            if not self._schema_ready:
+                self._ensure_schema(connection)
+            return connection
+        except sqlite3.Error as e:
+            logger.error(f"Error opening SQLite database {self.path}: {e}")
+            raise
+
+    def _ensure_schema(self, connection):
+        with self._schema_lock:
+            if self._schema_ready:
+                return
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            connection.execute("PRAGMA journal_mode = WAL")
+            with open(SCHEMA_PATH, 'r', encoding='utf-8') as file:
+                connection.executescript(file.read())
+            self._schema_ready = True
+            logger.info(f"SQLite schema ready at {self.path}")
+
+    def dict_cursor(self, connection):
+        return connection.cursor()
+
+    def prepare_query(self, query: str) -> str:
+        # Application queries use the MySQL ``%s`` paramstyle.
+        return query.replace('%s', '?')
+
+    def estimate_row_counts(self, table_names):
+        """Span of the rowid index: exact unless rows were deleted, and never a scan."""
+        estimates = {}
+        for table_name in table_names:
+            rows = self.execute_query(
+                f"SELECT MAX(rowid) - MIN(rowid) + 1 AS span FROM {table_name}"
+            )
+            estimates[table_name] = int(rows[0]['span'] or 0) if rows else None
+        return estimates
+
+    def truncate_tables(self, table_names, progress_callback=None):
+        """SQLite has no TRUNCATE; an unfiltered DELETE uses its truncate optimization."""
+        connection = self.get_connection()
+        try:
+            connection.execute("PRAGMA foreign_keys = OFF")
+            for index, table_name in enumerate(table_names, start=1):
+                connection.execute(f"DELETE FROM {table_name}")
+                connection.execute(
+                    "DELETE FROM sqlite_sequence WHERE name = ?", (table_name,)
+                )
+                connection.commit()
+                if progress_callback:
+                    progress_callback(index, len(table_names), table_name)
+        except sqlite3.Error as e:
+            connection.rollback()
+            logger.error(f"Error truncating tables: {e}")
+            raise
+        finally:
+            connection.execute("PRAGMA foreign_keys = ON")
+            self.close_connection(connection)
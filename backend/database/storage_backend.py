@@ -0,0 +1,108 @@
+import logging
+import time
+
+from services.metrics import Metrics
+
+logger = logging.getLogger(__name__)
+
+
+class StorageBackend:
+    """
+    Base class for the database engines behind ``DatabaseConnection``.
+
+    Application queries are written once with ``%s`` placeholders and MySQL
+    compatible SQL; each backend adapts them to its own driver.
+    """
+
+    name = "base"
+    error_types = (Exception,)
+
+    def get_connection(self):
+        raise NotImplementedError
+
+    def close_connection(self, connection):
+        if connection:
+            connection.close()
+
+    def dict_cursor(self, connection):
+        raise NotImplementedError
+
+    def reset_after_fork(self):
+        """Forget connections inherited from a parent process; they must not be shared."""
+
+    def warm_up(self):
+        """Open a connection and run a trivial query so the first request does not pay for it."""
+        self.execute_query("SELECT 1 AS ok")
+
+    def prepare_query(self, query: str) -> str:
+        return query
+
+    def execute_query(self, query, params=None):
+        statement = Metrics.statement_type(query)
+        started = time.perf_counter()
+        connection = self.get_connection()
+        cursor = self.dict_cursor(connection)
+        try:
+            cursor.execute(self.prepare_query(query), params or ())
+            if statement == 'SELECT':
+                result = cursor.fetchall()
+                row_count = len(result)
+            else:
+                connection.commit()
+                result = cursor.rowcount
+                row_count = max(result, 0)
+            Metrics.db_query_duration.observe(time.perf_counter() - started, statement)
+            Metrics.db_query_rows.observe(row_count, statement)
+            return result
+        except self.error_types as e:
+            connection.rollback()
+            logger.error(f"Error executing query: {e}")
+            raise
+        finally:
+            cursor.close()
+            self.close_connection(connection)
+
+    def execute_many(self, query, rows):
+        """Run one parameterized statement for many rows in a single transaction."""
+        statement = Metrics.statement_type(query)
+        started = time.perf_counter()
+        connection = self.get_connection()
+        cursor = self.dict_cursor(connection)
+        try:
+            cursor.executemany(self.prepare_query(query), rows)
+            connection.commit()
+            Metrics.db_query_duration.observe(time.perf_counter() - started, statement)
+            Metrics.db_query_rows.observe(max(cursor.rowcount, 0), statement)
+            return cursor.rowcount
+        except self.error_types as e:
+            connection.rollback()
+            logger.error(f"Error executing batch query: {e}")
+            raise
+        finally:
+            cursor.close()
+            self.close_connection(connection)
+
+    def execute_transaction(self, statements):
+        """Run ``(query, params)`` pairs in one transaction; all of them apply or none do."""
+        started = time.perf_counter()
+        connection = self.get_connection()
+        cursor = self.dict_cursor(connection)
+        try:
+            for query, params in statements:
+                cursor.execute(self.prepare_query(query), params or ())
+            connection.commit()
+            Metrics.db_query_duration.observe(time.perf_counter() - started, 'TRANSACTION')
+        except self.error_types as e:
+            connection.rollback()
+            logger.error(f"Error executing transaction: {e}")
+            raise
+        finally:
+            cursor.close()
+            self.close_connection(connection)
+
+    def truncate_tables(self, table_names, progress_callback=None):
+        raise NotImplementedError
+
+    def estimate_row_counts(self, table_names):
+        """Approximate row count per table without scanning it (None when unknown)."""
+        return {table_name: None for table_name in table_names}
@@ -3,13 +3,25 @@ Script to generate visualizations from database data for research paper
 Generates charts and saves them as images
 """
 
+import matplotlib
+matplotlib.use('Agg')  # headless: charts are only ever saved to files
 import matplotlib.pyplot as plt
 import seaborn as sns
 import pandas as pd
 import numpy as np
 from database.db_connection import DatabaseConnection
 from config import Config
+from services.sample_aggregates import SampleAggregates
 import os
+import argparse
+import hashlib
+import inspect
+import json
+import pickle
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
 import arabic_reshaper
 from bidi.algorithm import get_display
@@ -36,77 +48,24 @@ def format_arabic_text(text):
 
 # Create output directory
 output_dir = 'research_visualizations'
+CHART_DPI = 300
 os.makedirs(output_dir, exist_ok=True)
 
 # Initialize database connection
 db = DatabaseConnection()
 
-def fetch_data():
-    """Fetch all corrosion samples from database"""
-    try:
-        query = """
-            SELECT 
-                material,
-                temperature,
-                ph,
-                nacl_percentage,
-                medium,
-                corrosion_rate_mm_per_yr,
-                corrosion_rate_mpy
-            FROM corrosion_samples
-            WHERE temperature IS NOT NULL 
-            AND corrosion_rate_mm_per_yr IS NOT NULL
-            ORDER BY temperature, ph
-        """
-        results = db.execute_query(query)
-        df = pd.DataFrame(results)
-        
-        # Convert numeric columns to float (handle Decimal types from MySQL)
-        numeric_cols = ['temperature', 'ph', 'nacl_percentage', 'corrosion_rate_mm_per_yr', 'corrosion_rate_mpy']
-        for col in numeric_cols:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-        
-        # Remove rows with NaN in critical columns
-        df = df.dropna(subset=['temperature', 'corrosion_rate_mm_per_yr'])
-        
-        print(f"✅ Loaded {len(df)} samples from database")
-        return df
-    except Exception as e:
-        print(f"❌ Error fetching data: {e}")
-        import traceback
-        traceback.print_exc()
-        return None
-
-def generate_ph_vs_corrosion_chart(df):
-    """Generate chart: Corrosion Rate vs pH"""
-    plt.figure(figsize=(12, 8))
-    
-    # Filter out NaN values
-    ph_df = df[df['ph'].notna() & df['corrosion_rate_mm_per_yr'].notna()].copy()
-    
-    if len(ph_df) == 0:
-        print("⚠️  No pH data available")
-        plt.close()
-        return
-    
-    # Group by pH and calculate average
-    ph_data = ph_df.groupby('ph')['corrosion_rate_mm_per_yr'].mean().reset_index()
-    ph_data = ph_data.sort_values('ph')
-    
-    # Ensure numeric types
-    ph_data['ph'] = pd.to_numeric(ph_data['ph'], errors='coerce')
-    ph_data['corrosion_rate_mm_per_yr'] = pd.to_numeric(ph_data['corrosion_rate_mm_per_yr'], errors='coerce')
-    ph_data = ph_data.dropna()
+def generate_ph_vs_corrosion_chart(ph_data, output_path=None, dpi=CHART_DPI, figsize=(12, 8)):
+    """Generate chart: Corrosion Rate vs pH (input: per-pH group stats)"""
+    plt.figure(figsize=figsize)
     
     if len(ph_data) == 0:
-        print("⚠️  No valid pH data after processing")
+        print("⚠️  No pH data available")
         plt.close()
         return
     
-    plt.plot(ph_data['ph'], ph_data['corrosion_rate_mm_per_yr'], 
+    plt.plot(ph_data['ph'], ph_data['mean'], 
              marker='o', linewidth=2.5, markersize=8, color='#2E86AB')
-    plt.fill_between(ph_data['ph'], ph_data['corrosion_rate_mm_per_yr'], 
+    plt.fill_between(ph_data['ph'], ph_data['mean'], 
                      alpha=0.3, color='#2E86AB')
     
     plt.xlabel('pH', fontsize=14, fontweight='bold')
@@ -116,40 +75,23 @@ def generate_ph_vs_corrosion_chart(df):
     plt.grid(True, alpha=0.3)
     plt.tight_layout()
     
-    filename = os.path.join(output_dir, '1_corrosion_vs_ph.png')
-    plt.savefig(filename, dpi=300, bbox_inches='tight')
+    filename = output_path or os.path.join(output_dir, '1_corrosion_vs_ph.png')
+    plt.savefig(filename, dpi=dpi, bbox_inches='tight')
     print(f"✅ Saved: {filename}")
     plt.close()
 
-def generate_temperature_vs_corrosion_chart(df):
-    """Generate chart: Corrosion Rate vs Temperature"""
-    plt.figure(figsize=(12, 8))
-    
-    # Filter out NaN values
-    temp_df = df[df['temperature'].notna() & df['corrosion_rate_mm_per_yr'].notna()].copy()
-    
-    if len(temp_df) == 0:
-        print("⚠️  No temperature data available")
-        plt.close()
-        return
-    
-    # Group by temperature and calculate average
-    temp_data = temp_df.groupby('temperature')['corrosion_rate_mm_per_yr'].mean().reset_index()
-    temp_data = temp_data.sort_values('temperature')
-    
-    # Ensure numeric types
-    temp_data['temperature'] = pd.to_numeric(temp_data['temperature'], errors='coerce')
-    temp_data['corrosion_rate_mm_per_yr'] = pd.to_numeric(temp_data['corrosion_rate_mm_per_yr'], errors='coerce')
-    temp_data = temp_data.dropna()
+def generate_temperature_vs_corrosion_chart(temp_data, output_path=None, dpi=CHART_DPI, figsize=(12, 8)):
+    """Generate chart: Corrosion Rate vs Temperature (input: per-temperature group stats)"""
+    plt.figure(figsize=figsize)
     
     if len(temp_data) == 0:
-        print("⚠️  No valid temperature data after processing")
+        print("⚠️  No temperature data available")
         plt.close()
         return
     
-    plt.plot(temp_data['temperature'], temp_data['corrosion_rate_mm_per_yr'], 
+    plt.plot(temp_data['temperature'], temp_data['mean'], 
              marker='s', linewidth=2.5, markersize=8, color='#A23B72')
-    plt.fill_between(temp_data['temperature'], temp_data['corrosion_rate_mm_per_yr'], 
+    plt.fill_between(temp_data['temperature'], temp_data['mean'], 
                      alpha=0.3, color='#A23B72')
     
     plt.xlabel('Temperature (°C)', fontsize=14, fontweight='bold')
@@ -159,41 +101,29 @@ def generate_temperature_vs_corrosion_chart(df):
     plt.grid(True, alpha=0.3)
     plt.tight_layout()
     
-    filename = os.path.join(output_dir, '2_corrosion_vs_temperature.png')
-    plt.savefig(filename, dpi=300, bbox_inches='tight')
+    filename = output_path or os.path.join(output_dir, '2_corrosion_vs_temperature.png')
+    plt.savefig(filename, dpi=dpi, bbox_inches='tight')
     print(f"✅ Saved: {filename}")
     plt.close()
 
-def generate_medium_vs_corrosion_chart(df):
-    """Generate chart: Corrosion Rate vs Medium"""
-    plt.figure(figsize=(14, 8))
+def generate_medium_vs_corrosion_chart(medium_data, output_path=None, dpi=CHART_DPI, figsize=(14, 8)):
+    """Generate chart: Corrosion Rate vs Medium (input: per-medium group stats)"""
+    plt.figure(figsize=figsize)
     
-    # Filter out NaN values
-    medium_df = df[df['medium'].notna() & df['corrosion_rate_mm_per_yr'].notna()].copy()
-    
-    if len(medium_df) == 0:
+    if len(medium_data) == 0:
         print("⚠️  No medium data available")
         plt.close()
         return
     
-    # Group by medium and calculate average
-    medium_data = medium_df.groupby('medium')['corrosion_rate_mm_per_yr'].mean().reset_index()
-    medium_data['corrosion_rate_mm_per_yr'] = pd.to_numeric(medium_data['corrosion_rate_mm_per_yr'], errors='coerce')
-    medium_data = medium_data.dropna()
-    medium_data = medium_data.sort_values('corrosion_rate_mm_per_yr', ascending=False)
+    medium_data = medium_data.sort_values('mean', ascending=False)
     medium_data = medium_data.head(10)  # Top 10 mediums
     
-    if len(medium_data) == 0:
-        print("⚠️  No valid medium data after processing")
-        plt.close()
-        return
-    
     colors = sns.color_palette("husl", len(medium_data))
-    bars = plt.bar(range(len(medium_data)), medium_data['corrosion_rate_mm_per_yr'], 
+    bars = plt.bar(range(len(medium_data)), medium_data['mean'], 
                    color=colors, alpha=0.8, edgecolor='black', linewidth=1.5)
     
     # Add value labels on bars
-    for i, (bar, value) in enumerate(zip(bars, medium_data['corrosion_rate_mm_per_yr'])):
+    for i, (bar, value) in enumerate(zip(bars, medium_data['mean'])):
         plt.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.01,
                 f'{value:.4f}', ha='center', va='bottom', fontsize=10, fontweight='bold')
     
@@ -205,45 +135,30 @@ def generate_medium_vs_corrosion_chart(df):
     plt.grid(True, alpha=0.3, axis='y')
     plt.tight_layout()
     
-    filename = os.path.join(output_dir, '3_corrosion_vs_medium.png')
-    plt.savefig(filename, dpi=300, bbox_inches='tight')
+    filename = output_path or os.path.join(output_dir, '3_corrosion_vs_medium.png')
+    plt.savefig(filename, dpi=dpi, bbox_inches='tight')
     print(f"✅ Saved: {filename}")
     plt.close()
 
-def generate_material_comparison_chart(df):
-    """Generate chart: Material Comparison"""
-    plt.figure(figsize=(12, 8))
-    
-    # Filter out NaN values
-    material_df = df[df['material'].notna() & df['corrosion_rate_mm_per_yr'].notna()].copy()
+def generate_material_comparison_chart(material_data, output_path=None, dpi=CHART_DPI, figsize=(12, 8)):
+    """Generate chart: Material Comparison (input: per-material group stats)"""
+    plt.figure(figsize=figsize)
     
-    if len(material_df) == 0:
+    if len(material_data) == 0:
         print("⚠️  No material data available")
         plt.close()
         return
     
-    # Group by material and calculate statistics
-    material_data = material_df.groupby('material').agg({
-        'corrosion_rate_mm_per_yr': ['mean', 'count']
-    }).reset_index()
-    material_data.columns = ['material', 'avg_rate', 'count']
-    material_data['avg_rate'] = pd.to_numeric(material_data['avg_rate'], errors='coerce')
-    material_data = material_data.dropna()
-    material_data = material_data.sort_values('avg_rate', ascending=False)
-    
-    if len(material_data) == 0:
-        print("⚠️  No valid material data after processing")
-        plt.close()
-        return
+    material_data = material_data.sort_values('mean', ascending=False)
     
     colors = ['#F18F01' if 'X65' in mat.upper() or 'API' in mat.upper() 
               else '#C73E1D' for mat in material_data['material']]
     
-    bars = plt.barh(range(len(material_data)), material_data['avg_rate'], 
+    bars = plt.barh(range(len(material_data)), material_data['mean'], 
                    color=colors, alpha=0.8, edgecolor='black', linewidth=1.5)
     
     # Add value labels
-    for i, (bar, value, count) in enumerate(zip(bars, material_data['avg_rate'], 
+    for i, (bar, value, count) in enumerate(zip(bars, material_data['mean'], 
                                                   material_data['count'])):
         plt.text(bar.get_width() + 0.01, bar.get_y() + bar.get_height()/2,
                 f'{value:.4f} mm/yr (n={count})', 
@@ -257,26 +172,21 @@ def generate_material_comparison_chart(df):
     plt.grid(True, alpha=0.3, axis='x')
     plt.tight_layout()
     
-    filename = os.path.join(output_dir, '4_material_comparison.png')
-    plt.savefig(filename, dpi=300, bbox_inches='tight')
+    filename = output_path or os.path.join(output_dir, '4_material_comparison.png')
+    plt.savefig(filename, dpi=dpi, bbox_inches='tight')
     print(f"✅ Saved: {filename}")
     plt.close()
 
-def generate_nacl_vs_corrosion_chart(df):
-    """Generate chart: Corrosion Rate vs NaCl Concentration"""
-    plt.figure(figsize=(12, 8))
+def generate_nacl_vs_corrosion_chart(nacl_grouped, output_path=None, dpi=CHART_DPI, figsize=(12, 8)):
+    """Generate chart: Corrosion Rate vs NaCl Concentration (input: per-NaCl group stats)"""
+    plt.figure(figsize=figsize)
     
-    # Filter data with NaCl percentage
-    nacl_data = df[df['nacl_percentage'].notna()].copy()
-    if len(nacl_data) > 0:
-        nacl_grouped = nacl_data.groupby('nacl_percentage')['corrosion_rate_mm_per_yr'].mean().reset_index()
-        nacl_grouped = nacl_grouped.sort_values('nacl_percentage')
-        
-        plt.scatter(nacl_grouped['nacl_percentage'], nacl_grouped['corrosion_rate_mm_per_yr'], 
+    if len(nacl_grouped) > 0:
+        plt.scatter(nacl_grouped['nacl_percentage'], nacl_grouped['mean'], 
                    s=100, alpha=0.7, color='#06A77D', edgecolors='black', linewidth=2)
         
         # Add trend line
-        z = np.polyfit(nacl_grouped['nacl_percentage'], nacl_grouped['corrosion_rate_mm_per_yr'], 1)
+        z = np.polyfit(nacl_grouped['nacl_percentage'], nacl_grouped['mean'], 1)
         p = np.poly1d(z)
         plt.plot(nacl_grouped['nacl_percentage'], p(nacl_grouped['nacl_percentage']), 
                 "r--", alpha=0.8, linewidth=2, label='Trend Line')
@@ -289,56 +199,31 @@ def generate_nacl_vs_corrosion_chart(df):
         plt.grid(True, alpha=0.3)
         plt.tight_layout()
         
-        filename = os.path.join(output_dir, '5_corrosion_vs_nacl.png')
-        plt.savefig(filename, dpi=300, bbox_inches='tight')
+        filename = output_path or os.path.join(output_dir, '5_corrosion_vs_nacl.png')
+        plt.savefig(filename, dpi=dpi, bbox_inches='tight')
         print(f"✅ Saved: {filename}")
     else:
         print("⚠️  No NaCl data available")
     plt.close()
 
-def generate_3d_surface_plot(df):
-    """Generate 3D surface plot: Temperature vs pH vs Corrosion Rate"""
+def generate_3d_surface_plot(surface, output_path=None, dpi=CHART_DPI, figsize=(14, 10)):
+    """Generate 3D surface plot: Temperature vs pH vs Corrosion Rate (input: binned grid)"""
     from mpl_toolkits.mplot3d import Axes3D
     
-    # Filter out NaN values
-    plot_df = df[df['temperature'].notna() & df['ph'].notna() & df['corrosion_rate_mm_per_yr'].notna()].copy()
-    
-    if len(plot_df) == 0:
+    if not np.any(surface['count'] > 0):
         print("⚠️  No data available for 3D plot")
         plt.close()
         return
     
-    # Ensure numeric types
-    plot_df['temperature'] = pd.to_numeric(plot_df['temperature'], errors='coerce')
-    plot_df['ph'] = pd.to_numeric(plot_df['ph'], errors='coerce')
-    plot_df['corrosion_rate_mm_per_yr'] = pd.to_numeric(plot_df['corrosion_rate_mm_per_yr'], errors='coerce')
-    plot_df = plot_df.dropna()
-    
-    if len(plot_df) == 0:
-        print("⚠️  No valid data for 3D plot after processing")
-        plt.close()
-        return
-    
-    fig = plt.figure(figsize=(14, 10))
+    fig = plt.figure(figsize=figsize)
     ax = fig.add_subplot(111, projection='3d')
     
-    # Create meshgrid
-    temp_range = np.linspace(plot_df['temperature'].min(), plot_df['temperature'].max(), 20)
-    ph_range = np.linspace(plot_df['ph'].min(), plot_df['ph'].max(), 20)
-    T, P = np.meshgrid(temp_range, ph_range)
-    
-    # Calculate average corrosion rate for each combination
-    Z = np.zeros_like(T)
-    for i in range(len(ph_range)):
-        for j in range(len(temp_range)):
-            subset = plot_df[(plot_df['ph'].between(ph_range[i]-0.5, ph_range[i]+0.5)) & 
-                           (plot_df['temperature'].between(temp_range[j]-5, temp_range[j]+5))]
-            if len(subset) > 0:
-                Z[i, j] = subset['corrosion_rate_mm_per_yr'].mean()
-            else:
-                Z[i, j] = plot_df['corrosion_rate_mm_per_yr'].mean()
-    
-    surf = ax.plot_surface(T, P, Z, cmap='viridis', alpha=0.8, edgecolor='none')
+    T, P = np.meshgrid(surface['x'], surface['y'])
+    # Leave grid points without nearby samples empty instead of inventing values
+    Z = np.ma.masked_invalid(surface['mean'])
+    
+    surf = ax.plot_surface(T, P, Z, cmap='viridis', alpha=0.8, edgecolor='none',
+                           vmin=Z.min(), vmax=Z.max())
     ax.set_xlabel('Temperature (°C)', fontsize=12, fontweight='bold')
     ax.set_ylabel('pH', fontsize=12, fontweight='bold')
     ax.set_zlabel('Corrosion Rate (mm/year)', fontsize=12, fontweight='bold')
@@ -348,22 +233,19 @@ def generate_3d_surface_plot(df):
     fig.colorbar(surf, shrink=0.5, aspect=5)
     plt.tight_layout()
     
-    filename = os.path.join(output_dir, '6_3d_surface_plot.png')
-    plt.savefig(filename, dpi=300, bbox_inches='tight')
+    filename = output_path or os.path.join(output_dir, '6_3d_surface_plot.png')
+    plt.savefig(filename, dpi=dpi, bbox_inches='tight')
     print(f"✅ Saved: {filename}")
     plt.close()
 
-def generate_statistics_summary(df):
-    """Generate statistics summary table as image"""
-    fig, ax = plt.subplots(figsize=(14, 8))
+def generate_statistics_summary(summary, output_path=None, dpi=CHART_DPI, figsize=(14, 8)):
+    """Generate statistics summary table as image (input: SampleAggregates.summary)"""
+    fig, ax = plt.subplots(figsize=figsize)
     ax.axis('tight')
     ax.axis('off')
     
-    # Ensure numeric types for calculations
-    df_numeric = df.copy()
-    df_numeric['corrosion_rate_mm_per_yr'] = pd.to_numeric(df_numeric['corrosion_rate_mm_per_yr'], errors='coerce')
-    df_numeric['temperature'] = pd.to_numeric(df_numeric['temperature'], errors='coerce')
-    df_numeric['ph'] = pd.to_numeric(df_numeric['ph'], errors='coerce')
+    def fmt(value, digits):
+        return f"{value:.{digits}f}" if value is not None else "N/A"
     
     # Calculate statistics
     stats_data = {
@@ -379,15 +261,15 @@ def generate_statistics_summary(df):
             'Number of Mediums'
         ],
         'Value': [
-            len(df),
-            f"{df_numeric['corrosion_rate_mm_per_yr'].mean():.4f}" if df_numeric['corrosion_rate_mm_per_yr'].notna().any() else "N/A",
-            f"{df_numeric['corrosion_rate_mm_per_yr'].min():.4f}" if df_numeric['corrosion_rate_mm_per_yr'].notna().any() else "N/A",
-            f"{df_numeric['corrosion_rate_mm_per_yr'].max():.4f}" if df_numeric['corrosion_rate_mm_per_yr'].notna().any() else "N/A",
-            f"{df_numeric['corrosion_rate_mm_per_yr'].std():.4f}" if df_numeric['corrosion_rate_mm_per_yr'].notna().any() else "N/A",
-            f"{df_numeric['temperature'].mean():.2f}" if df_numeric['temperature'].notna().any() else "N/A",
-            f"{df_numeric['ph'].mean():.2f}" if df_numeric['ph'].notna().any() else "N/A",
-            df['material'].nunique() if 'material' in df.columns else 0,
-            df['medium'].nunique() if 'medium' in df.columns else 0
+            summary['total_samples'],
+            fmt(summary['rate_mean'], 4),
+            fmt(summary['rate_min'], 4),
+            fmt(summary['rate_max'], 4),
+            fmt(summary['rate_std'], 4),
+            fmt(summary['temperature_mean'], 2),
+            fmt(summary['ph_mean'], 2),
+            summary['materials'],
+            summary['mediums']
         ]
     }
     
@@ -418,37 +300,22 @@ def generate_statistics_summary(df):
               fontsize=16, fontweight='bold', pad=20)
     plt.tight_layout()
     
-    filename = os.path.join(output_dir, '7_statistics_summary.png')
-    plt.savefig(filename, dpi=300, bbox_inches='tight')
+    filename = output_path or os.path.join(output_dir, '7_statistics_summary.png')
+    plt.savefig(filename, dpi=dpi, bbox_inches='tight')
     print(f"✅ Saved: {filename}")
     plt.close()
 
-def generate_correlation_heatmap(df):
-    """Generate correlation heatmap"""
-    plt.figure(figsize=(10, 8))
-    
-    # Select numeric columns and convert to numeric
-    numeric_cols = ['temperature', 'ph', 'nacl_percentage', 'corrosion_rate_mm_per_yr']
-    available_cols = [col for col in numeric_cols if col in df.columns]
-    
-    if len(available_cols) < 2:
-        print("⚠️  Not enough numeric columns for correlation heatmap")
-        plt.close()
-        return
-    
-    # Convert to numeric
-    corr_df = df[available_cols].copy()
-    for col in available_cols:
-        corr_df[col] = pd.to_numeric(corr_df[col], errors='coerce')
-    
-    corr_df = corr_df.dropna()
+def generate_correlation_heatmap(correlation, output_path=None, dpi=CHART_DPI, figsize=(10, 8)):
+    """Generate correlation heatmap (input: SampleAggregates.correlation)"""
+    plt.figure(figsize=figsize)
     
-    if len(corr_df) == 0:
+    if correlation['matrix'] is None:
         print("⚠️  No valid data for correlation heatmap")
         plt.close()
         return
     
-    corr_data = corr_df.corr()
+    corr_data = pd.DataFrame(correlation['matrix'], index=correlation['columns'],
+                             columns=correlation['columns'])
     
     sns.heatmap(corr_data, annot=True, fmt='.3f', cmap='coolwarm', 
                 center=0, square=True, linewidths=2, cbar_kws={"shrink": 0.8},
@@ -458,47 +325,289 @@ def generate_correlation_heatmap(df):
               fontsize=16, fontweight='bold', pad=20)
     plt.tight_layout()
     
-    filename = os.path.join(output_dir, '8_correlation_heatmap.png')
-    plt.savefig(filename, dpi=300, bbox_inches='tight')
+    filename = output_path or os.path.join(output_dir, '8_correlation_heatmap.png')
+    plt.savefig(filename, dpi=dpi, bbox_inches='tight')
     print(f"✅ Saved: {filename}")
     plt.close()
 
+# Chart name -> generator, in report order
+CHARTS = {
+    'ph': generate_ph_vs_corrosion_chart,
+    'temperature': generate_temperature_vs_corrosion_chart,
+    'medium': generate_medium_vs_corrosion_chart,
+    'material': generate_material_comparison_chart,
+    'nacl': generate_nacl_vs_corrosion_chart,
+    'surface_3d': generate_3d_surface_plot,
+    'summary': generate_statistics_summary,
+    'correlation': generate_correlation_heatmap,
+}
+
+CHART_FILES = {
+    'ph': '1_corrosion_vs_ph.png',
+    'temperature': '2_corrosion_vs_temperature.png',
+    'medium': '3_corrosion_vs_medium.png',
+    'material': '4_material_comparison.png',
+    'nacl': '5_corrosion_vs_nacl.png',
+    'surface_3d': '6_3d_surface_plot.png',
+    'summary': '7_statistics_summary.png',
+    'correlation': '8_correlation_heatmap.png',
+}
+
+def _group_frame(key):
+    """Per-key rate statistics as a DataFrame (one row per distinct key)"""
+    columns = [key, 'count', 'mean', 'min', 'max', 'std']
+    return pd.DataFrame(SampleAggregates.group_stats(db, key), columns=columns)
+
+# Chart name -> loader of its (already aggregated) input
+CHART_LOADERS = {
+    'ph': lambda: _group_frame('ph'),
+    'temperature': lambda: _group_frame('temperature'),
+    'medium': lambda: _group_frame('medium'),
+    'material': lambda: _group_frame('material'),
+    'nacl': lambda: _group_frame('nacl_percentage'),
+    'surface_3d': lambda: SampleAggregates.surface_grid(
+        db, 'temperature', 'ph',
+        x_resolution=Config.SURFACE_RESOLUTION, y_resolution=Config.SURFACE_RESOLUTION,
+        x_window=5, y_window=0.5,  # average over ±5 °C and ±0.5 pH around each grid point
+    ),
+    'summary': lambda: SampleAggregates.summary(db),
+    'correlation': lambda: SampleAggregates.correlation(
+        db, ['temperature', 'ph', 'nacl_percentage', 'corrosion_rate_mm_per_yr']
+    ),
+}
+
+def fetch_chart_data(names=None):
+    """
+    Load each chart's input from the database.
+
+    Grouping, binning and moments run in SQL, so only the aggregated rows
+    are transferred, however many samples there are.
+    """
+    return {name: CHART_LOADERS[name]() for name in names or CHARTS}
+
+MANIFEST_FILE = 'manifest.json'
+
+def _jsonable(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Cannot fingerprint {type(value).__name__}")
+
+def chart_fingerprint(data):
+    """Hash a chart's aggregated input"""
+    digest = hashlib.sha256()
+    if isinstance(data, pd.DataFrame):
+        digest.update(','.join(map(str, data.columns)).encode())
+        digest.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    else:
+        digest.update(json.dumps(data, sort_keys=True, default=_jsonable).encode())
+    return digest.hexdigest()
+
+def chart_params(name):
+    """Render parameters that change the chart image besides its data"""
+    params = {
+        'dpi': CHART_DPI,
+        # Editing a generator re-renders its chart
+        'generator': hashlib.sha1(inspect.getsource(CHARTS[name]).encode()).hexdigest()[:12],
+    }
+    if name == 'surface_3d':
+        params['resolution'] = Config.SURFACE_RESOLUTION
+    return params
+
+def load_manifest(chart_dir=None):
+    path = os.path.join(chart_dir or output_dir, MANIFEST_FILE)
+    try:
+        with open(path, encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(manifest, chart_dir=None):
+    path = os.path.join(chart_dir or output_dir, MANIFEST_FILE)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as file:
+        json.dump(manifest, file, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def chart_status(data, names=None, chart_dir=None):
+    """
+    Compare every chart with the manifest without rendering anything.
+
+    Returns {name: entry} where ``entry`` is the manifest record the chart
+    would get now plus ``up_to_date``. ``data`` maps chart names to their
+    inputs (see ``fetch_chart_data``). A chart is stale when its input or
+    render parameters changed, or when its image is missing.
+    """
+    chart_dir = chart_dir or output_dir
+    manifest = load_manifest(chart_dir)
+    status = {}
+    for name in names or CHARTS:
+        entry = {
+            'file': CHART_FILES[name],
+            'fingerprint': chart_fingerprint(data[name]),
+            'params': chart_params(name),
+        }
+        recorded = manifest.get(name, {})
+        image_ok = os.path.exists(os.path.join(chart_dir, entry['file'])) or not recorded.get('written', True)
+        entry['up_to_date'] = (
+            recorded.get('fingerprint') == entry['fingerprint']
+            and recorded.get('params') == entry['params']
+            and image_ok
+        )
+        status[name] = entry
+    return status
+
+def stale_charts(data=None, chart_dir=None):
+    """
+    Names of the charts whose images are out of date.
+
+    Meant for exporters that bundle the PNGs: they can check freshness
+    without rendering. Loads the chart inputs from the database when
+    ``data`` is not given.
+    """
+    if data is None:
+        data = fetch_chart_data()
+    return [name for name, entry in chart_status(data, chart_dir=chart_dir).items()
+            if not entry['up_to_date']]
+
+# Chart inputs loaded once per pool worker from the shared snapshot
+_worker_data = None
+
+def _init_chart_worker(snapshot_path, chart_dir):
+    """Pool initializer: load the data snapshot and point the worker at the output directory"""
+    global _worker_data, output_dir
+    with open(snapshot_path, 'rb') as file:
+        _worker_data = pickle.load(file)
+    output_dir = chart_dir
+
+def render_chart(name, data=None):
+    """Render one chart and return (name, seconds, error)"""
+    started = time.perf_counter()
+    try:
+        CHARTS[name]((_worker_data if data is None else data)[name])
+        error = None
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        error = str(e)
+    finally:
+        plt.close('all')
+    return name, time.perf_counter() - started, error
+
+def render_charts(data, names=None, workers=None):
+    """
+    Render the given charts, in parallel when more than one worker is allowed.
+
+    The chart inputs are written once to a pickle snapshot that each pool
+    worker loads in its initializer, so they are neither re-fetched nor
+    re-sent per chart. Returns {name: (seconds, error)}.
+    """
+    names = list(names or CHARTS)
+    workers = min(workers or os.cpu_count() or 1, len(names))
+    timings = {}
+
+    if workers <= 1:
+        for name in names:
+            _, seconds, error = render_chart(name, data)
+            timings[name] = (seconds, error)
+        return timings
+
+    snapshot_dir = tempfile.mkdtemp(prefix='charts-')
+    try:
+        snapshot_path = os.path.join(snapshot_dir, 'chart_data.pkl')
+        with open(snapshot_path, 'wb') as file:
+            pickle.dump({name: data[name] for name in names}, file, protocol=pickle.HIGHEST_PROTOCOL)
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_chart_worker,
+            initargs=(snapshot_path, output_dir),
+        ) as executor:
+            futures = [executor.submit(render_chart, name) for name in names]
+            for future in as_completed(futures):
+                name, seconds, error = future.result()
+                timings[name] = (seconds, error)
+    finally:
+        shutil.rmtree(snapshot_dir, ignore_errors=True)
+    return timings
+
 def main():
     """Main function to generate all visualizations"""
+    parser = argparse.ArgumentParser(description='Generate research paper charts')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Chart rendering processes (default: one per CPU, 1 = serial)')
+    parser.add_argument('--only', nargs='+', choices=list(CHARTS),
+                        help='Render only these charts')
+    parser.add_argument('--force', action='store_true',
+                        help='Re-render charts even if their inputs did not change')
+    parser.add_argument('--check', action='store_true',
+                        help='Only report which charts are out of date (exit code 1 if any)')
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("Generating Research Paper Visualizations")
     print("إنشاء الرسوم البيانية للورقة البحثية")
     print("=" * 60)
     
-    # Fetch data
-    df = fetch_data()
-    if df is None or len(df) == 0:
+    # Fetch the aggregated chart inputs
+    names = args.only or list(CHARTS)
+    try:
+        total_samples = SampleAggregates.summary(db)['total_samples']
+        data = fetch_chart_data(names) if total_samples else None
+    except Exception as e:
+        print(f"❌ Error fetching data: {e}")
+        import traceback
+        traceback.print_exc()
+        return
+    if not data:
         print("❌ No data available. Please upload CSV files first.")
         return
+    print(f"✅ Loaded chart data for {total_samples} samples from database")
     
-    print(f"\n📊 Generating visualizations from {len(df)} samples...\n")
+    status = chart_status(data, names)
+    stale = [name for name in names if args.force or not status[name]['up_to_date']]
     
-    # Generate all charts
-    try:
-        generate_ph_vs_corrosion_chart(df)
-        generate_temperature_vs_corrosion_chart(df)
-        generate_medium_vs_corrosion_chart(df)
-        generate_material_comparison_chart(df)
-        generate_nacl_vs_corrosion_chart(df)
-        generate_3d_surface_plot(df)
-        generate_statistics_summary(df)
-        generate_correlation_heatmap(df)
-        
-        print("\n" + "=" * 60)
+    if args.check:
+        for name in names:
+            print(f"   {name:<12} {'stale' if name in stale else 'up to date'}")
+        raise SystemExit(1 if stale else 0)
+    
+    if not stale:
+        print("\n✅ All charts are up to date (use --force to re-render)")
+        return
+    
+    print(f"\n📊 Generating {len(stale)} of {len(names)} charts from {total_samples} samples...\n")
+    
+    started = time.perf_counter()
+    timings = render_charts(data, stale, args.workers)
+    total = time.perf_counter() - started
+    
+    manifest = load_manifest()
+    for name in stale:
+        if timings[name][1] is None:
+            entry = {k: v for k, v in status[name].items() if k != 'up_to_date'}
+            entry['written'] = os.path.exists(os.path.join(output_dir, entry['file']))
+            manifest[name] = entry
+    save_manifest(manifest)
+    
+    print("\n" + "=" * 60)
+    print("⏱️  Chart timings:")
+    for name in names:
+        if name not in timings:
+            print(f"   {name:<12} {'skipped':>8}  (up to date)")
+            continue
+        seconds, error = timings[name]
+        status_text = f"❌ {error}" if error else "✅"
+        print(f"   {name:<12} {seconds:7.2f}s  {status_text}")
+    print(f"   {'total':<12} {total:7.2f}s")
+    
+    failed = [name for name, (_, error) in timings.items() if error]
+    if failed:
+        print(f"❌ Failed charts: {', '.join(failed)}")
+    else:
         print("✅ All visualizations generated successfully!")
-        print(f"📁 Output directory: {os.path.abspath(output_dir)}")
-        print("=" * 60)
-        
-    except Exception as e:
-        print(f"\n❌ Error generating visualizations: {e}")
-        import traceback
-        traceback.print_exc()
+    print(f"📁 Output directory: {os.path.abspath(output_dir)}")
+    print("=" * 60)
 
 if __name__ == '__main__':
     main()
-
@@ -0,0 +1,90 @@
+"""
+Gunicorn configuration for the production, multi-worker API.
+
+The app, the trained model and the lookup data are loaded once in the
+master (``preload_app``) and shared copy-on-write with the forked workers.
+Each worker opens its own database connection pool after the fork. When the
+model file changes, the master reloads the model and sends itself SIGHUP,
+which replaces the workers gracefully with forks that share the new model.
+
+Usage:
+    gunicorn -c gunicorn.conf.py app:app
+"""
+
+import gc
+import multiprocessing
+import os
+import signal
+import threading
+import time
+
+from config import Config
+
+bind = os.getenv('GUNICORN_BIND', f"0.0.0.0:{Config.FLASK_PORT}")
+# Calculations are CPU-bound, so one synchronous worker per core.
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+worker_class = 'sync'
+preload_app = True
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 120))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 0))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 0))
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-')
+
+MODEL_WATCH_INTERVAL = float(os.getenv('MODEL_WATCH_INTERVAL', 5))
+
+_model_watcher = None
+
+
+def _watch_model(server):
+    """Reload the model in the master and restart workers when the model file changes."""
+    from services.corrosion_calculator import CorrosionRateCalculator
+
+    def model_mtime():
+        try:
+            return os.stat(CorrosionRateCalculator.MODEL_PATH).st_mtime_ns
+        except OSError:
+            return None
+
+    last_seen = model_mtime()
+    while True:
+        time.sleep(MODEL_WATCH_INTERVAL)
+        current = model_mtime()
+        if current is None or current == last_seen:
+            continue
+        last_seen = current
+        gc.unfreeze()
+        if CorrosionRateCalculator._load_cached_model() is None:
+            server.log.warning("Model file changed but could not be loaded; keeping workers")
+            continue
+        gc.freeze()
+        server.log.info(
+            f"Model changed (version {CorrosionRateCalculator.model_version()}); "
+            "restarting workers"
+        )
+        os.kill(server.pid, signal.SIGHUP)
+
+
+def when_ready(server):
+    global _model_watcher
+    from services.startup import Startup
+
+    # Warm up in the master so workers inherit the loaded model and imports.
+    # The database is skipped here: connections are opened per worker.
+    Startup.warm_up(db=None)
+    # Move everything loaded so far out of the GC's reach, so collections in
+    # the workers do not touch (and copy) the shared pages.
+    gc.freeze()
+
+    if _model_watcher is None:
+        _model_watcher = threading.Thread(
+            target=_watch_model, args=(server,), name='model-watcher', daemon=True
+        )
+        _model_watcher.start()
+
+
+def post_worker_init(worker):
+    from app import db
+    from services.startup import Startup
+
+    Startup.warm_up(db=db)
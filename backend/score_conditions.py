@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Score a CSV, Parquet or Arrow file of operating conditions with the active model.
+
+Usage:
+    python score_conditions.py conditions.parquet scored.parquet --workers 8
+    python score_conditions.py conditions.csv scored.csv --chunk-rows 250000
+"""
+
+import argparse
+import sys
+
+from services.bulk_scoring import BulkScorer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk corrosion-rate scoring")
+    parser.add_argument("input", help="CSV, Parquet or Arrow file with temperature, pH and NaCl columns")
+    parser.add_argument("output", help="CSV, Parquet or Arrow file to write (input columns plus rates)")
+    parser.add_argument("--workers", type=int, default=None, help="Scoring processes (default: SCORE_WORKERS)")
+    parser.add_argument("--chunk-rows", type=int, default=None, help="Rows per chunk (default: SCORE_CHUNK_ROWS)")
+    parser.add_argument("--quiet", action="store_true", help="Only print the final summary")
+    args = parser.parse_args()
+
+    def progress(summary):
+        print(
+            f"  {summary['rows']:>12,} rows  {summary['rows_per_second'] or 0:>10,} rows/s",
+            file=sys.stderr,
+        )
+
+    try:
+        summary = BulkScorer.score_file(
+            args.input,
+            args.output,
+            workers=args.workers,
+            chunk_rows=args.chunk_rows,
+            progress=None if args.quiet else progress,
+        )
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    print(f"Model version: {summary['model_version'] or 'none (legacy empirical model only)'}")
+    print(
+        f"Scored {summary['scored']:,} of {summary['rows']:,} rows in {summary['seconds']:.1f} s "
+        f"({summary['rows_per_second']:,} rows/s, {summary['workers']} workers)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
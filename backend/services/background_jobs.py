@@ -0,0 +1,202 @@
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+try:
+    from config import Config
+except ModuleNotFoundError:
+    from backend.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundJobManager:
+    """
+    Run long maintenance tasks off the request thread and track their progress.
+
+    Jobs live in the process that runs them. Jobs submitted with
+    ``shared=True`` also write their record to ``JOB_STATE_DIR`` on every
+    change, so any web worker can answer ``/api/jobs/<id>`` and the
+    ``exclusive`` check covers the jobs of every worker.
+    """
+
+    MAX_FINISHED_JOBS = 50
+
+    _jobs: "OrderedDict[str, Dict]" = OrderedDict()
+    _shared_ids = set()
+    _lock = threading.Lock()
+
+    @classmethod
+    def submit(cls, name: str, func: Callable, exclusive: bool = True, shared: bool = False) -> Dict:
+        """
+        Start ``func(report_progress)`` in a daemon thread.
+
+        ``report_progress(fraction, message)`` updates the job record. When
+        ``exclusive`` is set and a job with the same name is still running,
+        that job is returned instead of starting a second one.
+        """
+        with cls._lock:
+            if exclusive:
+                for job in cls._jobs.values():
+                    if job["name"] == name and job["status"] in ("queued", "running"):
+                        return dict(job)
+                if shared:
+                    for job in cls._shared_jobs():
+                        if job["name"] == name and job["status"] in ("queued", "running"):
+                            return job
+
+            job_id = uuid.uuid4().hex
+            job = {
+                "id": job_id,
+                "name": name,
+                "status": "queued",
+                "progress": 0.0,
+                "message": "Queued",
+                "result": None,
+                "error": None,
+                "created_at": time.time(),
+                "started_at": None,
+                "finished_at": None,
+            }
+            cls._jobs[job_id] = job
+            if shared:
+                job["pid"] = os.getpid()
+                cls._shared_ids.add(job_id)
+                cls._write_shared(job)
+                cls._prune_shared()
+            cls._prune_locked()
+
+        thread = threading.Thread(
+            target=cls._run, args=(job_id, func), name=f"job-{name}", daemon=True
+        )
+        thread.start()
+        return dict(job)
+
+    @classmethod
+    def get(cls, job_id: str) -> Optional[Dict]:
+        """The job record, from this process or (shared jobs) from any worker."""
+        with cls._lock:
+            job = cls._jobs.get(job_id)
+            if job:
+                return dict(job)
+        if not job_id.isalnum():
+            return None
+        return cls._read_shared(os.path.join(Config.JOB_STATE_DIR, f"{job_id}.json"))
+
+    @classmethod
+    def _run(cls, job_id: str, func: Callable) -> None:
+        cls._update(job_id, status="running", started_at=time.time(), message="Running")
+
+        def report_progress(fraction: float, message: Optional[str] = None) -> None:
+            changes = {"progress": round(min(max(fraction, 0.0), 1.0), 4)}
+            if message:
+                changes["message"] = message
+            cls._update(job_id, **changes)
+
+        try:
+            result = func(report_progress)
+        except Exception as e:
+            logger.error(f"Background job {job_id} failed: {e}", exc_info=True)
+            cls._update(
+                job_id,
+                status="failed",
+                error=str(e),
+                message="Failed",
+                finished_at=time.time(),
+            )
+            return
+
+        cls._update(
+            job_id,
+            status="completed",
+            progress=1.0,
+            result=result,
+            message="Completed",
+            finished_at=time.time(),
+        )
+
+    @classmethod
+    def _update(cls, job_id: str, **changes) -> None:
+        with cls._lock:
+            job = cls._jobs.get(job_id)
+            if job:
+                job.update(changes)
+                if job_id in cls._shared_ids:
+                    cls._write_shared(job)
+
+    @classmethod
+    def _prune_locked(cls) -> None:
+        finished = [
+            job_id
+            for job_id, job in cls._jobs.items()
+            if job["status"] in ("completed", "failed")
+        ]
+        for job_id in finished[: max(0, len(finished) - cls.MAX_FINISHED_JOBS)]:
+            del cls._jobs[job_id]
+            cls._shared_ids.discard(job_id)
+
+    # Shared job files --------------------------------------------------
+
+    @staticmethod
+    def _write_shared(job: Dict) -> None:
+        """Replace the job's status file in one step (readers never see a partial file)."""
+        try:
+            os.makedirs(Config.JOB_STATE_DIR, exist_ok=True)
+            path = os.path.join(Config.JOB_STATE_DIR, f"{job['id']}.json")
+            tmp_path = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                json.dump(job, file, default=str)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write status of job {job['id']}: {e}")
+
+    @staticmethod
+    def _read_shared(path: str) -> Optional[Dict]:
+        try:
+            with open(path, encoding="utf-8") as file:
+                job = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if job["status"] in ("queued", "running") and not _process_alive(job.get("pid")):
+            # The worker running it exited (restart, crash) before the job finished
+            job.update(status="failed", error="The worker running this job exited", message="Failed")
+        return job
+
+    @classmethod
+    def _shared_jobs(cls):
+        try:
+            entries = [e.path for e in os.scandir(Config.JOB_STATE_DIR) if e.name.endswith(".json")]
+        except OSError:
+            return []
+        return [job for job in map(cls._read_shared, entries) if job is not None]
+
+    @staticmethod
+    def _prune_shared() -> None:
+        """Keep the newest ``JOB_STATE_MAX_FILES`` status files."""
+        try:
+            entries = [e for e in os.scandir(Config.JOB_STATE_DIR) if e.name.endswith(".json")]
+        except OSError:
+            return
+        excess = len(entries) - Config.JOB_STATE_MAX_FILES
+        for entry in sorted(entries, key=lambda e: e.stat().st_mtime)[: max(0, excess)]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+
+def _process_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
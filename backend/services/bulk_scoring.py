@@ -0,0 +1,240 @@
+"""
+Offline scoring of large condition files with the active corrosion model.
+
+Rows are streamed from CSV, Parquet or Arrow files in chunks, scored on a
+process pool and written to any of those formats in input order; at most
+``2 * workers`` chunks are in flight, so memory is bounded by the chunk
+size. The output is written beside the target and only moved over it once
+every chunk is scored, so a failed run leaves no partial file. Inputs are read with the same column aliases as ``CSVProcessor``.
+Like the calculator, rows with a positive NaCl value use the trained model
+and the others the legacy empirical model; rows without a temperature or
+pH get no rate.
+"""
+
+import logging
+import os
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Callable, Dict, Optional
+
+import numpy as np
+
+try:
+    from config import Config
+    from services.corrosion_calculator import CorrosionRateCalculator
+    from services.csv_processor import CSVProcessor
+    from services.prediction_kernel import PredictionKernel
+    from services.table_reader import file_format, read_chunks
+except ModuleNotFoundError:
+    from backend.config import Config
+    from backend.services.corrosion_calculator import CorrosionRateCalculator
+    from backend.services.csv_processor import CSVProcessor
+    from backend.services.prediction_kernel import PredictionKernel
+    from backend.services.table_reader import file_format, read_chunks
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+SCORE_FIELDS = ('material', 'temperature', 'ph', 'nacl_percentage', 'medium')
+
+# Set in each pool process by _init_worker
+_worker_parameters: Optional[Dict[str, float]] = None
+
+
+class _ChunkWriter:
+    """Appends scored chunks to a temporary CSV, Parquet or Arrow IPC file beside ``path``."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.format = file_format(path)
+        self.tmp_path = f"{path}.{uuid.uuid4().hex[:8]}.tmp{os.path.splitext(path)[1]}"
+        self._writer = None
+        self._schema = None
+        self._header = True
+
+    def write(self, frame: "pd.DataFrame") -> None:
+        try:
+            import pyarrow as pa
+        except ImportError:
+            if self.format != 'csv':
+                raise ValueError("Writing Parquet and Arrow files requires pyarrow")
+            frame.to_csv(self.tmp_path, mode='w' if self._header else 'a', header=self._header, index=False)
+            self._header = False
+            return
+
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        if self._writer is None:
+            self._schema = table.schema
+            if self.format == 'parquet':
+                import pyarrow.parquet as pq
+
+                self._writer = pq.ParquetWriter(self.tmp_path, table.schema)
+            elif self.format == 'arrow':
+                self._writer = pa.ipc.new_file(self.tmp_path, table.schema)
+            else:
+                # Several times faster than DataFrame.to_csv
+                import pyarrow.csv as pa_csv
+
+                self._writer = pa_csv.CSVWriter(self.tmp_path, table.schema)
+        self._writer.write_table(table.cast(self._schema))
+
+    def close(self, keep: bool) -> None:
+        """Finish the file and move it over ``path`` when ``keep``, otherwise delete it."""
+        try:
+            if self._writer is not None:
+                self._writer.close()
+        except Exception:
+            keep = False
+            raise
+        finally:
+            if os.path.exists(self.tmp_path):
+                if keep:
+                    os.replace(self.tmp_path, self.path)
+                else:
+                    os.remove(self.tmp_path)
+
+
+def _init_worker(parameters: Optional[Dict[str, float]]) -> None:
+    global _worker_parameters
+    _worker_parameters = parameters
+
+
+def _score_in_worker(frame: "pd.DataFrame") -> np.ndarray:
+    return BulkScorer.score_frame(frame, _worker_parameters)
+
+
+class BulkScorer:
+    """Score condition files in chunks across worker processes."""
+
+    @staticmethod
+    def score_frame(frame: "pd.DataFrame", parameters: Optional[Dict[str, float]]) -> np.ndarray:
+        """Rates (mm/yr) for one chunk; NaN where temperature or pH is missing."""
+        fields = CSVProcessor.extract_columns(frame, SCORE_FIELDS)
+        size = len(frame)
+
+        def numeric(name):
+            if name not in fields:
+                return np.full(size, np.nan)
+            return fields[name].to_numpy(dtype=float)
+
+        temperature, ph, nacl = numeric('temperature'), numeric('ph'), numeric('nacl_percentage')
+        rates = np.full(size, np.nan)
+        scorable = ~np.isnan(temperature) & ~np.isnan(ph)
+        learned = scorable & (nacl > 0) if parameters is not None else np.zeros(size, dtype=bool)
+
+        if learned.any():
+            rates[learned] = PredictionKernel(parameters).predict(
+                nacl[learned], temperature[learned] + 273.15, ph[learned], workers=1
+            )
+
+        legacy = scorable & ~learned
+        if legacy.any():
+            import pandas as pd
+
+            # The legacy factors depend on the material and medium text, so score per pair
+            material = fields['material'] if 'material' in fields else pd.Series('', index=frame.index)
+            medium = fields['medium'] if 'medium' in fields else pd.Series(None, index=frame.index)
+            groups = pd.DataFrame({
+                'material': material.fillna('').to_numpy()[legacy],
+                'medium': medium.to_numpy(dtype=object)[legacy],
+            }).groupby(['material', 'medium'], dropna=False, sort=False).indices
+            rows = np.flatnonzero(legacy)
+            for (material_name, medium_name), members in groups.items():
+                selected = rows[members]
+                nacl_values = nacl[selected]
+                rates[selected] = CorrosionRateCalculator.legacy_rate(
+                    temperature[selected],
+                    ph[selected],
+                    # Missing NaCl leaves the NaCl factor at 1, as in the calculator
+                    np.where(np.isnan(nacl_values), 0.0, nacl_values),
+                    material_name,
+                    medium_name if isinstance(medium_name, str) else None,
+                )
+        return rates
+
+    @classmethod
+    def score_file(
+        cls,
+        input_path: str,
+        output_path: str,
+        workers: Optional[int] = None,
+        chunk_rows: Optional[int] = None,
+        progress: Optional[Callable[[Dict], None]] = None,
+    ) -> Dict:
+        """
+        Score ``input_path`` into ``output_path`` (the input columns plus
+        ``corrosion_rate_mm_per_yr`` and ``corrosion_rate_mpy``, rounded as
+        the calculator does). ``progress`` receives the running summary after
+        each chunk. Raises ValueError for unsupported files or columns.
+        """
+        file_format(output_path)
+        workers = workers or Config.SCORE_WORKERS or os.cpu_count() or 1
+        chunk_rows = chunk_rows or Config.SCORE_CHUNK_ROWS
+        model_data = CorrosionRateCalculator._load_or_train_model()
+        parameters = model_data['parameters'] if model_data else None
+
+        started = time.perf_counter()
+        summary = {
+            'input': input_path,
+            'output': output_path,
+            'model_version': CorrosionRateCalculator.model_version(),
+            'workers': workers,
+            'rows': 0,
+            'scored': 0,
+            'chunks': 0,
+        }
+        writer = _ChunkWriter(output_path)
+        pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(parameters,)) if workers > 1 else None
+
+        def finish(frame, rates):
+            frame = frame.assign(
+                corrosion_rate_mm_per_yr=np.round(rates, 4),
+                corrosion_rate_mpy=np.round(rates * 39.37, 2),
+            )
+            writer.write(frame)
+            summary['rows'] += len(frame)
+            summary['scored'] += int(np.count_nonzero(~np.isnan(rates)))
+            summary['chunks'] += 1
+            summary['seconds'] = round(time.perf_counter() - started, 3)
+            summary['rows_per_second'] = round(summary['rows'] / summary['seconds']) if summary['seconds'] else None
+            if progress:
+                progress(summary)
+
+        succeeded = False
+        try:
+            checked = False
+            pending = deque()
+            for frame in read_chunks(input_path, chunk_rows):
+                if not checked:
+                    missing = [f for f in ('temperature', 'ph')
+                               if f not in CSVProcessor.source_columns(frame.columns, [f])]
+                    if missing:
+                        raise ValueError(f"Missing condition columns: {missing}")
+                    checked = True
+                if pool is None:
+                    finish(frame, cls.score_frame(frame, parameters))
+                    continue
+                # Only the alias columns travel to the workers
+                columns = [col for cols in CSVProcessor.source_columns(frame.columns, SCORE_FIELDS).values()
+                           for col in cols]
+                pending.append((frame, pool.submit(_score_in_worker, frame[columns])))
+                while len(pending) >= 2 * workers:
+                    frame, future = pending.popleft()
+                    finish(frame, future.result())
+            while pending:
+                frame, future = pending.popleft()
+                finish(frame, future.result())
+            succeeded = True
+        finally:
+            writer.close(keep=succeeded)
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+
+        summary['seconds'] = round(time.perf_counter() - started, 3)
+        summary['rows_per_second'] = round(summary['rows'] / summary['seconds']) if summary['seconds'] else None
+        logger.info(f"Scored {summary['rows']} rows in {summary['seconds']} s ({summary['rows_per_second']} rows/s)")
+        return summary
@@ -0,0 +1,54 @@
+import logging
+import threading
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CacheRegistry:
+    """Central list of in-process caches that must be dropped when the data changes."""
+
+    _invalidators: Dict[str, Callable[[], None]] = {}
+    _lock = threading.Lock()
+    # Largest sample id this process has seen, from DATA_VERSION_QUERY rows
+    _seen_max_id: Optional[int] = None
+
+    @classmethod
+    def register(cls, name: str, invalidate: Callable[[], None]) -> None:
+        with cls._lock:
+            cls._invalidators[name] = invalidate
+
+    @classmethod
+    def invalidate_all(cls) -> List[str]:
+        """Clear every registered cache and return the names that were cleared."""
+        with cls._lock:
+            invalidators = list(cls._invalidators.items())
+
+        cleared = []
+        for name, invalidate in invalidators:
+            try:
+                invalidate()
+                cleared.append(name)
+            except Exception as e:
+                logger.warning(f"Could not invalidate cache {name}: {e}")
+        return cleared
+
+    @classmethod
+    def observe_data_version(cls, version_row: Dict) -> bool:
+        """
+        Clear every cache when ``version_row`` (a ``DATA_VERSION_QUERY`` row)
+        shows the samples were cleared since this process last looked.
+
+        A clear run by another worker (or outside the app) only invalidates
+        that process's caches; the ids restarting (a largest id below the one
+        seen before, or no rows at all) is how the others notice.
+        """
+        max_id = version_row.get('max_id')
+        max_id = int(max_id) if max_id is not None else None
+        with cls._lock:
+            previous, cls._seen_max_id = cls._seen_max_id, max_id
+        if previous is None or (max_id is not None and max_id >= previous):
+            return False
+        logger.info(f"Sample ids went back from {previous} to {max_id}; invalidating caches")
+        cls.invalidate_all()
+        return True
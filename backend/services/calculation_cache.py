@@ -0,0 +1,83 @@
+"""
+Bounded result cache for ``CorrosionRateCalculator.calculate_corrosion_rate``.
+
+Entries are keyed by (model version, material, medium, temperature, pH,
+NaCl) with the inputs rounded to their DECIMAL(10,2) storage precision, and
+evicted least-recently-used beyond ``CALC_CACHE_SIZE`` entries or after
+``CALC_CACHE_TTL`` seconds (0 keeps them until evicted).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional
+
+try:
+    from config import Config
+    from services.metrics import Metrics
+except ModuleNotFoundError:
+    from backend.config import Config
+    from backend.services.metrics import Metrics
+
+INPUT_DECIMALS = 2
+
+
+def quantize(value: Optional[float]) -> Optional[float]:
+    """Round an input the way the samples tables store it."""
+    return None if value is None else round(float(value), INPUT_DECIMALS)
+
+
+class CalculationCache:
+    """Thread-safe LRU/TTL cache of calculation results."""
+
+    _entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+    _lock = threading.Lock()
+    _stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0, 'clears': 0}
+
+    @staticmethod
+    def enabled() -> bool:
+        return Config.CALC_CACHE_SIZE > 0
+
+    @classmethod
+    def get(cls, key: Hashable) -> Optional[Dict]:
+        now = time.monotonic()
+        with cls._lock:
+            entry = cls._entries.get(key)
+            if entry is not None and entry[0] is not None and entry[0] <= now:
+                del cls._entries[key]
+                cls._stats['expirations'] += 1
+                entry = None
+            if entry is not None:
+                cls._entries.move_to_end(key)
+            cls._stats['hits' if entry is not None else 'misses'] += 1
+        Metrics.record_cache_lookup("calculation", entry is not None)
+        return entry[1] if entry is not None else None
+
+    @classmethod
+    def put(cls, key: Hashable, result: Dict) -> None:
+        ttl = Config.CALC_CACHE_TTL
+        expires = time.monotonic() + ttl if ttl > 0 else None
+        with cls._lock:
+            cls._entries[key] = (expires, result)
+            cls._entries.move_to_end(key)
+            while len(cls._entries) > Config.CALC_CACHE_SIZE:
+                cls._entries.popitem(last=False)
+                cls._stats['evictions'] += 1
+
+    @classmethod
+    def clear(cls) -> None:
+        with cls._lock:
+            cls._entries.clear()
+            cls._stats['clears'] += 1
+
+    @classmethod
+    def stats(cls) -> Dict:
+        with cls._lock:
+            stats = dict(cls._stats, size=len(cls._entries))
+        lookups = stats['hits'] + stats['misses']
+        stats.update(
+            hit_ratio=round(stats['hits'] / lookups, 4) if lookups else 0.0,
+            max_size=Config.CALC_CACHE_SIZE,
+            ttl_seconds=Config.CALC_CACHE_TTL,
+        )
+        return stats
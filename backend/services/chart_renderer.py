@@ -0,0 +1,251 @@
+import hashlib
+import inspect
+import logging
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Dict, Mapping, Optional, Tuple
+
+try:
+    from config import Config
+    from services.cache_registry import CacheRegistry
+    from services.metrics import Metrics
+except ModuleNotFoundError:
+    from backend.config import Config
+    from backend.services.cache_registry import CacheRegistry
+    from backend.services.metrics import Metrics
+
+logger = logging.getLogger(__name__)
+
+# Chart inputs loaded by a render process, reused while the data version is unchanged
+_worker_data = {"version": None, "charts": {}}
+
+
+def _render_in_worker(name: str, params: Dict, version: str, path: str) -> bool:
+    """Render one chart to ``path`` inside a pool process; False when the chart has no data."""
+    import matplotlib.pyplot as plt
+
+    import generate_visualizations as charts
+
+    if _worker_data["version"] != version:
+        _worker_data["charts"] = {}
+        _worker_data["version"] = version
+    if name not in _worker_data["charts"]:
+        _worker_data["charts"].update(charts.fetch_chart_data([name]))
+
+    tmp_path = f"{path}.{uuid.uuid4().hex[:8]}.tmp.{params['format']}"
+    try:
+        charts.CHARTS[name](
+            _worker_data["charts"][name],
+            output_path=tmp_path,
+            dpi=params["dpi"],
+            figsize=(params["width"] / params["dpi"], params["height"] / params["dpi"]),
+        )
+    finally:
+        plt.close("all")
+    if not os.path.exists(tmp_path):
+        return False
+    os.replace(tmp_path, path)
+    return True
+
+
+class ChartRenderer:
+    """
+    Render the research charts on demand for ``/api/charts``.
+
+    Rendering runs in a small process pool so matplotlib never shares state
+    with request threads. Results are cached in memory (LRU, bounded by bytes)
+    and on disk (LRU by access time, bounded by file count). Both are keyed by
+    chart name, data version and render parameters, so new data simply misses.
+    """
+
+    FORMATS = {
+        "png": "image/png",
+        "svg": "image/svg+xml",
+        "pdf": "application/pdf",
+    }
+    DEFAULT_DPI = 100
+    DPI_RANGE = (50, 300)
+    PIXEL_RANGE = (200, 4000)
+
+    _memory: "OrderedDict[str, bytes]" = OrderedDict()
+    _memory_bytes = 0
+    _inflight: Dict[str, Future] = {}
+    _executor: Optional[ProcessPoolExecutor] = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def chart_names():
+        import generate_visualizations as charts
+
+        return list(charts.CHARTS)
+
+    @classmethod
+    def parse_params(cls, name: str, args: Mapping[str, str]) -> Dict:
+        """
+        Validate ``width``/``height`` (pixels), ``dpi`` and ``format`` for ``name``.
+
+        Raises KeyError for an unknown chart and ValueError for bad parameters.
+        A missing width or height keeps the chart's own aspect ratio.
+        """
+        import generate_visualizations as charts
+
+        if name not in charts.CHARTS:
+            raise KeyError(name)
+        default_width, default_height = (
+            inspect.signature(charts.CHARTS[name]).parameters["figsize"].default
+        )
+
+        fmt = args.get("format", "png").lower()
+        if fmt not in cls.FORMATS:
+            raise ValueError(f"format must be one of {', '.join(cls.FORMATS)}")
+
+        dpi = int(args.get("dpi", cls.DEFAULT_DPI))
+        width = int(args["width"]) if args.get("width") else None
+        height = int(args["height"]) if args.get("height") else None
+        if width is None and height is None:
+            width, height = round(default_width * dpi), round(default_height * dpi)
+        elif width is None:
+            width = round(height * default_width / default_height)
+        elif height is None:
+            height = round(width * default_height / default_width)
+
+        if not cls.DPI_RANGE[0] <= dpi <= cls.DPI_RANGE[1]:
+            raise ValueError(f"dpi must be between {cls.DPI_RANGE[0]} and {cls.DPI_RANGE[1]}")
+        for label, value in (("width", width), ("height", height)):
+            if not cls.PIXEL_RANGE[0] <= value <= cls.PIXEL_RANGE[1]:
+                raise ValueError(
+                    f"{label} must be between {cls.PIXEL_RANGE[0]} and {cls.PIXEL_RANGE[1]} pixels"
+                )
+        return {"width": width, "height": height, "dpi": dpi, "format": fmt}
+
+    @staticmethod
+    def cache_key(name: str, params: Dict, version: str) -> str:
+        raw = f"{name}|{version}|{params['width']}x{params['height']}|{params['dpi']}|{params['format']}"
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    @classmethod
+    def get(cls, name: str, params: Dict, version: str) -> Tuple[Optional[bytes], str]:
+        """
+        Return ``(body, source)`` where source is memory, disk or rendered.
+
+        ``body`` is None with source ``empty`` when the chart has no data, or
+        with source ``pending`` when rendering outlasts ``CHART_RENDER_TIMEOUT``
+        (the render keeps going and lands in the disk cache).
+        """
+        key = cls.cache_key(name, params, version)
+
+        with cls._lock:
+            body = cls._memory.get(key)
+            if body is not None:
+                cls._memory.move_to_end(key)
+        Metrics.record_cache_lookup("chart_memory", body is not None)
+        if body is not None:
+            return body, "memory"
+
+        path = cls._disk_path(key, params["format"])
+        body = cls._read_disk(path)
+        Metrics.record_cache_lookup("chart_disk", body is not None)
+        if body is not None:
+            cls._remember(key, body)
+            return body, "disk"
+
+        future = cls._submit(key, name, params, version, path)
+        try:
+            written = future.result(timeout=Config.CHART_RENDER_TIMEOUT)
+        except FutureTimeoutError:
+            return None, "pending"
+        if not written:
+            return None, "empty"
+
+        body = cls._read_disk(path)
+        if body is None:
+            # Evicted between render and read; extremely unlikely, render again next time
+            return None, "pending"
+        cls._remember(key, body)
+        cls._trim_disk()
+        return body, "rendered"
+
+    @classmethod
+    def clear(cls) -> None:
+        """Drop the memory cache and every cached file."""
+        with cls._lock:
+            cls._memory.clear()
+            cls._memory_bytes = 0
+        if os.path.isdir(Config.CHART_CACHE_DIR):
+            for entry in os.scandir(Config.CHART_CACHE_DIR):
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+
+    @classmethod
+    def _submit(cls, key: str, name: str, params: Dict, version: str, path: str) -> Future:
+        """Start a render, or join the one already running for the same key."""
+        with cls._lock:
+            future = cls._inflight.get(key)
+            if future is not None:
+                return future
+            if cls._executor is None:
+                cls._executor = ProcessPoolExecutor(max_workers=Config.CHART_RENDER_WORKERS)
+            os.makedirs(Config.CHART_CACHE_DIR, exist_ok=True)
+            future = cls._executor.submit(_render_in_worker, name, params, version, path)
+            cls._inflight[key] = future
+
+        def _done(_future, key=key):
+            with cls._lock:
+                cls._inflight.pop(key, None)
+            if not _future.cancelled() and _future.exception() is not None:
+                logger.error(f"Rendering chart {name} failed: {_future.exception()}")
+
+        future.add_done_callback(_done)
+        return future
+
+    @staticmethod
+    def _disk_path(key: str, fmt: str) -> str:
+        return os.path.join(Config.CHART_CACHE_DIR, f"{key}.{fmt}")
+
+    @staticmethod
+    def _read_disk(path: str) -> Optional[bytes]:
+        try:
+            with open(path, "rb") as file:
+                body = file.read()
+        except OSError:
+            return None
+        try:
+            os.utime(path)  # LRU: a hit makes the file recent again
+        except OSError:
+            pass
+        return body
+
+    @classmethod
+    def _remember(cls, key: str, body: bytes) -> None:
+        with cls._lock:
+            if key in cls._memory:
+                return
+            cls._memory[key] = body
+            cls._memory_bytes += len(body)
+            while cls._memory_bytes > Config.CHART_CACHE_MAX_BYTES and len(cls._memory) > 1:
+                _, evicted = cls._memory.popitem(last=False)
+                cls._memory_bytes -= len(evicted)
+
+    @staticmethod
+    def _trim_disk() -> None:
+        try:
+            entries = [e for e in os.scandir(Config.CHART_CACHE_DIR) if ".tmp." not in e.name]
+        except OSError:
+            return
+        excess = len(entries) - Config.CHART_CACHE_MAX_FILES
+        if excess <= 0:
+            return
+        for entry in sorted(entries, key=lambda e: e.stat().st_mtime)[:excess]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+
+CacheRegistry.register("charts", ChartRenderer.clear)
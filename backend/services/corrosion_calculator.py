@@ -1,12 +1,16 @@
+import hashlib
 import json
 import os
+import threading
 from typing import Dict, Optional
 
 import numpy as np
 
 try:
+    from services.calculation_cache import CalculationCache, quantize
     from services.model_trainer import CorrosionModelTrainer
 except ModuleNotFoundError:
+    from backend.services.calculation_cache import CalculationCache, quantize
     from backend.services.model_trainer import CorrosionModelTrainer
 
 class CorrosionRateCalculator:
@@ -17,6 +21,12 @@ class CorrosionRateCalculator:
     
     MODEL_PATH = CorrosionModelTrainer.default_model_path()
 
+    # Parsed model JSON, reused until the file's modification time changes.
+    _model_cache: Optional[Dict] = None
+    _model_mtime: Optional[int] = None
+    _model_version: Optional[str] = None
+    _model_lock = threading.Lock()
+
     @classmethod
     def calculate_corrosion_rate(
         cls,
@@ -38,9 +48,35 @@ class CorrosionRateCalculator:
         
         Returns:
             Dictionary with calculated corrosion rates in mm/yr and mpy
+
+        Inputs are rounded to their storage precision (2 decimals), so the
+        result does not depend on whether the result cache is enabled.
         """
         learned_model = cls._load_or_train_model()
+        temperature, ph, nacl_percentage = quantize(temperature), quantize(ph), quantize(nacl_percentage)
+        if not CalculationCache.enabled():
+            return cls._calculate(learned_model, material, temperature, ph, nacl_percentage, medium)
+
+        key = (
+            cls._model_version if learned_model else None,
+            material, medium, temperature, ph, nacl_percentage,
+        )
+        result = CalculationCache.get(key)
+        if result is None:
+            result = cls._calculate(learned_model, material, temperature, ph, nacl_percentage, medium)
+            CalculationCache.put(key, result)
+        return dict(result)
 
+    @classmethod
+    def _calculate(
+        cls,
+        learned_model: Optional[Dict],
+        material: str,
+        temperature: float,
+        ph: float,
+        nacl_percentage: Optional[float],
+        medium: Optional[str],
+    ) -> Dict[str, float]:
         if learned_model and nacl_percentage is not None and nacl_percentage > 0:
             corrosion_rate_mm_per_yr = cls._predict_with_learned_model(
                 temperature=temperature,
@@ -74,17 +110,52 @@ class CorrosionRateCalculator:
 
     @classmethod
     def _load_or_train_model(cls) -> Optional[Dict]:
-        if os.path.exists(cls.MODEL_PATH):
+        model_data = cls._load_cached_model()
+        if model_data is not None:
+            return model_data
+
+        # Normally done once by the start-up warm-up rather than on a request.
+        try:
+            CorrosionModelTrainer.train_from_csv(model_output_path=cls.MODEL_PATH)
+        except Exception:
+            return None
+        return cls._load_cached_model()
+
+    @classmethod
+    def _load_cached_model(cls) -> Optional[Dict]:
+        try:
+            mtime = os.stat(cls.MODEL_PATH).st_mtime_ns
+        except OSError:
+            return None
+
+        if cls._model_cache is not None and cls._model_mtime == mtime:
+            return cls._model_cache
+
+        with cls._model_lock:
+            if cls._model_cache is not None and cls._model_mtime == mtime:
+                return cls._model_cache
             try:
                 with open(cls.MODEL_PATH, "r", encoding="utf-8") as file:
-                    return json.load(file)
+                    model_data = json.load(file)
             except Exception:
-                pass
+                return None
+            version = hashlib.sha1(
+                json.dumps(model_data.get("parameters", {}), sort_keys=True).encode("utf-8")
+            ).hexdigest()[:12]
+            if cls._model_version is not None and version != cls._model_version:
+                # Results of the previous model are never looked up again
+                CalculationCache.clear()
+            cls._model_version = version
+            cls._model_cache = model_data
+            cls._model_mtime = mtime
+            return model_data
 
-        try:
-            return CorrosionModelTrainer.train_from_csv()
-        except Exception:
+    @classmethod
+    def model_version(cls) -> Optional[str]:
+        """Short hash of the active model parameters, or None when no model is loaded."""
+        if cls._load_cached_model() is None:
             return None
+        return cls._model_version
 
     @staticmethod
     def _predict_with_learned_model(
@@ -102,29 +173,52 @@ class CorrosionRateCalculator:
         )
         return float(np.asarray(predicted).reshape(-1)[0])
 
-    @staticmethod
+    @classmethod
     def _calculate_legacy_empirical_rate(
+        cls,
         material: str,
         temperature: float,
         ph: float,
         nacl_percentage: Optional[float] = None,
         medium: Optional[str] = None
     ) -> Dict[str, float]:
+        corrosion_rate_mm_per_yr = float(
+            cls.legacy_rate(temperature, ph, nacl_percentage, material, medium)
+        )
+        corrosion_rate_mpy = corrosion_rate_mm_per_yr * 39.37
+
+        return {
+            'corrosion_rate_mm_per_yr': round(corrosion_rate_mm_per_yr, 4),
+            'corrosion_rate_mpy': round(corrosion_rate_mpy, 2),
+        }
+
+    @staticmethod
+    def legacy_rate(
+        temperature,
+        ph,
+        nacl_percentage=None,
+        material: str = '',
+        medium: Optional[str] = None,
+    ) -> np.ndarray:
+        """Legacy empirical multi-factor rate (mm/yr), vectorized over temperature, pH and NaCl."""
+        temperature = np.asarray(temperature, dtype=float)
+        ph = np.asarray(ph, dtype=float)
+
         base_rate = 0.1
         temp_factor = np.exp((temperature - 25) / 30)
 
-        if ph < 7:
-            ph_factor = 1 + (7 - ph) * 0.3
-        elif ph > 8:
-            ph_factor = 1 + (ph - 8) * 0.15
-        else:
-            ph_factor = 1.0
+        ph_factor = np.where(
+            ph < 7,
+            1 + (7 - ph) * 0.3,
+            np.where(ph > 8, 1 + (ph - 8) * 0.15, 1.0),
+        )
 
         if nacl_percentage is not None:
-            nacl_factor = 1 + (nacl_percentage / 3.5) * 0.5
+            nacl_factor = 1 + (np.asarray(nacl_percentage, dtype=float) / 3.5) * 0.5
         else:
             nacl_factor = 1.0
 
+        material = material or ''
         if 'X65' in material.upper() or 'API' in material.upper():
             material_factor = 0.8
         elif 'carbon' in material.lower():
@@ -144,7 +238,7 @@ class CorrosionRateCalculator:
             elif 'fresh' in medium_lower or 'water' in medium_lower:
                 medium_factor = 0.7
 
-        corrosion_rate_mm_per_yr = (
+        return (
             base_rate *
             temp_factor *
             ph_factor *
@@ -152,12 +246,6 @@ class CorrosionRateCalculator:
             material_factor *
             medium_factor
         )
-        corrosion_rate_mpy = corrosion_rate_mm_per_yr * 39.37
-
-        return {
-            'corrosion_rate_mm_per_yr': round(corrosion_rate_mm_per_yr, 4),
-            'corrosion_rate_mpy': round(corrosion_rate_mpy, 2),
-        }
     
     @staticmethod
     def calculate_using_linear_model(
@@ -1,12 +1,42 @@
-import pandas as pd
-import numpy as np
-from typing import List, Dict, Optional
+from typing import TYPE_CHECKING, List, Dict, Optional
 import logging
+import re
+
+try:
+    from services.table_reader import column_names, file_format, read_table
+except ModuleNotFoundError:
+    from backend.services.table_reader import column_names, file_format, read_table
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 logger = logging.getLogger(__name__)
 
 class CSVProcessor:
     """Process CSV files and extract corrosion data"""
+
+    # Accepted source column names per standardized field, in order of preference
+    COLUMN_ALIASES: Dict[str, List[str]] = {
+        'material': ['Material', 'material', 'MATERIAL'],
+        'temperature': ['Temp (°C)', 'Temperature (°C)', 'temperature', 'Temperature', 'Temp'],
+        'ph': ['pH', 'ph', 'PH'],
+        'nacl_percentage': ['NaCl (%)', 'NaCl (wt%)', 'NaCl', 'nacl_percentage'],
+        'medium': ['Environment', 'environment', 'Medium', 'medium'],
+        'corrosion_rate_mm_per_yr': ['Corrosion_mm_per_yr', 'Estimated Corrosion Rate (mm/yr)',
+                                     'Corrosion Rate (mm/yr)', 'corrosion_rate_mm_per_yr'],
+        'corrosion_rate_mpy': ['Corrosion_mpy', 'Estimated Corrosion Rate (mpy)',
+                               'Corrosion Rate (mpy)', 'corrosion_rate_mpy'],
+        'sample_id': ['Sample ID', 'sample_id', '#', 'ID'],
+        'source': ['Source', 'source'],
+        'method': ['Method', 'method'],
+        'notes': ['Notes', 'notes'],
+    }
+
+    NUMERIC_FIELDS = ('temperature', 'ph', 'nacl_percentage', 'corrosion_rate_mm_per_yr', 'corrosion_rate_mpy')
+    # NaCl values that mean "not a number" in the lab sheets
+    NACL_PLACEHOLDERS = ('n/a', 'na', 'variable', 'sea', '')
+    # The upper end of a range like "25-30"; a leading minus is a sign, not a range
+    RANGE_UPPER = re.compile(r'(?<=.)-.*$')
     
     @staticmethod
     def process_corrosion_csv(file_path: str) -> List[Dict]:
@@ -19,6 +49,9 @@ class CSVProcessor:
         Returns:
             List of dictionaries with standardized corrosion data
         """
+        # pandas is imported on first use to keep application start-up light.
+        import pandas as pd
+
         try:
             df = pd.read_csv(file_path)
             logger.info(f"Loaded CSV with {len(df)} rows")
@@ -38,34 +71,151 @@ class CSVProcessor:
             raise
     
     @staticmethod
-    def _extract_row_data(row: pd.Series, columns: pd.Index) -> Optional[Dict]:
+    def process_corrosion_file(file_path: str) -> List[Dict]:
+        """
+        Like ``process_corrosion_csv`` for CSV, Parquet or Arrow IPC files.
+
+        Columnar files are read selectively (only columns with a known alias)
+        and standardized with ``extract_columns`` instead of row by row; both
+        paths parse values the same way, so a CSV and a Parquet copy of the
+        same sheet give the same records.
+        """
+        if file_format(file_path) == 'csv':
+            return CSVProcessor.process_corrosion_csv(file_path)
+
+        import pandas as pd
+
+        try:
+            present = CSVProcessor.source_columns(column_names(file_path))
+            df = read_table(file_path, columns=[col for cols in present.values() for col in cols])
+            logger.info(f"Loaded {file_format(file_path)} file with {len(df)} rows")
+
+            fields = CSVProcessor.extract_columns(df)
+            if 'material' not in fields or 'temperature' not in fields:
+                return []
+            fields = fields[fields['material'].notna() & fields['temperature'].notna()]
+            processed_data = [
+                {key: value for key, value in record.items() if pd.notna(value)}
+                for record in fields.to_dict('records')
+            ]
+            logger.info(f"Processed {len(processed_data)} valid records")
+            return processed_data
+
+        except Exception as e:
+            logger.error(f"Error processing {file_path}: {e}")
+            raise
+
+    @staticmethod
+    def source_columns(columns, fields=None) -> Dict[str, List[str]]:
+        """Alias columns present in ``columns`` for each field (fields with none are left out)."""
+        fields = fields or CSVProcessor.COLUMN_ALIASES.keys()
+        present = {}
+        for field in fields:
+            matches = [col for col in CSVProcessor.COLUMN_ALIASES[field] if col in columns]
+            if matches:
+                present[field] = matches
+        return present
+
+    @staticmethod
+    def extract_columns(df: 'pd.DataFrame', fields=None) -> 'pd.DataFrame':
+        """
+        Vectorized counterpart of ``_extract_row_data`` for whole frames.
+
+        Returns one standardized column per field found: the first non-null
+        alias value of each row, cleaned and parsed like the row version
+        (numeric fields are NaN where unparseable, text fields are stripped).
+        """
+        import pandas as pd
+
+        result = pd.DataFrame(index=df.index)
+        for field, columns in CSVProcessor.source_columns(df.columns, fields).items():
+            raw = df[columns[0]]
+            for col in columns[1:]:
+                raw = raw.where(raw.notna(), df[col])
+            if field in CSVProcessor.NUMERIC_FIELDS:
+                result[field] = CSVProcessor._parse_numeric(raw, field)
+            else:
+                result[field] = raw.where(raw.isna(), raw.astype(str).str.strip())
+        return result
+
+    @staticmethod
+    def _parse_numeric(raw: 'pd.Series', field: str) -> 'pd.Series':
+        import pandas as pd
+
+        if pd.api.types.is_numeric_dtype(raw):
+            return raw.astype(float)
+        parsed = CSVProcessor._cast_plain_numbers(raw)
+        if parsed is not None:
+            return parsed
+        # Plain numbers parse directly; the rest go through the cleanup below
+        parsed = pd.to_numeric(raw, errors='coerce')
+        rest = raw.notna() & parsed.isna()
+        if not rest.any():
+            return parsed
+        raw = raw[rest]
+        text = raw.astype(str).str.strip()
+        if field == 'temperature':
+            text = text.str.replace('°C', '', regex=False).str.strip()
+        elif field == 'ph':
+            text = text.str.replace('~', '', regex=False).str.strip()
+        elif field == 'nacl_percentage':
+            text = text.mask(text.str.lower().isin(CSVProcessor.NACL_PLACEHOLDERS))
+        if field in ('temperature', 'nacl_percentage'):
+            # Ranges like "25-30" keep their lower end
+            text = text.str.replace(CSVProcessor.RANGE_UPPER, '', regex=True).str.strip()
+        return parsed.fillna(pd.to_numeric(text, errors='coerce'))
+
+    @staticmethod
+    def _cast_plain_numbers(raw: 'pd.Series') -> Optional['pd.Series']:
+        """``raw`` as floats when every value is a plain number or null, else None (needs pyarrow)."""
+        import pandas as pd
+
+        try:
+            import pyarrow as pa
+            import pyarrow.compute as pc
+        except ImportError:
+            return None
+        try:
+            values = pc.cast(pa.array(raw, from_pandas=True), pa.float64())
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError):
+            return None
+        return pd.Series(values.to_numpy(zero_copy_only=False), index=raw.index, dtype=float)
+
+    @staticmethod
+    def _parse_range_start(text: str) -> float:
+        """A number, or the lower end of a range like "25-30" (raises ValueError otherwise)."""
+        try:
+            return float(text)
+        except ValueError:
+            return float(CSVProcessor.RANGE_UPPER.sub('', text).strip())
+
+    @staticmethod
+    def _extract_row_data(row: 'pd.Series', columns: 'pd.Index') -> Optional[Dict]:
         """Extract and standardize data from a CSV row"""
+        import pandas as pd
         
         data = {}
         
         # Material
-        material_cols = ['Material', 'material', 'MATERIAL']
+        material_cols = CSVProcessor.COLUMN_ALIASES['material']
         for col in material_cols:
             if col in columns and pd.notna(row.get(col)):
                 data['material'] = str(row[col]).strip()
                 break
         
         # Temperature
-        temp_cols = ['Temp (°C)', 'Temperature (°C)', 'temperature', 'Temperature', 'Temp']
+        temp_cols = CSVProcessor.COLUMN_ALIASES['temperature']
         for col in temp_cols:
             if col in columns and pd.notna(row.get(col)):
                 try:
                     temp_str = str(row[col]).replace('°C', '').strip()
-                    # Handle ranges like "25-30"
-                    if '-' in temp_str:
-                        temp_str = temp_str.split('-')[0]
-                    data['temperature'] = float(temp_str)
+                    data['temperature'] = CSVProcessor._parse_range_start(temp_str)
                 except:
                     pass
                 break
         
         # pH
-        ph_cols = ['pH', 'ph', 'PH']
+        ph_cols = CSVProcessor.COLUMN_ALIASES['ph']
         for col in ph_cols:
             if col in columns and pd.notna(row.get(col)):
                 try:
@@ -77,30 +227,26 @@ class CSVProcessor:
                 break
         
         # NaCl percentage
-        nacl_cols = ['NaCl (%)', 'NaCl (wt%)', 'NaCl', 'nacl_percentage']
+        nacl_cols = CSVProcessor.COLUMN_ALIASES['nacl_percentage']
         for col in nacl_cols:
             if col in columns and pd.notna(row.get(col)):
                 try:
                     nacl_val = str(row[col]).strip()
                     if nacl_val and nacl_val.lower() not in ['n/a', 'na', 'variable', 'sea', '']:
-                        # Handle ranges
-                        if '-' in nacl_val:
-                            nacl_val = nacl_val.split('-')[0]
-                        data['nacl_percentage'] = float(nacl_val)
+                        data['nacl_percentage'] = CSVProcessor._parse_range_start(nacl_val)
                 except:
                     pass
                 break
         
         # Medium/Environment
-        medium_cols = ['Environment', 'environment', 'Medium', 'medium']
+        medium_cols = CSVProcessor.COLUMN_ALIASES['medium']
         for col in medium_cols:
             if col in columns and pd.notna(row.get(col)):
                 data['medium'] = str(row[col]).strip()
                 break
         
         # Corrosion rate (mm/yr)
-        cr_mm_cols = ['Corrosion_mm_per_yr', 'Estimated Corrosion Rate (mm/yr)', 
-                      'Corrosion Rate (mm/yr)', 'corrosion_rate_mm_per_yr']
+        cr_mm_cols = CSVProcessor.COLUMN_ALIASES['corrosion_rate_mm_per_yr']
         for col in cr_mm_cols:
             if col in columns and pd.notna(row.get(col)):
                 try:
@@ -110,8 +256,7 @@ class CSVProcessor:
                 break
         
         # Corrosion rate (mpy)
-        cr_mpy_cols = ['Corrosion_mpy', 'Estimated Corrosion Rate (mpy)', 
-                       'Corrosion Rate (mpy)', 'corrosion_rate_mpy']
+        cr_mpy_cols = CSVProcessor.COLUMN_ALIASES['corrosion_rate_mpy']
         for col in cr_mpy_cols:
             if col in columns and pd.notna(row.get(col)):
                 try:
@@ -121,28 +266,28 @@ class CSVProcessor:
                 break
         
         # Sample ID
-        id_cols = ['Sample ID', 'sample_id', '#', 'ID']
+        id_cols = CSVProcessor.COLUMN_ALIASES['sample_id']
         for col in id_cols:
             if col in columns and pd.notna(row.get(col)):
                 data['sample_id'] = str(row[col]).strip()
                 break
         
         # Source
-        source_cols = ['Source', 'source']
+        source_cols = CSVProcessor.COLUMN_ALIASES['source']
         for col in source_cols:
             if col in columns and pd.notna(row.get(col)):
                 data['source'] = str(row[col]).strip()
                 break
         
         # Method
-        method_cols = ['Method', 'method']
+        method_cols = CSVProcessor.COLUMN_ALIASES['method']
         for col in method_cols:
             if col in columns and pd.notna(row.get(col)):
                 data['method'] = str(row[col]).strip()
                 break
         
         # Notes
-        notes_cols = ['Notes', 'notes']
+        notes_cols = CSVProcessor.COLUMN_ALIASES['notes']
         for col in notes_cols:
             if col in columns and pd.notna(row.get(col)):
                 data['notes'] = str(row[col]).strip()
@@ -0,0 +1,258 @@
+"""
+Operating limits for a target corrosion rate.
+
+Answers "what is the highest temperature / lowest pH / highest NaCl that
+keeps the rate at or below X mm/yr?" for whole batches of targets at once.
+
+With the trained Arrhenius power-law model and point conditions the limit
+has a closed form, from ln(CR) = ln(A) + b*ln(Cl) - K/Tk + c*pH:
+
+    Tk  = K / (ln(A) + b*ln(Cl) + c*pH - ln(CR))
+    pH  = (ln(CR) - ln(A) - b*ln(Cl) + K/Tk) / c
+    Cl  = exp((ln(CR) - ln(A) + K/Tk - c*pH) / b)
+
+Everything else is solved by vectorized bisection on a monotone function:
+the legacy empirical model, and conditions given as bands ({"min", "max"}),
+where the limit must hold at the worst case within the band.
+"""
+
+from itertools import product
+from typing import Dict, Mapping, Optional
+
+import numpy as np
+
+try:
+    from services.corrosion_calculator import CorrosionRateCalculator
+    from services.model_trainer import CorrosionModelTrainer
+except ModuleNotFoundError:
+    from backend.services.corrosion_calculator import CorrosionRateCalculator
+    from backend.services.model_trainer import CorrosionModelTrainer
+
+VARIABLES = ('temperature', 'ph', 'nacl_percentage')
+
+# Search range per variable (temperature in °C, NaCl in wt%)
+VARIABLE_RANGES = {
+    'temperature': (0.0, 200.0),
+    'ph': (0.0, 14.0),
+    'nacl_percentage': (0.0, 26.0),
+}
+
+# The legacy pH factor rises on both sides of 7-8; the minimum pH lives on the acidic branch.
+LEGACY_PH_RANGE = (0.0, 7.0)
+
+MAX_BATCH = 10_000
+BISECTION_STEPS = 60
+
+# Model parameter whose sign says whether the rate rises with each variable
+SLOPE_PARAMETERS = {'temperature': 'K', 'ph': 'c', 'nacl_percentage': 'b'}
+
+
+class InverseSolver:
+    """Batched inverse of the corrosion-rate models."""
+
+    @staticmethod
+    def parse_condition(value, size: int, name: str):
+        """
+        ``(low, high)`` arrays for a fixed condition: a number, a ``{"min", "max"}``
+        band, or a list of either with one entry per target. Raises ValueError.
+        """
+        def bounds(item):
+            if isinstance(item, Mapping):
+                low, high = float(item['min']), float(item['max'])
+                if low > high:
+                    raise ValueError(f"{name}: min must not exceed max")
+                return low, high
+            return float(item), float(item)
+
+        if isinstance(value, (list, tuple)):
+            if len(value) != size:
+                raise ValueError(f"{name} must have one entry per target rate")
+            pairs = [bounds(item) for item in value]
+            return np.array([p[0] for p in pairs]), np.array([p[1] for p in pairs])
+        low, high = bounds(value)
+        return np.full(size, low), np.full(size, high)
+
+    @classmethod
+    def solve(
+        cls,
+        solve_for: str,
+        target_rates,
+        conditions: Dict,
+        material: str = '',
+        medium: Optional[str] = None,
+        search_range: Optional[tuple] = None,
+        model_data: Optional[Dict] = None,
+    ) -> Dict:
+        """
+        Limit of ``solve_for`` at which the rate reaches each target.
+
+        ``conditions`` holds the other two variables (NaCl may be omitted, in
+        which case the legacy model is used, as in the calculator).
+        Returns ``limit`` and ``status`` arrays plus how they were obtained:
+        status is ``ok``, ``no_limit`` (the target is never reached in the
+        search range; limit is the range end) or ``infeasible`` (the target is
+        exceeded everywhere; limit is NaN). ``bound`` says whether the limit
+        is a maximum or a minimum. Raises ValueError for invalid input.
+        """
+        if solve_for not in VARIABLES:
+            raise ValueError(f"solve_for must be one of {', '.join(VARIABLES)}")
+        targets = np.atleast_1d(np.asarray(target_rates, dtype=float))
+        if targets.size == 0 or targets.size > MAX_BATCH:
+            raise ValueError(f"target_rates must hold between 1 and {MAX_BATCH} values")
+        if not np.all(targets > 0):
+            raise ValueError("target rates must be positive")
+
+        fixed = {}
+        for name in VARIABLES:
+            if name == solve_for:
+                continue
+            value = conditions.get(name)
+            if value is None:
+                if name == 'nacl_percentage':
+                    continue
+                raise ValueError(f"{name} is required")
+            fixed[name] = cls.parse_condition(value, targets.size, name)
+
+        if model_data is None:
+            model_data = CorrosionRateCalculator._load_or_train_model()
+        use_learned = model_data is not None and (
+            solve_for == 'nacl_percentage'
+            or ('nacl_percentage' in fixed and np.all(fixed['nacl_percentage'][0] > 0))
+        )
+
+        if search_range is None:
+            search_range = LEGACY_PH_RANGE if solve_for == 'ph' and not use_learned else VARIABLE_RANGES[solve_for]
+        lower, upper = float(search_range[0]), float(search_range[1])
+        if not lower < upper:
+            raise ValueError("search range must have min below max")
+
+        if use_learned:
+            parameters = model_data['parameters']
+
+            def rate(values, point):
+                chloride = point.get('nacl_percentage', values)
+                temperature = point.get('temperature', values)
+                ph = point.get('ph', values)
+                return CorrosionModelTrainer.predict(chloride, np.asarray(temperature) + 273.15, ph, parameters)
+        else:
+            def rate(values, point):
+                return CorrosionRateCalculator.legacy_rate(
+                    point.get('temperature', values),
+                    point.get('ph', values),
+                    point.get('nacl_percentage', values if solve_for == 'nacl_percentage' else None),
+                    material,
+                    medium,
+                )
+
+        banded = any(np.any(low != high) for low, high in fixed.values())
+        if use_learned and not banded:
+            point = {name: low for name, (low, high) in fixed.items()}
+            limit, status, bound = cls._closed_form(solve_for, targets, point, parameters, lower, upper)
+            method = 'closed_form'
+        else:
+            # Worst case over the band corners; both models are monotone in each variable
+            # (the legacy pH factor is V-shaped, so a band's maximum is still at an end).
+            names = list(fixed)
+            corners = [
+                {name: fixed[name][end] for name, end in zip(names, ends)}
+                for ends in product((0, 1), repeat=len(names))
+            ]
+
+            def envelope(values):
+                return np.max([rate(values, corner) for corner in corners], axis=0)
+
+            limit, status, bound = cls._bisect(envelope, targets, lower, upper)
+            method = 'bisection'
+
+        return {
+            'solve_for': solve_for,
+            'bound': bound,
+            'limit': limit,
+            'status': status,
+            'method': method,
+            'model': 'arrhenius_power_law' if use_learned else 'legacy_empirical',
+            'search_range': (lower, upper),
+        }
+
+    @staticmethod
+    def _classify(solution: np.ndarray, increasing: bool, lower: float, upper: float):
+        """Turn raw solutions (±inf allowed) into limits and statuses within the range."""
+        status = np.full(solution.shape, 'ok', dtype=object)
+        limit = solution.astype(float).copy()
+        if increasing:
+            no_limit, infeasible = solution >= upper, solution < lower
+            limit[no_limit] = upper
+        else:
+            no_limit, infeasible = solution <= lower, solution > upper
+            limit[no_limit] = lower
+        status[no_limit] = 'no_limit'
+        status[infeasible] = 'infeasible'
+        limit[infeasible] = np.nan
+        return limit, status
+
+    @classmethod
+    def _closed_form(cls, solve_for, targets, point, parameters, lower, upper):
+        log_target = np.log(targets)
+        log_a = np.log(parameters['A'])
+        b, k, c = parameters['b'], parameters['K'], parameters['c']
+        slope = parameters[SLOPE_PARAMETERS[solve_for]]
+        if slope == 0:
+            # The variable has no effect: either always within the target or never
+            rate = CorrosionModelTrainer.predict(
+                point.get('nacl_percentage', 1.0), point.get('temperature', 25.0) + 273.15,
+                point.get('ph', 7.0), parameters,
+            )
+            solution = np.where(rate <= targets, np.inf, -np.inf)
+            limit, status = cls._classify(solution, True, lower, upper)
+            return limit, status, 'max'
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if solve_for == 'temperature':
+                denominator = (
+                    log_a + b * np.log(point['nacl_percentage']) + c * point['ph'] - log_target
+                )
+                # A denominator of the wrong sign means the target is beyond the
+                # model's asymptote: never reached (K > 0) or always exceeded (K < 0).
+                valid = denominator * k > 0
+                solution = np.where(valid, k / denominator - 273.15, np.inf)
+            elif solve_for == 'ph':
+                temperature_k = point['temperature'] + 273.15
+                solution = (
+                    log_target - log_a - b * np.log(point['nacl_percentage']) + k / temperature_k
+                ) / c
+            else:
+                temperature_k = point['temperature'] + 273.15
+                solution = np.exp((log_target - log_a + k / temperature_k - c * point['ph']) / b)
+
+        increasing = slope > 0
+        limit, status = cls._classify(solution, increasing, lower, upper)
+        # The model output is floored at 1e-6 mm/yr
+        status[targets < 1e-6] = 'infeasible'
+        limit[targets < 1e-6] = np.nan
+        return limit, status, 'max' if increasing else 'min'
+
+    @classmethod
+    def _bisect(cls, function, targets, lower, upper):
+        """Vectorized bisection of ``function(values) = targets`` on a monotone function."""
+        size = targets.size
+        at_lower = function(np.full(size, lower))
+        at_upper = function(np.full(size, upper))
+        increasing = bool(np.mean(at_upper >= at_lower) >= 0.5)
+
+        safe = np.full(size, lower if increasing else upper)
+        unsafe = np.full(size, upper if increasing else lower)
+        for _ in range(BISECTION_STEPS):
+            middle = (safe + unsafe) / 2
+            within = function(middle) <= targets
+            safe = np.where(within, middle, safe)
+            unsafe = np.where(within, unsafe, middle)
+
+        solution = safe.copy()
+        if increasing:
+            solution[at_upper <= targets] = np.inf
+            solution[at_lower > targets] = -np.inf
+        else:
+            solution[at_lower <= targets] = -np.inf
+            solution[at_upper > targets] = np.inf
+        limit, status = cls._classify(solution, increasing, lower, upper)
+        return limit, status, 'max' if increasing else 'min'
@@ -0,0 +1,216 @@
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+ROW_BUCKETS = (0, 1, 10, 100, 1_000, 10_000, 100_000, 1_000_000)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def value(self, *label_values) -> float:
+        with self._lock:
+            return self._values.get(label_values, 0.0)
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for label_values, value in items:
+            lines.append(
+                f"{self.name}{_format_labels(self.label_names, label_values)} {_format_value(value)}"
+            )
+        return lines
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Gauge(Counter):
+    def set(self, *label_values, value: float) -> None:
+        with self._lock:
+            self._values[label_values] = value
+
+    def collect(self) -> List[str]:
+        lines = super().collect()
+        lines[1] = f"# TYPE {self.name} gauge"
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Iterable[float] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._series: Dict[Tuple, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = [0] * (len(self.buckets) + 1) + [0.0]
+                self._series[label_values] = series
+            series[index] += 1
+            series[-1] += value
+
+    @contextmanager
+    def time(self, *label_values):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *label_values)
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            items = [(labels, list(series)) for labels, series in self._series.items()]
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for label_values, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), series[:-1]):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket"
+                    f"{_format_labels(self.label_names, label_values, le)} {cumulative}"
+                )
+            labels = _format_labels(self.label_names, label_values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+class Metrics:
+    """Process-wide metrics, exposed in the Prometheus text format at ``/metrics``."""
+
+    http_request_duration = Histogram(
+        "corrosion_http_request_duration_seconds",
+        "HTTP request latency by route, method and status.",
+        ("route", "method", "status"),
+    )
+    db_query_duration = Histogram(
+        "corrosion_db_query_duration_seconds",
+        "Database query latency by statement type.",
+        ("statement",),
+    )
+    db_query_rows = Histogram(
+        "corrosion_db_query_rows",
+        "Rows returned or affected per database query by statement type.",
+        ("statement",),
+        buckets=ROW_BUCKETS,
+    )
+    model_predict_duration = Histogram(
+        "corrosion_model_predict_duration_seconds",
+        "Duration of CorrosionModelTrainer.predict calls.",
+    )
+    model_train_duration = Histogram(
+        "corrosion_model_train_duration_seconds",
+        "Duration of CorrosionModelTrainer.train_from_csv calls.",
+    )
+    upload_rows = Counter(
+        "corrosion_upload_rows_total",
+        "Rows saved from uploaded files.",
+    )
+    upload_rows_per_second = Gauge(
+        "corrosion_upload_rows_per_second",
+        "Rows saved per second by the most recent upload.",
+    )
+    cache_requests = Counter(
+        "corrosion_cache_requests_total",
+        "Cache lookups by cache name and result (hit or miss).",
+        ("cache", "result"),
+    )
+    cache_hit_ratio = Gauge(
+        "corrosion_cache_hit_ratio",
+        "Share of cache lookups that were hits since process start.",
+        ("cache",),
+    )
+
+    @classmethod
+    def record_cache_lookup(cls, cache_name: str, hit: bool) -> None:
+        cls.cache_requests.inc(cache_name, "hit" if hit else "miss")
+
+    @staticmethod
+    def statement_type(query: str) -> str:
+        parts = query.split(None, 1)
+        return parts[0].upper() if parts else "UNKNOWN"
+
+    @classmethod
+    def all_metrics(cls):
+        return [
+            cls.http_request_duration,
+            cls.db_query_duration,
+            cls.db_query_rows,
+            cls.model_predict_duration,
+            cls.model_train_duration,
+            cls.upload_rows,
+            cls.upload_rows_per_second,
+            cls.cache_requests,
+            cls.cache_hit_ratio,
+        ]
+
+    @classmethod
+    def render(cls) -> str:
+        cls._update_cache_hit_ratios()
+        lines = []
+        for metric in cls.all_metrics():
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+    @classmethod
+    def _update_cache_hit_ratios(cls) -> None:
+        with cls.cache_requests._lock:
+            counts = dict(cls.cache_requests._values)
+        caches = {cache for cache, _ in counts}
+        for cache in caches:
+            hits = counts.get((cache, "hit"), 0.0)
+            misses = counts.get((cache, "miss"), 0.0)
+            total = hits + misses
+            cls.cache_hit_ratio.set(cache, value=hits / total if total else 0.0)
@@ -1,10 +1,27 @@
 import json
 import math
 import os
-from typing import Dict, Tuple
+import time
+from typing import TYPE_CHECKING, Dict, Tuple
 
 import numpy as np
-import pandas as pd
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+try:
+    from services.csv_processor import CSVProcessor
+    from services.metrics import Metrics
+    from services.prediction_kernel import PredictionKernel
+    from services.table_reader import column_names, read_table
+except ModuleNotFoundError:
+    from backend.services.csv_processor import CSVProcessor
+    from backend.services.metrics import Metrics
+    from backend.services.prediction_kernel import PredictionKernel
+    from backend.services.table_reader import column_names, read_table
+
+# Inputs at least this large are scored by the chunked, multi-threaded kernel
+KERNEL_MIN_ROWS = 65_536
 
 
 class CorrosionModelTrainer:
@@ -16,6 +33,13 @@ class CorrosionModelTrainer:
         "ph": "pH",
         "corrosion_rate": "Estimated Corrosion Rate (mm/yr)",
     }
+    # CSVProcessor field whose aliases are accepted when a dataset column is absent
+    DATASET_FIELDS = {
+        "chloride": "nacl_percentage",
+        "temperature_c": "temperature",
+        "ph": "ph",
+        "corrosion_rate": "corrosion_rate_mm_per_yr",
+    }
 
     @staticmethod
     def _project_root() -> str:
@@ -29,7 +53,8 @@ class CorrosionModelTrainer:
 
     @classmethod
     def default_model_path(cls) -> str:
-        return os.path.join(
+        # CORROSION_MODEL_PATH lets benchmarks and scratch runs keep their models apart.
+        return os.getenv("CORROSION_MODEL_PATH") or os.path.join(
             cls._project_root(), "backend", "model_data", "arrhenius_power_law_model.json"
         )
 
@@ -41,7 +66,8 @@ class CorrosionModelTrainer:
         test_ratio: float = 0.4,
         random_seed: int = 42,
     ) -> Dict:
-        """Train the model from CSV and save learned parameters."""
+        """Train the model from a CSV, Parquet or Arrow file and save learned parameters."""
+        started = time.perf_counter()
         csv_path = csv_path or cls.default_dataset_path()
         model_output_path = model_output_path or cls.default_model_path()
 
@@ -56,16 +82,36 @@ class CorrosionModelTrainer:
         with open(model_output_path, "w", encoding="utf-8") as file:
             json.dump(model_data, file, indent=2)
 
+        Metrics.model_train_duration.observe(time.perf_counter() - started)
         return model_data
 
     @classmethod
-    def _load_training_dataframe(cls, csv_path: str) -> pd.DataFrame:
-        df = pd.read_csv(csv_path)
+    def _load_training_dataframe(cls, csv_path: str) -> "pd.DataFrame":
+        # pandas is only needed for training, so it is not imported with the module.
+        import pandas as pd
+
+        available = column_names(csv_path)
+        sources = {}
+        for key, column in cls.DATASET_COLUMNS.items():
+            if column in available:
+                sources[key] = column
+                continue
+            aliases = CSVProcessor.source_columns(available, [cls.DATASET_FIELDS[key]])
+            if aliases:
+                sources[key] = aliases[cls.DATASET_FIELDS[key]][0]
         required_columns = list(cls.DATASET_COLUMNS.values())
-        missing_columns = [col for col in required_columns if col not in df.columns]
+        missing_columns = [column for key, column in cls.DATASET_COLUMNS.items() if key not in sources]
         if missing_columns:
             raise ValueError(f"Missing required columns in training CSV: {missing_columns}")
 
+        # Only the model's columns are read; Parquet/Arrow skip non-positive rows while reading.
+        df = read_table(
+            csv_path,
+            columns=list(dict.fromkeys(sources.values())),
+            filters=[(sources["chloride"], ">", 0), (sources["corrosion_rate"], ">", 0)],
+        )
+        df = df.rename(columns={source: cls.DATASET_COLUMNS[key] for key, source in sources.items()})
+
         cleaned = df[required_columns].copy()
         cleaned = cleaned.apply(pd.to_numeric, errors="coerce")
         cleaned = cleaned.dropna()
@@ -84,7 +130,7 @@ class CorrosionModelTrainer:
     @classmethod
     def _fit_model(
         cls,
-        df: pd.DataFrame,
+        df: "pd.DataFrame",
         test_ratio: float,
         random_seed: int,
     ) -> Dict:
@@ -438,17 +484,25 @@ class CorrosionModelTrainer:
         ph: np.ndarray | float,
         parameters: Dict[str, float],
     ) -> np.ndarray:
+        started = time.perf_counter()
         chloride_array = np.asarray(chloride, dtype=float)
         temperature_array = np.asarray(temperature_k, dtype=float)
         ph_array = np.asarray(ph, dtype=float)
 
+        if max(chloride_array.size, temperature_array.size, ph_array.size) >= KERNEL_MIN_ROWS:
+            predictions = PredictionKernel(parameters).predict(chloride_array, temperature_array, ph_array)
+            Metrics.model_predict_duration.observe(time.perf_counter() - started)
+            return predictions
+
         predictions = (
             parameters["A"]
             * np.power(chloride_array, parameters["b"])
             * np.exp(-parameters["K"] / temperature_array)
             * np.exp(parameters["c"] * ph_array)
         )
-        return np.maximum(predictions, 1e-6)
+        predictions = np.maximum(predictions, 1e-6)
+        Metrics.model_predict_duration.observe(time.perf_counter() - started)
+        return predictions
 
     @staticmethod
     def _build_metrics(actual: np.ndarray, predicted: np.ndarray) -> Dict[str, float]:
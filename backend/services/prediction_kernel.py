@@ -0,0 +1,145 @@
+"""
+Chunked, multi-threaded scoring kernel for the Arrhenius power-law model.
+
+Works in log space with ln(A) precomputed:
+
+    ln(CR) = ln(A) + b*ln(Cl) - K/Tk + c*pH,   CR = exp(max(ln(CR), ln(1e-6)))
+
+Each chunk is computed in place in the output slice with one scratch buffer
+per thread, so apart from the output only ``CHUNK_ROWS``-sized temporaries
+(which stay in cache) are allocated. Rows are split into one contiguous
+block per worker; numpy releases the GIL inside the ufuncs, so the threads
+run on separate cores. The threads come from one pool per process, and the
+default is a single worker: under gunicorn every web worker would otherwise
+start one thread per CPU. Batch tools opt in with ``workers`` or
+``PREDICT_WORKERS``.
+
+``dtype=np.float32`` halves the memory traffic of the output. The log-space
+sum is then rounded to float32, so the relative error of a rate is about
+2**-24 * (|ln A| + |b ln Cl| + |K/Tk| + |c pH|) plus the rounding of exp:
+under 5e-6 for the shipped model over normal operating conditions (the
+benchmark reports the measured maximum).
+"""
+
+import math
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+import numpy as np
+
+try:
+    from config import Config
+except ModuleNotFoundError:
+    from backend.config import Config
+
+# Rows per chunk: inputs, output and scratch of one chunk fit in a 1 MiB L2 cache
+CHUNK_ROWS = 16_384
+# Below this many rows per worker, threads cost more than they save
+MIN_ROWS_PER_WORKER = 4 * CHUNK_ROWS
+
+RATE_FLOOR = 1e-6
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_size = 0
+_executor_lock = threading.Lock()
+
+
+def default_workers() -> int:
+    return Config.PREDICT_WORKERS or os.cpu_count() or 1
+
+
+def _shared_executor(workers: int) -> ThreadPoolExecutor:
+    """The process-wide pool, grown (never shrunk) to the largest ``workers`` requested."""
+    global _executor, _executor_size
+    with _executor_lock:
+        if _executor is None or _executor_size < workers:
+            if _executor is not None:
+                # Blocks already submitted still finish on the old pool's threads
+                _executor.shutdown(wait=False)
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prediction-kernel")
+            _executor_size = workers
+        return _executor
+
+
+class PredictionKernel:
+    """Model parameters prepared for repeated scoring of large arrays."""
+
+    def __init__(self, parameters: Dict[str, float], dtype=np.float64):
+        self.dtype = np.dtype(dtype)
+        if self.dtype not in (np.float32, np.float64):
+            raise ValueError("dtype must be float32 or float64")
+        self.ln_a = math.log(parameters["A"])
+        self.b = float(parameters["b"])
+        self.minus_k = -float(parameters["K"])
+        self.c = float(parameters["c"])
+        self.ln_floor = math.log(RATE_FLOOR)
+
+    def predict(
+        self,
+        chloride,
+        temperature_k,
+        ph,
+        out: Optional[np.ndarray] = None,
+        workers: Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        Predicted rates (mm/yr) with the shape of the broadcast inputs.
+
+        Inputs with the full shape are read in place; scalars are applied per
+        chunk. ``out`` may be a preallocated contiguous array of that shape.
+        """
+        arrays = [np.asarray(value) for value in (chloride, temperature_k, ph)]
+        shape = np.broadcast_shapes(*(array.shape for array in arrays))
+        size = math.prod(shape)
+        inputs = [
+            array if array.ndim == 0 else np.broadcast_to(array, shape).reshape(-1)
+            for array in arrays
+        ]
+
+        if out is None:
+            out = np.empty(shape, dtype=self.dtype)
+        elif out.shape != shape or out.dtype != self.dtype or not out.flags.c_contiguous:
+            raise ValueError(f"out must be a contiguous {self.dtype} array of shape {shape}")
+        flat = out.reshape(-1)
+
+        workers = max(1, min(workers or default_workers(), size // MIN_ROWS_PER_WORKER))
+        if workers == 1:
+            self._score_block(inputs, flat, 0, size)
+            return out
+
+        bounds = np.linspace(0, size, workers + 1).astype(int)
+        pool = _shared_executor(workers)
+        futures = [
+            pool.submit(self._score_block, inputs, flat, int(start), int(stop))
+            for start, stop in zip(bounds[:-1], bounds[1:])
+        ]
+        for future in futures:
+            future.result()
+        return out
+
+    def _score_block(self, inputs, out: np.ndarray, start: int, stop: int) -> None:
+        chloride, temperature_k, ph = inputs
+        scratch = np.empty(min(CHUNK_ROWS, stop - start), dtype=self.dtype)
+
+        def rows(array, begin, end):
+            return array if array.ndim == 0 else array[begin:end]
+
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            for begin in range(start, stop, CHUNK_ROWS):
+                end = min(begin + CHUNK_ROWS, stop)
+                result, temp = out[begin:end], scratch[:end - begin]
+                if self.b:
+                    np.log(rows(chloride, begin, end), out=result)
+                    result *= self.b
+                else:
+                    # Cl**0 == 1 even at Cl == 0, where 0 * ln(0) would be NaN
+                    result.fill(0.0)
+                np.divide(self.minus_k, rows(temperature_k, begin, end), out=temp)
+                result += temp
+                np.multiply(rows(ph, begin, end), self.c, out=temp)
+                result += temp
+                result += self.ln_a
+                np.maximum(result, self.ln_floor, out=result)
+                np.exp(result, out=result)
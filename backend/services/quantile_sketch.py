@@ -0,0 +1,166 @@
+import math
+import random
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+
+class KLLSketch:
+    """
+    KLL streaming quantile sketch (Karnin, Lang & Liberty, 2016).
+
+    Items live in levels of "compactors"; an item at level h stands for 2**h
+    inputs. When the sketch outgrows its budget, the lowest full level is
+    sorted and every other item (random offset) is promoted one level up.
+    Sketches of the same ``k`` merge by concatenating levels, so per-batch
+    sketches can be combined in any order.
+
+    Accuracy: the normalized rank error of a returned quantile is about
+    ``2.296 / k**0.9723`` with 99% confidence (≈1.33% for the default
+    k=200; see ``normalized_rank_error``). That is, the value returned for
+    q=0.9 has a true rank between roughly 0.887 and 0.913. Memory is
+    O(k log(n / k)) floats.
+    """
+
+    DEFAULT_K = 200
+    _CAPACITY_DECAY = 2.0 / 3.0
+
+    def __init__(self, k: int = DEFAULT_K, seed: Optional[int] = None):
+        if k < 8:
+            raise ValueError("k must be at least 8")
+        self.k = k
+        self.n = 0
+        self.min_value = math.inf
+        self.max_value = -math.inf
+        self.levels: List[List[float]] = [[]]
+        self._size = 0
+        self._budget = 0
+        self._budget_levels = 0
+        self._rng = random.Random(seed)
+
+    @staticmethod
+    def normalized_rank_error(k: int = DEFAULT_K) -> float:
+        """Single-quantile rank error bound at 99% confidence (empirical KLL constant)."""
+        return 2.296 / k ** 0.9723
+
+    def update(self, value: float) -> None:
+        value = float(value)
+        if math.isnan(value):
+            return
+        self.levels[0].append(value)
+        self.n += 1
+        self._size += 1
+        if value < self.min_value:
+            self.min_value = value
+        if value > self.max_value:
+            self.max_value = value
+        if self._size > self._max_size():
+            self._compress()
+
+    def update_many(self, values: Iterable[float]) -> None:
+        array = np.asarray(values, dtype=float).ravel()
+        array = array[~np.isnan(array)]
+        if array.size == 0:
+            return
+        self.levels[0].extend(array.tolist())
+        self.n += int(array.size)
+        self._size += int(array.size)
+        self.min_value = min(self.min_value, float(array.min()))
+        self.max_value = max(self.max_value, float(array.max()))
+        self._compress()
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """Fold ``other`` into this sketch and return self."""
+        if other.k != self.k:
+            raise ValueError("Only sketches with the same k can be merged")
+        if other.n == 0:
+            return self
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        for level, items in enumerate(other.levels):
+            self.levels[level].extend(items)
+        self.n += other.n
+        self._size += other._size
+        self.min_value = min(self.min_value, other.min_value)
+        self.max_value = max(self.max_value, other.max_value)
+        self._compress()
+        return self
+
+    def quantiles(self, fractions: Sequence[float]) -> List[Optional[float]]:
+        """Approximate values at the given quantile fractions (0..1)."""
+        if self.n == 0:
+            return [None for _ in fractions]
+
+        values, weights = [], []
+        for level, items in enumerate(self.levels):
+            values.extend(items)
+            weights.extend([1 << level] * len(items))
+        order = np.argsort(values, kind="stable")
+        sorted_values = np.asarray(values)[order]
+        cumulative = np.cumsum(np.asarray(weights)[order])
+        total = cumulative[-1]
+
+        results = []
+        for fraction in fractions:
+            if fraction <= 0:
+                results.append(self.min_value)
+            elif fraction >= 1:
+                results.append(self.max_value)
+            else:
+                index = int(np.searchsorted(cumulative, fraction * total, side="left"))
+                results.append(float(sorted_values[min(index, len(sorted_values) - 1)]))
+        return results
+
+    def quantile(self, fraction: float) -> Optional[float]:
+        return self.quantiles([fraction])[0]
+
+    def to_dict(self) -> Dict:
+        return {
+            "k": self.k,
+            "n": self.n,
+            "min": self.min_value if self.n else None,
+            "max": self.max_value if self.n else None,
+            "levels": self.levels,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "KLLSketch":
+        sketch = cls(k=data["k"])
+        sketch.n = data["n"]
+        if sketch.n:
+            sketch.min_value = data["min"]
+            sketch.max_value = data["max"]
+        sketch.levels = [list(items) for items in data["levels"]] or [[]]
+        sketch._size = sum(len(items) for items in sketch.levels)
+        return sketch
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(int(math.ceil(self.k * self._CAPACITY_DECAY ** depth)), 2)
+
+    def _max_size(self) -> int:
+        # Capacities only change when a level is added
+        if self._budget_levels != len(self.levels):
+            self._budget = sum(self._capacity(level) for level in range(len(self.levels)))
+            self._budget_levels = len(self.levels)
+        return self._budget
+
+    def _compress(self) -> None:
+        while self._size > self._max_size():
+            for level in range(len(self.levels)):
+                if len(self.levels[level]) >= self._capacity(level):
+                    self._compact(level)
+                    break
+
+    def _compact(self, level: int) -> None:
+        if level + 1 == len(self.levels):
+            self.levels.append([])
+        items = np.sort(np.asarray(self.levels[level], dtype=float))
+        # An odd item stays behind so the promoted pairs keep the total weight exact.
+        leftover = [float(items[-1])] if items.size % 2 else []
+        paired = items[: items.size - len(leftover)]
+        offset = self._rng.randint(0, 1)
+        promoted = paired[offset::2].tolist()
+        self.levels[level + 1].extend(promoted)
+        self.levels[level] = leftover
+        self._size -= paired.size - len(promoted)
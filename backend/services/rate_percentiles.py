@@ -0,0 +1,302 @@
+"""
+Per-group corrosion-rate percentiles backed by persisted KLL sketches.
+
+Sketches are kept for every sample ("all"), per material, per medium and
+per condition band (temperature and pH bands). They are stored append-only
+in ``rate_sketch_batches``: each row holds the sketches of one contiguous
+range of sample ids. New samples are sketched incrementally (after every
+upload, and on read for rows inserted by other paths), and once there are
+more than ``SKETCH_COMPACT_BATCHES`` rows they are merged into one in a
+single transaction.
+
+Sketches only see inserts: samples changed in place are not re-sketched
+(clearing the database empties the sketches with the samples). The exact
+mode re-reads the rates and is meant for validation.
+"""
+
+import json
+import logging
+import math
+import threading
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    from config import Config
+    from services.cache_registry import CacheRegistry
+    from services.quantile_sketch import KLLSketch
+except ModuleNotFoundError:
+    from backend.config import Config
+    from backend.services.cache_registry import CacheRegistry
+    from backend.services.quantile_sketch import KLLSketch
+
+logger = logging.getLogger(__name__)
+
+RATE_COLUMN = 'corrosion_rate_mm_per_yr'
+GROUPINGS = ('all', 'material', 'medium', 'condition')
+DEFAULT_FRACTIONS = (0.5, 0.9, 0.99)
+
+# Condition bands: 20 °C by 1 pH unit
+TEMPERATURE_BAND = 20.0
+PH_BAND = 1.0
+
+CATCH_UP_CHUNK = 50_000
+
+
+def condition_band(temperature, ph) -> Optional[str]:
+    if temperature is None or ph is None:
+        return None
+    t_low = math.floor(float(temperature) / TEMPERATURE_BAND) * TEMPERATURE_BAND
+    p_low = math.floor(float(ph) / PH_BAND) * PH_BAND
+    return f"{t_low:g}-{t_low + TEMPERATURE_BAND:g} °C, pH {p_low:g}-{p_low + PH_BAND:g}"
+
+
+def group_keys(row: Dict) -> Dict[str, Optional[str]]:
+    """The key of ``row`` in every grouping (None when the row has no such key)."""
+    return {
+        'all': 'all',
+        'material': row.get('material'),
+        'medium': row.get('medium'),
+        'condition': condition_band(row.get('temperature'), row.get('ph')),
+    }
+
+
+def percentile_label(fraction: float) -> str:
+    return f"p{fraction * 100:g}"
+
+
+class RatePercentiles:
+    """Maintain the persisted sketches and answer percentile queries."""
+
+    _lock = threading.RLock()
+    _state: Optional[Dict] = None
+
+    @classmethod
+    def catch_up(cls, db) -> int:
+        """Sketch samples newer than the covered id range and append one batch row."""
+        with cls._lock:
+            state = cls._load(db)
+            covered = state['covered']
+            max_id = db.execute_query("SELECT MAX(id) AS max_id FROM corrosion_samples")[0]['max_id']
+            if not max_id or int(max_id) <= covered:
+                return 0
+
+            sketches = {grouping: {} for grouping in GROUPINGS}
+            first_id, last_id, sample_count = None, covered, 0
+            while True:
+                rows = db.execute_query(f"""
+                    SELECT id, material, medium, temperature, ph, {RATE_COLUMN}
+                    FROM corrosion_samples
+                    WHERE id > %s
+                    ORDER BY id
+                    LIMIT {CATCH_UP_CHUNK}
+                """, (last_id,))
+                if not rows:
+                    break
+                cls._sketch_rows(rows, sketches)
+                first_id = first_id if first_id is not None else int(rows[0]['id'])
+                last_id = int(rows[-1]['id'])
+                sample_count += len(rows)
+                if len(rows) < CATCH_UP_CHUNK:
+                    break
+
+            if first_id is None:
+                return 0
+            db.execute_query(
+                """
+                INSERT INTO rate_sketch_batches
+                (first_sample_id, last_sample_id, sample_count, sketches)
+                VALUES (%s, %s, %s, %s)
+                """,
+                (first_id, last_id, sample_count, cls._dumps(sketches)),
+            )
+            cls._state = None
+            cls.compact(db)
+            return sample_count
+
+    @classmethod
+    def compact(cls, db, force: bool = False) -> bool:
+        """Merge the batch rows into one when there are too many of them."""
+        with cls._lock:
+            state = cls._load(db)
+            batch_ids = state['batch_ids']
+            if len(batch_ids) < 2 or (not force and len(batch_ids) <= Config.SKETCH_COMPACT_BATCHES):
+                return False
+            placeholders = ', '.join(['%s'] * len(batch_ids))
+            db.execute_transaction([
+                (f"DELETE FROM rate_sketch_batches WHERE id IN ({placeholders})", tuple(batch_ids)),
+                ("""
+                    INSERT INTO rate_sketch_batches
+                    (first_sample_id, last_sample_id, sample_count, sketches)
+                    VALUES (%s, %s, %s, %s)
+                 """,
+                 (state['first'], state['covered'], state['sample_count'], cls._dumps(state['sketches']))),
+            ])
+            logger.info(f"Compacted {len(batch_ids)} sketch batches")
+            cls._state = None
+            return True
+
+    @classmethod
+    def percentiles(
+        cls, db, grouping: str, fractions: Sequence[float] = DEFAULT_FRACTIONS, limit: Optional[int] = None
+    ) -> List[Dict]:
+        """Sketch percentiles per group, largest groups first."""
+        cls.catch_up(db)
+        with cls._lock:
+            sketches = cls._load(db)['sketches'][grouping]
+        groups = []
+        for key, sketch in sketches.items():
+            values = sketch.quantiles(fractions)
+            group = {'key': key, 'count': sketch.n, 'min': sketch.min_value, 'max': sketch.max_value}
+            group.update({percentile_label(f): v for f, v in zip(fractions, values)})
+            groups.append(group)
+        groups.sort(key=lambda g: (-g['count'], str(g['key'])))
+        return groups[:limit] if limit else groups
+
+    @staticmethod
+    def exact_values(db, grouping: str) -> Dict[str, np.ndarray]:
+        """Sorted rates per group, read from corrosion_samples (full scan)."""
+        rows = db.execute_query(f"""
+            SELECT material, medium, temperature, ph, {RATE_COLUMN}
+            FROM corrosion_samples
+            WHERE {RATE_COLUMN} IS NOT NULL
+        """)
+        values: Dict[str, List[float]] = {}
+        for row in rows:
+            key = group_keys(row)[grouping]
+            if key is not None:
+                values.setdefault(key, []).append(float(row[RATE_COLUMN]))
+        return {key: np.sort(np.asarray(v)) for key, v in values.items()}
+
+    @classmethod
+    def exact_percentiles(
+        cls, db, grouping: str, fractions: Sequence[float] = DEFAULT_FRACTIONS, limit: Optional[int] = None
+    ) -> List[Dict]:
+        """Exact percentiles (inverted-CDF definition, like the sketch) for validation."""
+        groups = []
+        for key, values in cls.exact_values(db, grouping).items():
+            group = {'key': key, 'count': int(values.size), 'min': float(values[0]), 'max': float(values[-1])}
+            quantiles = np.quantile(values, fractions, method='inverted_cdf')
+            group.update({percentile_label(f): float(v) for f, v in zip(fractions, quantiles)})
+            groups.append(group)
+        groups.sort(key=lambda g: (-g['count'], str(g['key'])))
+        return groups[:limit] if limit else groups
+
+    @classmethod
+    def compare_with_exact(
+        cls, db, grouping: str, groups: List[Dict], fractions: Sequence[float] = DEFAULT_FRACTIONS
+    ) -> float:
+        """
+        Add the exact percentiles under ``'exact'`` to each sketch group and
+        return the largest normalized rank error of the sketch values.
+        """
+        exact = cls.exact_values(db, grouping)
+        worst = 0.0
+        for group in groups:
+            values = exact.get(group['key'])
+            if values is None:
+                continue
+            quantiles = np.quantile(values, fractions, method='inverted_cdf')
+            group['exact'] = {percentile_label(f): float(v) for f, v in zip(fractions, quantiles)}
+            for fraction in fractions:
+                worst = max(worst, cls.rank_error(values, group[percentile_label(fraction)], fraction))
+        return worst
+
+    @staticmethod
+    def rank_error(sorted_values: np.ndarray, value: float, fraction: float) -> float:
+        """How far (in normalized rank) ``value`` is from being the ``fraction`` quantile."""
+        size = sorted_values.size
+        low = np.searchsorted(sorted_values, value, side='left') / size
+        high = np.searchsorted(sorted_values, value, side='right') / size
+        if low <= fraction <= high:
+            return 0.0
+        return float(min(abs(fraction - low), abs(fraction - high)))
+
+    @staticmethod
+    def error_bound() -> Dict:
+        return {
+            'normalized_rank_error': round(KLLSketch.normalized_rank_error(Config.SKETCH_K), 5),
+            'confidence': 0.99,
+            'k': Config.SKETCH_K,
+        }
+
+    @classmethod
+    def clear(cls) -> None:
+        with cls._lock:
+            cls._state = None
+
+    @staticmethod
+    def _sketch_rows(rows: List[Dict], sketches: Dict[str, Dict[str, KLLSketch]]) -> None:
+        values: Dict[str, Dict[str, List[float]]] = {grouping: {} for grouping in GROUPINGS}
+        for row in rows:
+            rate = row[RATE_COLUMN]
+            if rate is None:
+                continue
+            rate = float(rate)
+            for grouping, key in group_keys(row).items():
+                if key is not None:
+                    values[grouping].setdefault(key, []).append(rate)
+        for grouping, by_key in values.items():
+            for key, group_values in by_key.items():
+                sketch = sketches[grouping].get(key)
+                if sketch is None:
+                    sketch = sketches[grouping][key] = KLLSketch(k=Config.SKETCH_K)
+                sketch.update_many(group_values)
+
+    @staticmethod
+    def _dumps(sketches: Dict[str, Dict[str, KLLSketch]]) -> str:
+        return json.dumps({
+            grouping: {key: sketch.to_dict() for key, sketch in by_key.items()}
+            for grouping, by_key in sketches.items()
+        })
+
+    @classmethod
+    def _load(cls, db) -> Dict:
+        """
+        Merge the stored batches, reusing the cached merge while the table is unchanged.
+
+        Batches are chained by sample id range; a batch overlapping one already
+        merged (two processes catching up at once) is skipped, not double counted.
+        """
+        signature = db.execute_query(
+            "SELECT COUNT(*) AS batches, MAX(id) AS last_batch FROM rate_sketch_batches"
+        )[0]
+        signature = (int(signature['batches'] or 0), signature['last_batch'])
+        if cls._state is not None and cls._state['signature'] == signature:
+            return cls._state
+
+        rows = db.execute_query("""
+            SELECT id, first_sample_id, last_sample_id, sample_count, sketches
+            FROM rate_sketch_batches
+            ORDER BY first_sample_id, last_sample_id DESC
+        """)
+        sketches = {grouping: {} for grouping in GROUPINGS}
+        covered, first, sample_count = 0, None, 0
+        for row in rows:
+            if int(row['first_sample_id']) <= covered:
+                logger.warning(f"Skipping overlapping sketch batch {row['id']}")
+                continue
+            for grouping, by_key in json.loads(row['sketches']).items():
+                for key, data in by_key.items():
+                    sketch = KLLSketch.from_dict(data)
+                    if key in sketches[grouping]:
+                        sketches[grouping][key].merge(sketch)
+                    else:
+                        sketches[grouping][key] = sketch
+            first = int(row['first_sample_id']) if first is None else first
+            covered = int(row['last_sample_id'])
+            sample_count += int(row['sample_count'])
+
+        cls._state = {
+            'signature': signature,
+            'batch_ids': [row['id'] for row in rows],
+            'first': first,
+            'covered': covered,
+            'sample_count': sample_count,
+            'sketches': sketches,
+        }
+        return cls._state
+
+
+CacheRegistry.register("rate_percentiles", RatePercentiles.clear)
@@ -0,0 +1,301 @@
+"""
+Wall-loss and remaining-life projection over operating-condition time series.
+
+Readings (timestamp, temperature, pH, NaCl) are streamed in chunks from CSV,
+Parquet or the ``condition_readings`` table. Each reading's rate comes from
+``CorrosionModelTrainer.predict`` and is held until the next reading
+(zero-order hold); metal loss is the cumulative sum of rate x interval,
+carried across chunks. Missing values are filled forward from the last
+reading that had them. Memory is bounded by the chunk size.
+"""
+
+import logging
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, Optional
+
+import numpy as np
+
+try:
+    from config import Config
+    from services.csv_processor import CSVProcessor
+    from services.model_trainer import CorrosionModelTrainer
+except ModuleNotFoundError:
+    from backend.config import Config
+    from backend.services.csv_processor import CSVProcessor
+    from backend.services.model_trainer import CorrosionModelTrainer
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_YEAR = 365.25 * 86400
+SECONDS_PER_DAY = 86400
+
+CONDITIONS = ('temperature', 'ph', 'nacl_percentage')
+
+# Accepted timestamp column names; the conditions use CSVProcessor.COLUMN_ALIASES
+TIMESTAMP_ALIASES = ('timestamp', 'Timestamp', 'time', 'Time', 'datetime', 'recorded_at', 'Date')
+
+MAX_CURVE_POINTS = 500
+CSV_BLOCK_BYTES = 32 * 1024 * 1024
+
+
+def resolve_columns(available: Iterable[str]) -> Dict[str, str]:
+    """
+    Map canonical column names to the source's columns, with the same
+    aliases and preference order as uploads, training and bulk scoring.
+    Raises ValueError when one is missing.
+    """
+    available = list(available)
+    mapping = {}
+    timestamp = next((name for name in TIMESTAMP_ALIASES if name in available), None)
+    if timestamp is not None:
+        mapping['timestamp'] = timestamp
+    for field, columns in CSVProcessor.source_columns(available, CONDITIONS).items():
+        mapping[field] = columns[0]
+    missing = [name for name in ('timestamp',) + CONDITIONS if name not in mapping]
+    if missing:
+        raise ValueError(f"Missing condition columns: {missing}")
+    return mapping
+
+
+def csv_chunks(path: str, chunk_rows: Optional[int] = None) -> Iterator["pd.DataFrame"]:
+    """
+    CSV readings in chunks. Uses pyarrow's streaming reader when it is
+    installed; chunks are then about ``CSV_BLOCK_BYTES`` of text.
+
+    The column types are fixed up front (float64 conditions, timestamp
+    text) rather than inferred from the first block, where a column that
+    starts out empty would be typed null and fail on the first later value.
+    Raises ValueError when a condition cell is neither a number nor empty.
+    """
+    import pandas as pd
+
+    mapping = resolve_columns(pd.read_csv(path, nrows=0).columns)
+    rename = {source: canonical for canonical, source in mapping.items()}
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+    except ImportError:
+        for chunk in pd.read_csv(path, usecols=list(mapping.values()),
+                                 chunksize=chunk_rows or Config.LIFE_CHUNK_ROWS):
+            yield chunk.rename(columns=rename)
+        return
+
+    column_types = {source: pa.float64() for canonical, source in mapping.items() if canonical in CONDITIONS}
+    column_types[mapping['timestamp']] = pa.string()
+    try:
+        reader = pa_csv.open_csv(
+            path,
+            read_options=pa_csv.ReadOptions(block_size=CSV_BLOCK_BYTES),
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=list(mapping.values()),
+                column_types=column_types,
+            ),
+        )
+        for batch in reader:
+            yield batch.to_pandas().rename(columns=rename)
+    except pa.ArrowInvalid as e:
+        raise ValueError(f"Unreadable condition value: {e}") from e
+
+
+def parquet_chunks(path: str, chunk_rows: Optional[int] = None) -> Iterator["pd.DataFrame"]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ValueError("Reading Parquet files requires pyarrow") from e
+
+    parquet_file = pq.ParquetFile(path)
+    mapping = resolve_columns(parquet_file.schema_arrow.names)
+    rename = {source: canonical for canonical, source in mapping.items()}
+    for batch in parquet_file.iter_batches(batch_size=chunk_rows or Config.LIFE_CHUNK_ROWS,
+                                           columns=list(mapping.values())):
+        yield batch.to_pandas().rename(columns=rename)
+
+
+def database_chunks(db, asset_id: str, chunk_rows: Optional[int] = None) -> Iterator["pd.DataFrame"]:
+    """Readings of one asset in time order, paged by (recorded_at, id)."""
+    import pandas as pd
+
+    chunk_rows = chunk_rows or Config.LIFE_CHUNK_ROWS
+    last_time, last_id = None, 0
+    while True:
+        if last_time is None:
+            where, params = "asset_id = %s", (asset_id,)
+        else:
+            where = "asset_id = %s AND (recorded_at > %s OR (recorded_at = %s AND id > %s))"
+            params = (asset_id, last_time, last_time, last_id)
+        rows = db.execute_query(f"""
+            SELECT id, recorded_at AS timestamp, temperature, ph, nacl_percentage
+            FROM condition_readings
+            WHERE {where}
+            ORDER BY recorded_at, id
+            LIMIT {int(chunk_rows)}
+        """, params)
+        if not rows:
+            return
+        last_time, last_id = rows[-1]['timestamp'], rows[-1]['id']
+        yield pd.DataFrame(rows, columns=['timestamp', *CONDITIONS])
+        if len(rows) < chunk_rows:
+            return
+
+
+def _fill_forward(values: np.ndarray, carry: float) -> np.ndarray:
+    """Replace NaN with the last valid value before it (``carry`` from the previous chunk)."""
+    values = np.concatenate([[carry], values])
+    valid = ~np.isnan(values)
+    index = np.where(valid, np.arange(values.size), 0)
+    np.maximum.accumulate(index, out=index)
+    return values[index][1:]
+
+
+def _iso(seconds: float) -> str:
+    return np.datetime64(int(round(seconds)), 's').astype(str) + 'Z'
+
+
+class RemainingLifeEngine:
+    """Integrate predicted corrosion rates over a condition time series."""
+
+    @staticmethod
+    def project(
+        chunks: Iterable["pd.DataFrame"],
+        allowance_mm: float,
+        parameters: Dict[str, float],
+        initial_loss_mm: float = 0.0,
+        projection_window_days: float = 365.0,
+    ) -> Dict:
+        """
+        Cumulative wall loss and when ``allowance_mm`` is (or will be) consumed.
+
+        ``chunks`` yield DataFrames with timestamp, temperature (°C), ph and
+        nacl_percentage columns, in time order. When the allowance is not
+        consumed within the series, the remaining life is projected at the
+        mean rate of the last ``projection_window_days``.
+        Raises ValueError when there are no usable readings.
+        """
+        import pandas as pd
+
+        if not allowance_mm > 0:
+            raise ValueError("allowance_mm must be positive")
+
+        loss = float(initial_loss_mm)
+        carry = {name: np.nan for name in CONDITIONS}
+        previous_time, previous_rate = None, 0.0
+        first_time = None
+        readings = without_conditions = out_of_order = 0
+        max_rate, largest_gap = 0.0, 0.0
+        consumed_at = None
+        daily_loss: Dict[int, float] = {}
+
+        for chunk in chunks:
+            times = pd.to_datetime(chunk['timestamp'], utc=True, errors='coerce')
+            seconds = times.dt.tz_localize(None).to_numpy().astype('datetime64[ns]').astype(np.int64) / 1e9
+            keep = times.notna().to_numpy().copy()
+            if previous_time is not None:
+                late = keep & (seconds < previous_time)
+                out_of_order += int(late.sum())
+                keep &= ~late
+            if not keep.any():
+                continue
+            seconds = seconds[keep]
+            order = np.argsort(seconds, kind='stable')
+            seconds = seconds[order]
+
+            conditions = {}
+            for name in CONDITIONS:
+                values = pd.to_numeric(chunk[name], errors='coerce').to_numpy(dtype=float)[keep][order]
+                conditions[name] = _fill_forward(values, carry[name])
+                carry[name] = conditions[name][-1]
+
+            with np.errstate(invalid='ignore', divide='ignore'):
+                rates = CorrosionModelTrainer.predict(
+                    conditions['nacl_percentage'],
+                    conditions['temperature'] + 273.15,
+                    conditions['ph'],
+                    parameters,
+                )
+            unknown = np.isnan(rates)
+            without_conditions += int(unknown.sum())
+            rates = np.where(unknown, 0.0, rates)
+
+            if previous_time is None:
+                previous_time = first_time = float(seconds[0])
+            start_times = np.concatenate([[previous_time], seconds[:-1]])
+            start_rates = np.concatenate([[previous_rate], rates[:-1]])
+            intervals = seconds - start_times
+            cumulative = loss + np.cumsum(start_rates * intervals / SECONDS_PER_YEAR)
+
+            if consumed_at is None and cumulative[-1] >= allowance_mm:
+                i = int(np.searchsorted(cumulative, allowance_mm))
+                loss_before = cumulative[i - 1] if i else loss
+                if loss_before >= allowance_mm:
+                    consumed_at = float(start_times[i])
+                else:
+                    consumed_at = start_times[i] + (allowance_mm - loss_before) / start_rates[i] * SECONDS_PER_YEAR
+
+            # Loss at the last reading of each day, for the curve and the projection window
+            days = (seconds // SECONDS_PER_DAY).astype(np.int64)
+            day_ends = np.append(np.flatnonzero(np.diff(days)), days.size - 1)
+            daily_loss.update(zip(days[day_ends].tolist(), cumulative[day_ends].tolist()))
+
+            readings += int(seconds.size)
+            max_rate = max(max_rate, float(rates.max()))
+            largest_gap = max(largest_gap, float(intervals.max()))
+            loss = float(cumulative[-1])
+            previous_time, previous_rate = float(seconds[-1]), float(rates[-1])
+
+        if not readings:
+            raise ValueError("No readings with a valid timestamp")
+
+        span_years = (previous_time - first_time) / SECONDS_PER_YEAR
+        mean_rate = (loss - initial_loss_mm) / span_years if span_years > 0 else previous_rate
+
+        # Trailing mean rate from the daily losses
+        window_start_day = int((previous_time - projection_window_days * SECONDS_PER_DAY) // SECONDS_PER_DAY)
+        day_numbers = np.array(sorted(daily_loss))
+        start_index = int(np.searchsorted(day_numbers, window_start_day))
+        if start_index < day_numbers.size - 1:
+            start_day = day_numbers[start_index]
+            window_years = (previous_time / SECONDS_PER_DAY - (start_day + 1)) / 365.25
+            projection_rate = (loss - daily_loss[start_day]) / window_years if window_years > 0 else mean_rate
+        else:
+            projection_rate = mean_rate
+
+        result = {
+            'readings': readings,
+            'start': _iso(first_time),
+            'end': _iso(previous_time),
+            'span_years': round(span_years, 4),
+            'allowance_mm': allowance_mm,
+            'initial_loss_mm': initial_loss_mm,
+            'wall_loss_mm': round(loss, 6),
+            'allowance_used_fraction': round(min(loss / allowance_mm, 1.0), 6),
+            'mean_rate_mm_per_yr': round(mean_rate, 6),
+            'max_rate_mm_per_yr': round(max_rate, 6),
+            'projection_rate_mm_per_yr': round(float(projection_rate), 6),
+            'consumed': consumed_at is not None,
+            'consumed_at': _iso(consumed_at) if consumed_at is not None else None,
+            'largest_gap_hours': round(largest_gap / 3600, 3),
+            'rows_without_conditions': without_conditions,
+            'out_of_order_dropped': out_of_order,
+        }
+        if consumed_at is not None:
+            result['remaining_life_years'] = 0.0
+            result['projected_end_of_life'] = result['consumed_at']
+        elif projection_rate > 0:
+            remaining = (allowance_mm - loss) / projection_rate
+            result['remaining_life_years'] = round(float(remaining), 4)
+            result['projected_end_of_life'] = _iso(previous_time + remaining * SECONDS_PER_YEAR)
+        else:
+            result['remaining_life_years'] = None
+            result['projected_end_of_life'] = None
+
+        stride = max(1, int(np.ceil(day_numbers.size / MAX_CURVE_POINTS)))
+        curve_days = list(day_numbers[::stride])
+        if curve_days[-1] != day_numbers[-1]:
+            curve_days.append(day_numbers[-1])
+        result['curve'] = [
+            {'date': _iso(day * SECONDS_PER_DAY)[:10], 'wall_loss_mm': round(daily_loss[day], 6)}
+            for day in curve_days
+        ]
+        return result
@@ -0,0 +1,169 @@
+import cProfile
+import hmac
+import io
+import json
+import logging
+import os
+import pstats
+import random
+import re
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional
+
+try:
+    from config import Config
+except ModuleNotFoundError:
+    from backend.config import Config
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = 'X-Profile-Token'
+_PROFILE_ID_PATTERN = re.compile(r'^[0-9]+-[a-z0-9_-]+$')
+
+SORT_KEYS = ('cumulative', 'tottime', 'time', 'calls', 'ncalls', 'filename', 'name', 'line', 'pcalls', 'stdname')
+MAX_TEXT_LIMIT = 1000
+
+
+class RequestProfiler:
+    """
+    Opt-in cProfile capture of single requests into a bounded on-disk ring buffer.
+
+    A request is profiled when it carries the admin token in the
+    ``X-Profile-Token`` header or is picked by ``PROFILE_SAMPLE_RATE``. When
+    neither is configured ``enabled`` is False and the request hooks return
+    after a single attribute check.
+    """
+
+    admin_token = Config.PROFILE_ADMIN_TOKEN
+    sample_rate = Config.PROFILE_SAMPLE_RATE
+    profile_dir = Config.PROFILE_DIR
+    max_profiles = Config.PROFILE_MAX_FILES
+    enabled = bool(admin_token) or sample_rate > 0
+
+    _lock = threading.Lock()
+
+    @classmethod
+    def should_profile(cls, path: str, headers) -> bool:
+        if path.startswith('/api/profiles'):
+            # Reading profiles must not evict the ones being read.
+            return False
+        if cls._token_matches(headers):
+            return True
+        return cls.sample_rate > 0 and random.random() < cls.sample_rate
+
+    @classmethod
+    def _token_matches(cls, headers) -> bool:
+        supplied = headers.get(PROFILE_HEADER)
+        return bool(cls.admin_token) and supplied is not None and hmac.compare_digest(
+            supplied.encode(), cls.admin_token.encode()
+        )
+
+    @classmethod
+    def is_authorized(cls, headers) -> bool:
+        """Profile listings need the admin token, or the explicit PROFILE_OPEN_ACCESS opt-in."""
+        if cls.admin_token:
+            return cls._token_matches(headers)
+        return Config.PROFILE_OPEN_ACCESS
+
+    @staticmethod
+    def parse_text_options(args) -> tuple:
+        """``(limit, sort)`` for the text rendering; raises ValueError for invalid values."""
+        try:
+            limit = int(args.get('limit', 50))
+        except ValueError:
+            raise ValueError("limit must be an integer") from None
+        if not 1 <= limit <= MAX_TEXT_LIMIT:
+            raise ValueError(f"limit must be between 1 and {MAX_TEXT_LIMIT}")
+        sort_by = args.get('sort', 'cumulative')
+        if sort_by not in SORT_KEYS:
+            raise ValueError(f"sort must be one of {', '.join(SORT_KEYS)}")
+        return limit, sort_by
+
+    @staticmethod
+    def start() -> Optional[cProfile.Profile]:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is already active on this interpreter.
+            return None
+        return profiler
+
+    @classmethod
+    def finish(
+        cls,
+        profiler: cProfile.Profile,
+        route: str,
+        method: str,
+        status: int,
+        duration_s: float,
+    ) -> Optional[str]:
+        """Stop ``profiler`` and save it, tagged with the route and duration."""
+        profiler.disable()
+        created_ms = int(time.time() * 1000)
+        slug = re.sub(r'[^a-z0-9]+', '_', route.lower()).strip('_') or 'root'
+        profile_id = f"{created_ms}-{method.lower()}-{slug}-{uuid.uuid4().hex[:6]}"
+        metadata = {
+            'id': profile_id,
+            'route': route,
+            'method': method,
+            'status': status,
+            'duration_ms': round(duration_s * 1000, 3),
+            'created_at': created_ms / 1000,
+        }
+        try:
+            os.makedirs(cls.profile_dir, exist_ok=True)
+            profiler.dump_stats(os.path.join(cls.profile_dir, f"{profile_id}.prof"))
+            with open(os.path.join(cls.profile_dir, f"{profile_id}.json"), 'w', encoding='utf-8') as file:
+                json.dump(metadata, file)
+            cls._trim()
+        except OSError as e:
+            logger.warning(f"Could not save request profile: {e}")
+            return None
+        return profile_id
+
+    @classmethod
+    def _trim(cls) -> None:
+        with cls._lock:
+            profiles = cls._profile_ids()
+            for profile_id in profiles[: max(0, len(profiles) - cls.max_profiles)]:
+                for extension in ('.prof', '.json'):
+                    try:
+                        os.remove(os.path.join(cls.profile_dir, profile_id + extension))
+                    except FileNotFoundError:
+                        pass
+
+    @classmethod
+    def _profile_ids(cls) -> List[str]:
+        """Saved profile ids, oldest first."""
+        if not os.path.isdir(cls.profile_dir):
+            return []
+        ids = [name[:-5] for name in os.listdir(cls.profile_dir) if name.endswith('.prof')]
+        return sorted(ids, key=lambda profile_id: int(profile_id.split('-', 1)[0]))
+
+    @classmethod
+    def list_profiles(cls) -> List[Dict]:
+        profiles = []
+        for profile_id in reversed(cls._profile_ids()):
+            try:
+                with open(os.path.join(cls.profile_dir, f"{profile_id}.json"), 'r', encoding='utf-8') as file:
+                    profiles.append(json.load(file))
+            except (OSError, ValueError):
+                profiles.append({'id': profile_id})
+        return profiles
+
+    @classmethod
+    def profile_path(cls, profile_id: str) -> Optional[str]:
+        if not _PROFILE_ID_PATTERN.match(profile_id):
+            return None
+        path = os.path.join(cls.profile_dir, f"{profile_id}.prof")
+        return path if os.path.isfile(path) else None
+
+    @staticmethod
+    def render_text(path: str, limit: int = 50, sort_by: str = 'cumulative') -> str:
+        stream = io.StringIO()
+        stats = pstats.Stats(path, stream=stream)
+        stats.sort_stats(sort_by).print_stats(limit)
+        return stream.getvalue()
@@ -0,0 +1,225 @@
+"""
+Aggregates over corrosion_samples computed by the database.
+
+Grouping, grid binning and moments (counts, sums, sums of squares and cross
+products) run in SQL, so only one row per group or bin leaves the database.
+Memory and transfer grow with the number of output bins, not with the
+number of samples. The SQL is portable between the MySQL and SQLite backends.
+"""
+
+import math
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    from services.binning import grid_axis, smooth_bins
+except ModuleNotFoundError:
+    from backend.services.binning import grid_axis, smooth_bins
+
+RATE_COLUMN = 'corrosion_rate_mm_per_yr'
+NUMERIC_COLUMNS = ('temperature', 'ph', 'nacl_percentage', 'corrosion_rate_mm_per_yr', 'corrosion_rate_mpy')
+CATEGORY_COLUMNS = ('material', 'medium')
+
+# The rows the research charts have always been drawn from
+CHART_FILTER = "temperature IS NOT NULL AND corrosion_rate_mm_per_yr IS NOT NULL"
+
+
+def _column(name: str) -> str:
+    """Column names are interpolated into SQL, so only known columns are accepted."""
+    if name not in NUMERIC_COLUMNS and name not in CATEGORY_COLUMNS:
+        raise ValueError(f"Unknown sample column: {name}")
+    return name
+
+
+def _where(filters: Sequence[str], columns: Sequence[str]) -> str:
+    clauses = list(filters) + [f"{_column(c)} IS NOT NULL" for c in columns]
+    return " AND ".join(clauses) if clauses else "1=1"
+
+
+def _float(value) -> Optional[float]:
+    return None if value is None else float(value)
+
+
+def _std(count: int, total: float, sum_squares: float) -> Optional[float]:
+    """Sample standard deviation (ddof=1) from a count, sum and sum of squares."""
+    if count < 2:
+        return None
+    variance = (sum_squares - total * total / count) / (count - 1)
+    return math.sqrt(max(variance, 0.0))
+
+
+class SampleAggregates:
+    """Database-side aggregations for the charts and statistics endpoints."""
+
+    @staticmethod
+    def group_stats(db, key: str, value: str = RATE_COLUMN, filters=(CHART_FILTER,)) -> List[Dict]:
+        """
+        Count, mean, min, max and standard deviation of ``value`` per ``key``.
+
+        Returns one dict per distinct key, ordered by key.
+        """
+        key, value = _column(key), _column(value)
+        query = f"""
+            SELECT {key} AS group_key,
+                   COUNT(*) AS count,
+                   SUM({value}) AS total,
+                   SUM({value} * {value}) AS sum_squares,
+                   MIN({value}) AS min_value,
+                   MAX({value}) AS max_value
+            FROM corrosion_samples
+            WHERE {_where(filters, [key, value])}
+            GROUP BY {key}
+            ORDER BY {key}
+        """
+        groups = []
+        for row in db.execute_query(query):
+            count = int(row['count'])
+            total = float(row['total'])
+            group_key = row['group_key']
+            groups.append({
+                key: group_key if key in CATEGORY_COLUMNS else float(group_key),
+                'count': count,
+                'mean': total / count,
+                'min': _float(row['min_value']),
+                'max': _float(row['max_value']),
+                'std': _std(count, total, float(row['sum_squares'])),
+            })
+        return groups
+
+    @staticmethod
+    def surface_grid(
+        db,
+        x: str,
+        y: str,
+        value: str = RATE_COLUMN,
+        x_resolution: int = 40,
+        y_resolution: int = 40,
+        x_window: Optional[float] = None,
+        y_window: Optional[float] = None,
+        filters=(CHART_FILTER,),
+    ) -> Dict[str, np.ndarray]:
+        """
+        SQL counterpart of ``binning.bin_surface``: the database snaps samples
+        to the nearest grid point and returns per-cell sums and counts, which
+        are then smoothed locally. Same return shape as ``bin_surface``.
+        """
+        x, y, value = _column(x), _column(y), _column(value)
+        where = _where(filters, [x, y, value])
+        bounds = db.execute_query(f"""
+            SELECT COUNT(*) AS count, MIN({x}) AS x_min, MAX({x}) AS x_max,
+                   MIN({y}) AS y_min, MAX({y}) AS y_max
+            FROM corrosion_samples
+            WHERE {where}
+        """)[0]
+
+        if not bounds['count']:
+            return {
+                'x': np.zeros(x_resolution),
+                'y': np.zeros(y_resolution),
+                'mean': np.full((y_resolution, x_resolution), np.nan),
+                'count': np.zeros((y_resolution, x_resolution)),
+            }
+
+        x_min, x_max = float(bounds['x_min']), float(bounds['x_max'])
+        y_min, y_max = float(bounds['y_min']), float(bounds['y_max'])
+        x_centers, x_step = grid_axis(x_min, x_max, x_resolution)
+        y_centers, y_step = grid_axis(y_min, y_max, y_resolution)
+
+        params = []
+        index_sql = []
+        for column, lower, step in ((x, x_min, x_step), (y, y_min, y_step)):
+            if step:
+                index_sql.append(f"FLOOR(({column} - %s) / %s + 0.5)")
+                params.extend([lower, step])
+            else:
+                index_sql.append("0")
+
+        rows = db.execute_query(f"""
+            SELECT {index_sql[0]} AS x_index, {index_sql[1]} AS y_index,
+                   COUNT(*) AS count, SUM({value}) AS total
+            FROM corrosion_samples
+            WHERE {where}
+            GROUP BY x_index, y_index
+        """, tuple(params))
+
+        sums = np.zeros((y_resolution, x_resolution))
+        counts = np.zeros((y_resolution, x_resolution))
+        if rows:
+            x_index = np.clip([int(r['x_index']) for r in rows], 0, x_resolution - 1)
+            y_index = np.clip([int(r['y_index']) for r in rows], 0, y_resolution - 1)
+            np.add.at(sums, (y_index, x_index), [float(r['total']) for r in rows])
+            np.add.at(counts, (y_index, x_index), [int(r['count']) for r in rows])
+
+        mean, counts = smooth_bins(sums, counts, x_step, y_step, x_window, y_window)
+        return {'x': x_centers, 'y': y_centers, 'mean': mean, 'count': counts}
+
+    @staticmethod
+    def correlation(db, columns: Sequence[str], filters=(CHART_FILTER,)) -> Dict:
+        """
+        Pearson correlation matrix of ``columns`` over rows where all are present.
+
+        Computed from one pass of sums, squares and cross products in SQL.
+        Returns ``{'columns', 'count', 'matrix'}``; the matrix is None with
+        fewer than two rows.
+        """
+        columns = [_column(c) for c in columns]
+        selects = ["COUNT(*) AS count"]
+        for i, a in enumerate(columns):
+            selects.append(f"SUM({a}) AS s_{i}")
+            for j in range(i, len(columns)):
+                selects.append(f"SUM({a} * {columns[j]}) AS p_{i}_{j}")
+        row = db.execute_query(f"""
+            SELECT {', '.join(selects)}
+            FROM corrosion_samples
+            WHERE {_where(filters, columns)}
+        """)[0]
+
+        count = int(row['count'] or 0)
+        if count < 2:
+            return {'columns': columns, 'count': count, 'matrix': None}
+
+        size = len(columns)
+        sums = np.array([float(row[f's_{i}']) for i in range(size)])
+        covariance = np.zeros((size, size))
+        for i in range(size):
+            for j in range(i, size):
+                products = float(row[f'p_{i}_{j}'])
+                covariance[i, j] = covariance[j, i] = products - sums[i] * sums[j] / count
+        scale = np.sqrt(np.clip(np.diag(covariance), 0, None))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            matrix = covariance / np.outer(scale, scale)
+        np.fill_diagonal(matrix, 1.0)
+        return {'columns': columns, 'count': count, 'matrix': np.clip(matrix, -1.0, 1.0)}
+
+    @staticmethod
+    def summary(db, filters=(CHART_FILTER,)) -> Dict:
+        """Headline figures for the statistics summary chart."""
+        rate = RATE_COLUMN
+        row = db.execute_query(f"""
+            SELECT COUNT(*) AS total_samples,
+                   SUM({rate}) AS rate_total,
+                   SUM({rate} * {rate}) AS rate_sum_squares,
+                   MIN({rate}) AS rate_min,
+                   MAX({rate}) AS rate_max,
+                   AVG(temperature) AS temperature_mean,
+                   AVG(ph) AS ph_mean,
+                   COUNT(DISTINCT material) AS materials,
+                   COUNT(DISTINCT medium) AS mediums
+            FROM corrosion_samples
+            WHERE {_where(filters, [])}
+        """)[0]
+
+        count = int(row['total_samples'] or 0)
+        total = _float(row['rate_total'])
+        return {
+            'total_samples': count,
+            'rate_mean': total / count if count else None,
+            'rate_min': _float(row['rate_min']),
+            'rate_max': _float(row['rate_max']),
+            'rate_std': _std(count, total, float(row['rate_sum_squares'])) if count else None,
+            'temperature_mean': _float(row['temperature_mean']),
+            'ph_mean': _float(row['ph_mean']),
+            'materials': int(row['materials'] or 0),
+            'mediums': int(row['mediums'] or 0),
+        }
@@ -0,0 +1,129 @@
+"""SQL for the read endpoints, shared by the Flask app and the async app."""
+
+import decimal
+import hashlib
+from typing import Dict, List, Mapping, Tuple
+
+CURATED_MATERIALS = [
+    'API 5L X65',
+    'Carbon Steel',
+    'Stainless Steel 316',
+    'Duplex Stainless Steel',
+    'Low Alloy Steel',
+]
+
+SAMPLES_LIMIT = 1000
+
+# Categorical statistics; the pH and temperature series come from statistics_series
+STATISTICS_QUERIES = {
+    # Corrosion rate vs Medium
+    'medium_vs_rate': """
+        SELECT medium, AVG(corrosion_rate_mm_per_yr) as avg_rate, COUNT(*) as count
+        FROM corrosion_samples
+        WHERE medium IS NOT NULL AND corrosion_rate_mm_per_yr IS NOT NULL
+        GROUP BY medium
+        ORDER BY avg_rate DESC
+    """,
+    # Material comparison
+    'material_comparison': """
+        SELECT material, AVG(corrosion_rate_mm_per_yr) as avg_rate, COUNT(*) as count
+        FROM corrosion_samples
+        WHERE material IS NOT NULL AND corrosion_rate_mm_per_yr IS NOT NULL
+        GROUP BY material
+        ORDER BY avg_rate DESC
+    """,
+}
+
+MATERIALS_QUERY = "SELECT DISTINCT material FROM corrosion_samples WHERE material IS NOT NULL"
+MEDIUMS_QUERY = "SELECT DISTINCT medium FROM corrosion_samples WHERE medium IS NOT NULL"
+
+# Changes whenever samples are inserted, updated or cleared. Each maximum is
+# its own subquery so both are read from an index (primary key,
+# idx_updated_at) instead of a table scan. Rows deleted one by one are not
+# seen, but the app only ever truncates, which resets the ids and stamps the
+# reloaded rows with a later updated_at.
+DATA_VERSION_QUERY = """
+    SELECT (SELECT MAX(id) FROM corrosion_samples) AS max_id,
+           (SELECT MAX(updated_at) FROM corrosion_samples) AS last_update
+"""
+
+
+def json_safe_rows(rows):
+    """Convert Decimal values returned by MySQL into JSON-safe floats."""
+    for row in rows:
+        for key, value in row.items():
+            if isinstance(value, decimal.Decimal):
+                row[key] = float(value)
+    return rows
+
+
+def data_version(rows: List[Dict]) -> str:
+    """Short token identifying the current sample data, from ``DATA_VERSION_QUERY`` rows."""
+    row = rows[0] if rows else {}
+    summary = f"{row.get('max_id')}|{row.get('last_update')}"
+    return hashlib.sha1(summary.encode()).hexdigest()[:12]
+
+
+# Numeric range filters: request argument -> (column, operator)
+RANGE_FILTERS = {
+    'min_temp': ('temperature', '>='),
+    'max_temp': ('temperature', '<='),
+    'min_ph': ('ph', '>='),
+    'max_ph': ('ph', '<='),
+}
+
+
+def parse_sample_filters(args: Mapping[str, str]) -> Dict:
+    """The ``/api/samples`` filters present in the request arguments."""
+    filters = {}
+    for name in ('material', 'medium'):
+        if args.get(name):
+            filters[name] = args.get(name)
+    for name in RANGE_FILTERS:
+        if args.get(name):
+            filters[name] = float(args.get(name))
+    return filters
+
+
+def _filter_sql(filters: Dict) -> Tuple[str, List]:
+    query = " WHERE 1=1"
+    params = []
+
+    if 'material' in filters:
+        query += " AND material LIKE %s"
+        params.append(f"%{filters['material']}%")
+
+    for name, (column, operator) in RANGE_FILTERS.items():
+        if name in filters:
+            query += f" AND {column} {operator} %s"
+            params.append(filters[name])
+
+    if 'medium' in filters:
+        query += " AND medium LIKE %s"
+        params.append(f"%{filters['medium']}%")
+
+    return query, params
+
+
+def build_samples_query(args: Mapping[str, str]) -> Tuple[str, List]:
+    """Build the filtered ``/api/samples`` query from request arguments."""
+    where, params = _filter_sql(parse_sample_filters(args))
+    query = "SELECT * FROM corrosion_samples" + where
+    query += f" ORDER BY created_at DESC LIMIT {SAMPLES_LIMIT}"
+    return query, params
+
+
+def build_samples_count_query(args: Mapping[str, str]) -> Tuple[str, List]:
+    """Exact number of samples matching the ``/api/samples`` filters."""
+    where, params = _filter_sql(parse_sample_filters(args))
+    return "SELECT COUNT(*) AS count FROM corrosion_samples" + where, params
+
+
+def merge_materials(rows: List[Dict]) -> List[str]:
+    """Curated materials first, then the ones found in the database."""
+    db_materials = [r['material'] for r in rows if r.get('material')]
+    return list(dict.fromkeys(CURATED_MATERIALS + sorted(db_materials)))
+
+
+def medium_names(rows: List[Dict]) -> List[str]:
+    return [r['medium'] for r in rows if r['medium']]
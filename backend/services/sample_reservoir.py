@@ -0,0 +1,433 @@
+"""
+Approximate statistics from an in-memory uniform sample of corrosion_samples.
+
+The reservoir holds up to ``RESERVOIR_SIZE`` rows chosen uniformly at random
+and is kept in step with the table through the data version: when only new
+rows were inserted they are streamed through reservoir sampling (Algorithm
+R), otherwise the sample is drawn again by probing random ids in SQL.
+Requests only read the indexed data version and are served from the
+current sample while a refresh runs in the background, and say so with
+``stale``.
+
+Counts are scaled from the sample with a Wilson score interval, means carry
+a normal interval; both use the finite population correction, so a table
+that fits in the reservoir gets exact answers with zero-width intervals.
+Intervals are 95%. Rare groups are estimated from few sampled rows and get
+correspondingly wide intervals.
+"""
+
+import logging
+import math
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from config import Config
+    from services.background_jobs import BackgroundJobManager
+    from services.cache_registry import CacheRegistry
+    from services.sample_queries import DATA_VERSION_QUERY, RANGE_FILTERS, data_version
+    from services.statistics_series import SERIES, lttb
+except ModuleNotFoundError:
+    from backend.config import Config
+    from backend.services.background_jobs import BackgroundJobManager
+    from backend.services.cache_registry import CacheRegistry
+    from backend.services.sample_queries import DATA_VERSION_QUERY, RANGE_FILTERS, data_version
+    from backend.services.statistics_series import SERIES, lttb
+
+logger = logging.getLogger(__name__)
+
+RATE_COLUMN = 'corrosion_rate_mm_per_yr'
+NUMERIC_COLUMNS = ('temperature', 'ph', 'nacl_percentage', RATE_COLUMN)
+TEXT_COLUMNS = ('material', 'medium')
+
+CONFIDENCE = 0.95
+Z_SCORE = 1.959964
+
+FETCH_CHUNK = 500  # stays under the SQLite bound-parameter limit
+STREAM_CHUNK = 50_000
+
+# Categorical statistics: response key -> grouping column
+CATEGORY_SERIES = {
+    'medium_vs_rate': 'medium',
+    'material_comparison': 'material',
+}
+
+
+def _columns_from_rows(rows: List[Dict]) -> Dict[str, np.ndarray]:
+    columns = {'id': np.array([int(r['id']) for r in rows], dtype=np.int64)}
+    for name in NUMERIC_COLUMNS:
+        columns[name] = np.array(
+            [np.nan if r[name] is None else float(r[name]) for r in rows], dtype=float
+        )
+    for name in TEXT_COLUMNS:
+        columns[name] = np.array([r[name] for r in rows], dtype=object)
+    return columns
+
+
+def _concat(a: Dict[str, np.ndarray], b: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    return {name: np.concatenate([a[name], b[name]]) for name in a}
+
+
+def _take(columns: Dict[str, np.ndarray], index) -> Dict[str, np.ndarray]:
+    return {name: values[index] for name, values in columns.items()}
+
+
+def _empty_columns() -> Dict[str, np.ndarray]:
+    return _columns_from_rows([])
+
+
+def wilson_interval(hits: int, size: int, population: int) -> Tuple[float, float]:
+    """Bounds on the matching fraction of ``population`` from ``hits`` out of ``size`` sampled rows."""
+    if size == 0:
+        return 0.0, 1.0
+    if size >= population:
+        return hits / size, hits / size
+    # Finite population correction folded into an effective sample size
+    effective = size * (population - 1) / (population - size)
+    p = hits / size
+    z2 = Z_SCORE ** 2
+    centre = (p + z2 / (2 * effective)) / (1 + z2 / effective)
+    half = Z_SCORE * math.sqrt(p * (1 - p) / effective + z2 / (4 * effective ** 2)) / (1 + z2 / effective)
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+class SampleReservoir:
+    """Maintain the reservoir and answer approximate count and statistics queries."""
+
+    JOB_NAME = 'sample_reservoir_refresh'
+
+    # _lock guards swapping _state; _refresh_lock keeps refreshes (database work) one at a time
+    _lock = threading.Lock()
+    _refresh_lock = threading.Lock()
+    _state: Optional[Dict] = None
+    _generation = 0
+    _rng = np.random.default_rng()
+
+    @classmethod
+    def snapshot(cls, db) -> Dict:
+        """
+        The current sample, plus ``stale`` when the table changed since it was drawn.
+
+        The first call draws the sample synchronously; later changes are
+        folded in by a background job while the previous sample keeps serving.
+        """
+        version_row = db.execute_query(DATA_VERSION_QUERY)[0]
+        version = data_version([version_row])
+        CacheRegistry.observe_data_version(version_row)
+        # Replaced in one assignment, so reading it needs no lock
+        state = cls._state
+        if state is None:
+            state = cls.refresh(db, version_row)
+        stale = state['version'] != version
+        if stale:
+            BackgroundJobManager.submit(cls.JOB_NAME, lambda report: cls.describe(cls.refresh(db)))
+        return dict(state, stale=stale)
+
+    @classmethod
+    def refresh(cls, db, version_row: Optional[Dict] = None) -> Dict:
+        """
+        Bring the sample up to date, incrementally when rows were only inserted.
+
+        The database work runs without holding ``_lock``, so requests keep
+        reading the previous sample; the new one replaces it in one step.
+        """
+        with cls._refresh_lock:
+            if version_row is None:
+                version_row = db.execute_query(DATA_VERSION_QUERY)[0]
+            version = data_version([version_row])
+            with cls._lock:
+                state, generation = cls._state, cls._generation
+            if state is not None and state['version'] == version:
+                return state
+
+            if state is not None and cls._only_inserts(db, state, version_row):
+                state = cls._append_new_rows(db, state)
+            else:
+                state = cls._draw(db, int(version_row['max_id'] or 0))
+            state.update({
+                'version': version,
+                'max_id': int(version_row['max_id'] or 0),
+                'last_update': version_row['last_update'],
+            })
+            with cls._lock:
+                # A clear during the refresh wins; the next request draws again
+                if cls._generation == generation:
+                    cls._state = state
+            logger.info(
+                f"Sample reservoir at version {version}: "
+                f"{len(state['columns']['id'])} of {state['population']} rows"
+            )
+            return state
+
+    @classmethod
+    def clear(cls) -> None:
+        with cls._lock:
+            cls._state = None
+            cls._generation += 1
+
+    @staticmethod
+    def _only_inserts(db, state: Dict, version_row: Dict) -> bool:
+        """
+        True when no row the sample was drawn from has been removed, updated or reloaded.
+
+        A largest id below the sample's (or none) means the table was
+        truncated, possibly by another process. Otherwise idx_updated_at is
+        read from the sample's last update onwards, so the cost grows with
+        the rows written since rather than the table size; a truncate
+        restarts the ids, so reloaded rows show up there too.
+        """
+        if version_row['max_id'] is None or int(version_row['max_id']) < state['max_id']:
+            return False
+        rows = db.execute_query(
+            "SELECT id FROM corrosion_samples WHERE updated_at > %s AND id <= %s LIMIT 1",
+            (state['last_update'], state['max_id']),
+        ) if state['last_update'] is not None else []
+        return not rows
+
+    @classmethod
+    def _draw(cls, db, max_id: int) -> Dict:
+        """
+        Pick a fresh uniform sample and load those rows.
+
+        Ids are probed in random order between the smallest and largest id,
+        and the first ``RESERVOIR_SIZE`` that exist are kept, which is a
+        uniform sample of the rows; since the ids are auto-increment with
+        gaps only from failed inserts, few probes miss. Only the sampled rows
+        and one COUNT (for the population, once per redraw) are read. When
+        every id has been probed (rows deleted after the COUNT), the rows
+        found are the whole table.
+        """
+        row = db.execute_query(
+            "SELECT COUNT(*) AS count, MIN(id) AS min_id FROM corrosion_samples WHERE id <= %s",
+            (max_id,),
+        )[0]
+        population = int(row['count'] or 0)
+        select = f"SELECT id, {', '.join(NUMERIC_COLUMNS + TEXT_COLUMNS)} FROM corrosion_samples"
+        if population <= Config.RESERVOIR_SIZE:
+            rows = db.execute_query(f"{select} WHERE id <= %s", (max_id,))
+            return {'columns': _columns_from_rows(rows), 'population': population}
+
+        min_id = int(row['min_id'])
+        span = max_id - min_id + 1
+        columns, probed = _empty_columns(), set()
+        while len(columns['id']) < Config.RESERVOIR_SIZE and len(probed) < span:
+            if span - len(probed) <= FETCH_CHUNK:
+                # Random probes would mostly repeat now; take the rest in random order
+                candidates = [i for i in range(min_id, max_id + 1) if i not in probed]
+                cls._rng.shuffle(candidates)
+            else:
+                candidates = [i for i in dict.fromkeys(cls._rng.integers(min_id, max_id + 1, FETCH_CHUNK).tolist())
+                              if i not in probed]
+            probed.update(candidates)
+            if not candidates:
+                continue
+            placeholders = ', '.join(['%s'] * len(candidates))
+            found = {int(r['id']): r for r in db.execute_query(f"{select} WHERE id IN ({placeholders})",
+                                                               tuple(candidates))}
+            # Keep hits in probe order so that cutting off at the reservoir size stays uniform
+            hits = [found[i] for i in candidates if i in found]
+            columns = _concat(columns, _columns_from_rows(hits[:Config.RESERVOIR_SIZE - len(columns['id'])]))
+        if len(columns['id']) < Config.RESERVOIR_SIZE:
+            population = len(columns['id'])
+        return {'columns': columns, 'population': population}
+
+    @classmethod
+    def _append_new_rows(cls, db, state: Dict) -> Dict:
+        """Stream rows newer than the sample through Algorithm R (new arrays, old state untouched)."""
+        columns = dict(state['columns'])
+        seen = state['population']
+        last_id = state['max_id']
+        while True:
+            rows = db.execute_query(f"""
+                SELECT id, {', '.join(NUMERIC_COLUMNS + TEXT_COLUMNS)}
+                FROM corrosion_samples
+                WHERE id > %s
+                ORDER BY id
+                LIMIT {STREAM_CHUNK}
+            """, (last_id,))
+            if not rows:
+                break
+            incoming = _columns_from_rows(rows)
+            last_id = int(incoming['id'][-1])
+
+            # Fill the reservoir first, then row t (1-based) replaces a random slot with probability size/t
+            free = max(0, Config.RESERVOIR_SIZE - len(columns['id']))
+            if free:
+                columns = _concat(columns, _take(incoming, slice(0, free)))
+                incoming = _take(incoming, slice(free, None))
+                seen += min(free, len(rows))
+            count = len(incoming['id'])
+            if count:
+                positions = seen + 1 + np.arange(count)
+                slots = cls._rng.integers(0, positions)
+                accepted = np.flatnonzero(slots < Config.RESERVOIR_SIZE)
+                # A slot hit twice keeps the later row, as the sequential algorithm would
+                last_for_slot, first_index = np.unique(slots[accepted][::-1], return_index=True)
+                winners = accepted[::-1][first_index]
+                columns = {name: values.copy() for name, values in columns.items()}
+                for name, values in columns.items():
+                    values[last_for_slot] = incoming[name][winners]
+                seen += count
+            if len(rows) < STREAM_CHUNK:
+                break
+        return {'columns': columns, 'population': seen}
+
+    # Estimators --------------------------------------------------------
+
+    @staticmethod
+    def describe(state: Dict) -> Dict:
+        """Sample metadata returned with every approximate answer."""
+        return {
+            'sample_size': int(len(state['columns']['id'])),
+            'population': state['population'],
+            'confidence': CONFIDENCE,
+            'data_version': state['version'],
+            'stale': state.get('stale', False),
+        }
+
+    @staticmethod
+    def filter_mask(columns: Dict[str, np.ndarray], filters: Dict) -> np.ndarray:
+        """Rows matching ``parse_sample_filters`` output, with SQL LIKE/NULL semantics."""
+        mask = np.ones(len(columns['id']), dtype=bool)
+        for name in TEXT_COLUMNS:
+            if name in filters:
+                needle = filters[name].lower()
+                mask &= np.array([v is not None and needle in v.lower() for v in columns[name]], dtype=bool)
+        for name, (column, operator) in RANGE_FILTERS.items():
+            if name in filters:
+                with np.errstate(invalid='ignore'):
+                    values = columns[column]
+                    mask &= values >= filters[name] if operator == '>=' else values <= filters[name]
+        return mask
+
+    @staticmethod
+    def estimate_count(hits: int, state: Dict) -> Dict:
+        size = len(state['columns']['id'])
+        population = state['population']
+        if size == 0:
+            return {'estimate': 0, 'ci_low': 0, 'ci_high': 0}
+        low, high = wilson_interval(hits, size, population)
+        return {
+            'estimate': round(population * hits / size),
+            # Never below the rows actually seen, nor above what the unsampled rows allow
+            'ci_low': max(hits, math.floor(population * low)),
+            'ci_high': min(population - (size - hits), math.ceil(population * high)),
+        }
+
+    @staticmethod
+    def _mean_interval(count: np.ndarray, total: np.ndarray, sum_squares: np.ndarray,
+                       group_population: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        mean = total / count
+        with np.errstate(invalid='ignore', divide='ignore'):
+            variance = np.clip((sum_squares - total * total / count) / (count - 1), 0, None)
+            correction = np.clip((group_population - count) / (group_population - 1), 0, 1)
+            half = Z_SCORE * np.sqrt(variance / count * correction)
+        half = np.where(count > 1, np.nan_to_num(half), np.nan)
+        return mean - half, mean + half
+
+    @classmethod
+    def _grouped(cls, keys: np.ndarray, rates: np.ndarray, state: Dict) -> Tuple[np.ndarray, List[Dict]]:
+        """Per-key estimated count and mean rate (with intervals) for sampled rows."""
+        unique, inverse = np.unique(keys, return_inverse=True)
+        count = np.bincount(inverse, minlength=unique.size).astype(float)
+        total = np.bincount(inverse, weights=rates, minlength=unique.size)
+        sum_squares = np.bincount(inverse, weights=rates * rates, minlength=unique.size)
+        min_rate = np.full(unique.size, np.inf)
+        max_rate = np.full(unique.size, -np.inf)
+        np.minimum.at(min_rate, inverse, rates)
+        np.maximum.at(max_rate, inverse, rates)
+
+        size = max(len(state['columns']['id']), 1)
+        scale = state['population'] / size
+        low, high = cls._mean_interval(count, total, sum_squares, count * scale)
+        groups = []
+        for i in range(unique.size):
+            estimate = cls.estimate_count(int(count[i]), state)
+            groups.append({
+                'avg_rate': float(total[i] / count[i]),
+                'avg_rate_ci': [None if np.isnan(low[i]) else float(low[i]),
+                                None if np.isnan(high[i]) else float(high[i])],
+                'count': estimate['estimate'],
+                'count_ci': [estimate['ci_low'], estimate['ci_high']],
+                'sample_count': int(count[i]),
+                'min_rate': float(min_rate[i]),
+                'max_rate': float(max_rate[i]),
+            })
+        return unique, groups
+
+    @classmethod
+    def count(cls, state: Dict, filters: Dict) -> Dict:
+        """Estimated number of samples matching the ``/api/samples`` filters."""
+        hits = int(cls.filter_mask(state['columns'], filters).sum())
+        result = cls.estimate_count(hits, state)
+        result['sample_hits'] = hits
+        return result
+
+    @classmethod
+    def series(cls, state: Dict, column: str, options: Dict) -> Tuple[List[Dict], Dict]:
+        """Approximate counterpart of the exact pH/temperature series, same binning rules."""
+        columns = state['columns']
+        x, rates = columns[column], columns[RATE_COLUMN]
+        valid = ~np.isnan(x) & ~np.isnan(rates)
+        x, rates = x[valid], rates[valid]
+        distinct = int(np.unique(x).size)
+        plan = {'distinct_values': distinct, 'binned': False}
+        if distinct == 0:
+            plan['points'] = 0
+            return [], plan
+
+        lower, upper = float(x.min()), float(x.max())
+        wants_bins = options['bins'] is not None or options['bin_width'] is not None
+        if (not wants_bins and distinct <= options['max_points']) or upper <= lower:
+            keys, groups = cls._grouped(x, rates, state)
+            points = [dict({column: float(key)}, **group) for key, group in zip(keys, groups)]
+        else:
+            width = options['bin_width'] or (upper - lower) / (options['bins'] or options['max_points'])
+            bins = max(1, math.ceil((upper - lower) / width))
+            plan.update({'binned': True, 'bin_width': width, 'bins': bins})
+            index = np.minimum(np.floor((x - lower) / width).astype(int), bins - 1)
+            keys, groups = cls._grouped(index, rates, state)
+            x_total = np.bincount(np.searchsorted(keys, index), weights=x, minlength=keys.size)
+            points = []
+            for key, group, x_sum in zip(keys, groups, x_total):
+                start = lower + int(key) * width
+                point = {column: round(float(x_sum) / group['sample_count'], 4)}
+                point.update(group)
+                point.update({'bin_start': round(start, 6), 'bin_end': round(start + width, 6)})
+                points.append(point)
+
+        if len(points) > options['max_points']:
+            px = np.array([p[column] for p in points], dtype=float)
+            py = np.array([p['avg_rate'] for p in points], dtype=float)
+            points = [points[i] for i in lttb(px, py, options['max_points'])]
+            plan['downsampled'] = True
+        plan['points'] = len(points)
+        return points, plan
+
+    @classmethod
+    def statistics(cls, state: Dict, options: Dict) -> Dict:
+        """The ``/api/statistics`` payload estimated from the sample."""
+        statistics, resolution = {}, {}
+        for name, column in SERIES.items():
+            statistics[name], resolution[name] = cls.series(state, column, options)
+
+        columns = state['columns']
+        for name, column in CATEGORY_SERIES.items():
+            keys = columns[column]
+            valid = np.array([k is not None for k in keys], dtype=bool) & ~np.isnan(columns[RATE_COLUMN])
+            if not valid.any():
+                statistics[name] = []
+                continue
+            unique, groups = cls._grouped(keys[valid].astype(str), columns[RATE_COLUMN][valid], state)
+            rows = [dict({column: key}, **group) for key, group in zip(unique.tolist(), groups)]
+            rows.sort(key=lambda r: r['avg_rate'], reverse=True)
+            statistics[name] = rows
+
+        statistics['resolution'] = resolution
+        statistics['approximate'] = cls.describe(state)
+        return statistics
+
+
+CacheRegistry.register("sample_reservoir", SampleReservoir.clear)
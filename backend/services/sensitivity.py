@@ -0,0 +1,186 @@
+"""
+Global sensitivity of the trained model: first-order and total Sobol indices.
+
+Inputs are uniform over an operating envelope. Saltelli sampling draws two
+base matrices A and B (N rows each) and, per input i, AB_i = A with column i
+taken from B, giving N * (d + 2) model evaluations. Indices use the
+Saltelli (2010) first-order and Jansen total-effect estimators:
+
+    S_i  = mean(f(B) * (f(AB_i) - f(A))) / Var(f)
+    ST_i = mean((f(A) - f(AB_i)) ** 2) / (2 * Var(f))
+
+Base rows are processed in chunks (optionally on several threads; numpy
+releases the GIL) and only running sums are kept, so memory is bounded by
+the chunk size.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Mapping, Optional
+
+import numpy as np
+
+try:
+    from config import Config
+    from services.model_trainer import CorrosionModelTrainer
+except ModuleNotFoundError:
+    from backend.config import Config
+    from backend.services.model_trainer import CorrosionModelTrainer
+
+INPUTS = ('temperature', 'ph', 'nacl_percentage')
+
+DEFAULT_ENVELOPE = {
+    'temperature': (20.0, 80.0),
+    'ph': (4.0, 9.0),
+    'nacl_percentage': (0.5, 5.0),
+}
+
+DEFAULT_BASE_SAMPLES = 2 ** 17
+MAX_BASE_SAMPLES = 2 ** 21
+CHUNK_ROWS = 2 ** 16
+CACHE_SIZE = 32
+
+# Running sums kept per chunk
+_SUM_KEYS = ('count', 'f', 'f2', 'first', 'total')
+
+
+def _base_matrices(size: int, seed: int):
+    """A and B in [0, 1)^d: scrambled Sobol points when scipy is available, else pseudo-random."""
+    dimensions = len(INPUTS)
+    try:
+        from scipy.stats import qmc
+
+        points = qmc.Sobol(d=2 * dimensions, scramble=True, seed=seed).random(size)
+        sampling = 'sobol'
+    except Exception:
+        points = np.random.default_rng(seed).random((size, 2 * dimensions))
+        sampling = 'random'
+    return points[:, :dimensions], points[:, dimensions:], sampling
+
+
+class SensitivityAnalysis:
+    """Sobol indices for the active model, cached by (model version, envelope, samples, seed)."""
+
+    _cache: "OrderedDict[tuple, Dict]" = OrderedDict()
+    _lock = threading.Lock()
+
+    @staticmethod
+    def parse_envelope(args: Mapping[str, str]) -> Dict[str, tuple]:
+        """
+        ``temperature=20,80&ph=4,9&nacl_percentage=0.5,5``; missing inputs keep
+        the default range. Raises ValueError for malformed or empty ranges.
+        """
+        envelope = dict(DEFAULT_ENVELOPE)
+        for name in INPUTS:
+            if args.get(name):
+                parts = [float(part) for part in str(args[name]).split(',')]
+                if len(parts) != 2 or not parts[0] < parts[1]:
+                    raise ValueError(f"{name} must be 'min,max' with min below max")
+                envelope[name] = (parts[0], parts[1])
+        if envelope['nacl_percentage'][0] <= 0:
+            raise ValueError("nacl_percentage must stay above 0 for the trained model")
+        return envelope
+
+    @classmethod
+    def analyze(
+        cls,
+        parameters: Dict[str, float],
+        model_version: Optional[str],
+        envelope: Dict[str, tuple] = None,
+        base_samples: int = DEFAULT_BASE_SAMPLES,
+        seed: int = 0,
+        workers: Optional[int] = None,
+    ) -> Dict:
+        """
+        Sobol indices over ``envelope``. ``base_samples`` is rounded up to a
+        power of two (Sobol points are only balanced in such blocks); the model
+        is evaluated ``base_samples * 5`` times. Raises ValueError when out of range.
+        """
+        envelope = envelope or DEFAULT_ENVELOPE
+        if not 16 <= base_samples <= MAX_BASE_SAMPLES:
+            raise ValueError(f"samples must be between 16 and {MAX_BASE_SAMPLES}")
+        base_samples = 1 << (int(base_samples) - 1).bit_length()
+
+        key = (model_version, tuple(tuple(envelope[name]) for name in INPUTS), base_samples, seed)
+        with cls._lock:
+            cached = cls._cache.get(key)
+            if cached is not None:
+                cls._cache.move_to_end(key)
+                return dict(cached, cached=True)
+
+        started = time.perf_counter()
+        a_unit, b_unit, sampling = _base_matrices(base_samples, seed)
+        lower = np.array([envelope[name][0] for name in INPUTS])
+        width = np.array([envelope[name][1] - envelope[name][0] for name in INPUTS])
+
+        def evaluate(matrix: np.ndarray) -> np.ndarray:
+            values = lower + matrix * width
+            return CorrosionModelTrainer.predict(
+                values[:, 2], values[:, 0] + 273.15, values[:, 1], parameters
+            )
+
+        # Sums are taken around a fixed shift so the variance does not cancel catastrophically
+        shift = float(np.mean(evaluate(a_unit[:min(base_samples, 1024)])))
+
+        def chunk_sums(start: int) -> Dict[str, np.ndarray]:
+            a = a_unit[start:start + CHUNK_ROWS]
+            b = b_unit[start:start + CHUNK_ROWS]
+            f_a, f_b = evaluate(a) - shift, evaluate(b) - shift
+            first, total = np.zeros(len(INPUTS)), np.zeros(len(INPUTS))
+            for i in range(len(INPUTS)):
+                ab = a.copy()
+                ab[:, i] = b[:, i]
+                f_ab = evaluate(ab) - shift
+                first[i] = np.sum(f_b * (f_ab - f_a))
+                total[i] = np.sum((f_a - f_ab) ** 2)
+            both = np.concatenate([f_a, f_b])
+            return {'count': a.shape[0], 'f': both.sum(), 'f2': np.sum(both * both),
+                    'first': first, 'total': total}
+
+        starts = range(0, base_samples, CHUNK_ROWS)
+        workers = workers or Config.SENSITIVITY_WORKERS
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                parts = list(pool.map(chunk_sums, starts))
+        else:
+            parts = [chunk_sums(start) for start in starts]
+        sums = {name: sum(part[name] for part in parts) for name in _SUM_KEYS}
+
+        count = sums['count']
+        mean = sums['f'] / (2 * count)
+        variance = sums['f2'] / (2 * count) - mean ** 2
+        if variance > 0:
+            first_order = sums['first'] / count / variance
+            total = sums['total'] / count / (2 * variance)
+        else:
+            first_order = total = np.zeros(len(INPUTS))
+
+        indices = {
+            name: {'first_order': round(float(first_order[i]), 4), 'total': round(float(total[i]), 4)}
+            for i, name in enumerate(INPUTS)
+        }
+        result = {
+            'indices': indices,
+            'ranking': sorted(INPUTS, key=lambda name: -indices[name]['total']),
+            'rate_mean': float(mean + shift),
+            'rate_variance': float(variance),
+            'envelope': {name: list(envelope[name]) for name in INPUTS},
+            'base_samples': base_samples,
+            'evaluations': base_samples * (len(INPUTS) + 2),
+            'sampling': sampling,
+            'seed': seed,
+            'model_version': model_version,
+            'seconds': round(time.perf_counter() - started, 4),
+        }
+        with cls._lock:
+            cls._cache[key] = result
+            while len(cls._cache) > CACHE_SIZE:
+                cls._cache.popitem(last=False)
+        return dict(result, cached=False)
+
+    @classmethod
+    def clear(cls) -> None:
+        with cls._lock:
+            cls._cache.clear()
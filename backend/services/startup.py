@@ -0,0 +1,108 @@
+import logging
+import sys
+import threading
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+HEAVY_MODULES = ('numpy', 'pandas', 'scipy', 'matplotlib', 'seaborn')
+
+
+class Startup:
+    """
+    Two-phase application start-up.
+
+    Importing ``app`` only registers routes. ``warm_up`` then loads the model
+    (training it if the JSON is missing), opens the database pool, imports
+    the data libraries used by uploads and runs one prediction, so the first
+    real request does not pay for any of it. ``/api/ready`` reports the result.
+    """
+
+    _phases: Dict[str, Dict] = {}
+    _ready = False
+    _lock = threading.Lock()
+
+    @classmethod
+    def record_import(cls, seconds: float) -> None:
+        cls._phases['import'] = {
+            'seconds': round(seconds, 4),
+            'heavy_modules_loaded': [name for name in HEAVY_MODULES if name in sys.modules],
+        }
+
+    @classmethod
+    def _run_step(cls, name: str, func) -> bool:
+        started = time.perf_counter()
+        try:
+            func()
+        except Exception as e:
+            logger.error(f"Warm-up step {name} failed: {e}")
+            cls._phases[name] = {
+                'seconds': round(time.perf_counter() - started, 4),
+                'ok': False,
+                'error': str(e),
+            }
+            return False
+        cls._phases[name] = {'seconds': round(time.perf_counter() - started, 4), 'ok': True}
+        return True
+
+    @classmethod
+    def warm_up(cls, db=None) -> bool:
+        """Run every warm-up step once and return whether the service is ready."""
+        try:
+            from services.corrosion_calculator import CorrosionRateCalculator
+        except ModuleNotFoundError:
+            from backend.services.corrosion_calculator import CorrosionRateCalculator
+
+        def load_model():
+            if not CorrosionRateCalculator._load_or_train_model():
+                raise RuntimeError('No trained model is available')
+
+        def import_data_libraries():
+            import pandas  # noqa: F401  (used by uploads and training)
+            try:
+                from scipy.stats import qmc  # noqa: F401  (Sobol sampling for sensitivity analysis)
+            except ImportError:
+                pass  # sensitivity analysis falls back to pseudo-random sampling
+
+        def touch_prediction():
+            CorrosionRateCalculator.calculate_corrosion_rate(
+                material='API 5L X65', temperature=25.0, ph=7.0, nacl_percentage=3.5
+            )
+
+        with cls._lock:
+            started = time.perf_counter()
+            steps = [
+                ('model', load_model),
+                ('data_libraries', import_data_libraries),
+                ('prediction', touch_prediction),
+            ]
+            if db is not None:
+                steps.insert(1, ('database', db.warm_up))
+
+            ok = True
+            for name, func in steps:
+                ok = cls._run_step(name, func) and ok
+
+            cls._phases['warm_up_total'] = {'seconds': round(time.perf_counter() - started, 4)}
+            cls._ready = ok
+            logger.info(f"Warm-up finished in {cls._phases['warm_up_total']['seconds']}s, ready={ok}")
+            return ok
+
+    @classmethod
+    def warm_up_in_background(cls, db=None) -> threading.Thread:
+        thread = threading.Thread(target=cls.warm_up, args=(db,), name='warm-up', daemon=True)
+        thread.start()
+        return thread
+
+    @classmethod
+    def is_ready(cls) -> bool:
+        return cls._ready
+
+    @classmethod
+    def report(cls, model_version: Optional[str] = None) -> Dict:
+        return {
+            'ready': cls._ready,
+            'model_version': model_version,
+            'phases': dict(cls._phases),
+        }
@@ -0,0 +1,184 @@
+"""
+Bounded-size pH and temperature series for ``/api/statistics``.
+
+Both apps run the same two steps per series: a range query (distinct
+values, min, max), then either an exact GROUP BY when the axis has few
+distinct values or a GROUP BY over fixed-width bins computed in SQL. The
+resulting points carry count/mean/min/max and are reduced with
+largest-triangle-three-buckets (LTTB) when there are still more than
+``max_points``, so the payload never grows with the data.
+"""
+
+import math
+from typing import Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+RATE_COLUMN = 'corrosion_rate_mm_per_yr'
+
+# Response key -> numeric axis column
+SERIES = {
+    'ph_vs_rate': 'ph',
+    'temperature_vs_rate': 'temperature',
+}
+
+DEFAULT_MAX_POINTS = 200
+MAX_POINTS_LIMIT = 5000
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Indices of the points kept by largest-triangle-three-buckets downsampling.
+
+    Keeps the first and last point and, from each of ``threshold - 2``
+    equal-size buckets in between, the point forming the largest triangle
+    with the previously kept point and the average of the next bucket.
+    """
+    count = len(x)
+    if threshold >= count or threshold < 3:
+        return np.arange(count)
+
+    edges = np.linspace(1, count - 1, threshold - 1).astype(int)
+    kept = np.empty(threshold, dtype=int)
+    kept[0], kept[-1] = 0, count - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_start, next_end = end, edges[bucket + 2] if bucket + 2 < len(edges) else count
+        next_x = x[next_start:next_end].mean()
+        next_y = y[next_start:next_end].mean()
+        area = np.abs(
+            (x[previous] - next_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (next_y - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        kept[bucket + 1] = previous
+    return kept
+
+
+class StatisticsSeries:
+    """Query building and post-processing shared by the Flask and async statistics endpoints."""
+
+    @staticmethod
+    def parse_options(args: Mapping[str, str]) -> Dict:
+        """
+        Read ``max_points``, ``bins`` and ``bin_width`` from the request.
+
+        ``bins`` and ``bin_width`` force binning; without them an axis is only
+        binned (into ``max_points`` bins) when it has more distinct values.
+        Raises ValueError for invalid values.
+        """
+        max_points = int(args.get('max_points', DEFAULT_MAX_POINTS))
+        if not 3 <= max_points <= MAX_POINTS_LIMIT:
+            raise ValueError(f"max_points must be between 3 and {MAX_POINTS_LIMIT}")
+        bins = int(args['bins']) if args.get('bins') else None
+        if bins is not None and not 1 <= bins <= MAX_POINTS_LIMIT:
+            raise ValueError(f"bins must be between 1 and {MAX_POINTS_LIMIT}")
+        bin_width = float(args['bin_width']) if args.get('bin_width') else None
+        if bin_width is not None and not bin_width > 0:
+            raise ValueError("bin_width must be positive")
+        return {'max_points': max_points, 'bins': bins, 'bin_width': bin_width}
+
+    @staticmethod
+    def range_query(column: str) -> str:
+        return f"""
+            SELECT COUNT(DISTINCT {column}) AS distinct_values,
+                   MIN({column}) AS min_value, MAX({column}) AS max_value
+            FROM corrosion_samples
+            WHERE {column} IS NOT NULL AND {RATE_COLUMN} IS NOT NULL
+        """
+
+    @staticmethod
+    def series_query(column: str, range_row: Dict, options: Dict) -> Tuple[Optional[str], tuple, Dict]:
+        """
+        Pick exact or binned grouping from the range row.
+
+        Returns ``(query, params, plan)``; ``query`` is None when there is no data.
+        """
+        distinct = int(range_row.get('distinct_values') or 0)
+        plan = {'distinct_values': distinct, 'binned': False}
+        if distinct == 0:
+            return None, (), plan
+
+        lower, upper = float(range_row['min_value']), float(range_row['max_value'])
+        wants_bins = options['bins'] is not None or options['bin_width'] is not None
+        if (not wants_bins and distinct <= options['max_points']) or upper <= lower:
+            query = f"""
+                SELECT {column} AS x_value, COUNT(*) AS count, SUM({RATE_COLUMN}) AS rate_total,
+                       MIN({RATE_COLUMN}) AS min_rate, MAX({RATE_COLUMN}) AS max_rate
+                FROM corrosion_samples
+                WHERE {column} IS NOT NULL AND {RATE_COLUMN} IS NOT NULL
+                GROUP BY {column}
+                ORDER BY {column}
+            """
+            return query, (), plan
+
+        width = options['bin_width'] or (upper - lower) / (options['bins'] or options['max_points'])
+        plan.update({'binned': True, 'lower': lower, 'bin_width': width,
+                     'bins': max(1, math.ceil((upper - lower) / width))})
+        query = f"""
+            SELECT FLOOR(({column} - %s) / %s) AS bin_index, COUNT(*) AS count,
+                   SUM({column}) AS x_total, SUM({RATE_COLUMN}) AS rate_total,
+                   MIN({RATE_COLUMN}) AS min_rate, MAX({RATE_COLUMN}) AS max_rate
+            FROM corrosion_samples
+            WHERE {column} IS NOT NULL AND {RATE_COLUMN} IS NOT NULL
+            GROUP BY bin_index
+            ORDER BY bin_index
+        """
+        return query, (lower, width), plan
+
+    @staticmethod
+    def build_points(column: str, rows: List[Dict], plan: Dict, options: Dict) -> List[Dict]:
+        """
+        Turn grouped rows into ``{column, avg_rate, count, min_rate, max_rate}``
+        points (plus ``bin_start``/``bin_end`` when binned), then apply LTTB
+        if there are more than ``max_points``.
+        """
+        points = []
+        if plan['binned']:
+            # The maximum lands exactly on the upper edge; fold it into the last bin.
+            merged = {}
+            for row in rows:
+                index = min(int(row['bin_index']), plan['bins'] - 1)
+                bucket = merged.setdefault(index, [0, 0.0, 0.0, math.inf, -math.inf])
+                bucket[0] += int(row['count'])
+                bucket[1] += float(row['x_total'])
+                bucket[2] += float(row['rate_total'])
+                bucket[3] = min(bucket[3], float(row['min_rate']))
+                bucket[4] = max(bucket[4], float(row['max_rate']))
+            for index in sorted(merged):
+                count, x_total, rate_total, min_rate, max_rate = merged[index]
+                start = plan['lower'] + index * plan['bin_width']
+                points.append({
+                    column: round(x_total / count, 4),
+                    'avg_rate': rate_total / count,
+                    'count': count,
+                    'min_rate': min_rate,
+                    'max_rate': max_rate,
+                    'bin_start': round(start, 6),
+                    'bin_end': round(start + plan['bin_width'], 6),
+                })
+        else:
+            for row in rows:
+                count = int(row['count'])
+                points.append({
+                    column: float(row['x_value']),
+                    'avg_rate': float(row['rate_total']) / count,
+                    'count': count,
+                    'min_rate': float(row['min_rate']),
+                    'max_rate': float(row['max_rate']),
+                })
+
+        if len(points) > options['max_points']:
+            x = np.array([p[column] for p in points], dtype=float)
+            y = np.array([p['avg_rate'] for p in points], dtype=float)
+            points = [points[i] for i in lttb(x, y, options['max_points'])]
+            plan['downsampled'] = True
+        plan['points'] = len(points)
+        return points
+
+    @staticmethod
+    def describe(plan: Dict) -> Dict:
+        """Resolution metadata returned next to each series."""
+        keys = ('distinct_values', 'binned', 'bin_width', 'bins', 'points', 'downsampled')
+        return {key: plan[key] for key in keys if key in plan}
@@ -0,0 +1,137 @@
+"""
+Readers for tabular sample files: CSV, Parquet and Arrow IPC (Feather v2).
+
+Parquet and Arrow files are read with pyarrow's dataset API: only the
+requested columns are decoded, and filters on numeric columns are pushed
+down (Parquet row groups whose statistics rule a filter out are skipped).
+CSV files are read with pandas, as before.
+"""
+
+import operator
+import os
+from typing import TYPE_CHECKING, Iterator, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+FORMATS = {
+    '.csv': 'csv',
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.arrow': 'arrow',
+    '.feather': 'arrow',
+    '.ipc': 'arrow',
+}
+
+# (column, operator, value); operator is one of FILTER_OPERATORS
+Filter = Tuple[str, str, object]
+FILTER_OPERATORS = {
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le,
+    '==': operator.eq,
+    '!=': operator.ne,
+}
+
+
+def file_format(path: str) -> str:
+    """csv, parquet or arrow from the file extension; raises ValueError otherwise."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f"Unsupported file type {extension or path!r}; use .csv, .parquet or .arrow")
+    return FORMATS[extension]
+
+
+def _dataset(path: str):
+    try:
+        import pyarrow.dataset as ds
+    except ImportError as e:
+        raise ValueError("Reading Parquet and Arrow files requires pyarrow") from e
+    return ds.dataset(path, format='parquet' if file_format(path) == 'parquet' else 'ipc')
+
+
+def column_names(path: str) -> List[str]:
+    """Column names without reading any rows."""
+    if file_format(path) == 'csv':
+        import pandas as pd
+
+        return list(pd.read_csv(path, nrows=0).columns)
+    return list(_dataset(path).schema.names)
+
+
+def _filter_expression(dataset, filters: Sequence[Filter]):
+    """Pushdown expression for the filters on numeric columns (others are left to the caller)."""
+    import pyarrow.dataset as ds
+    import pyarrow.types as pa_types
+
+    expression = None
+    for column, op, value in filters:
+        field = dataset.schema.field(column)
+        if not (pa_types.is_integer(field.type) or pa_types.is_floating(field.type)):
+            continue
+        term = FILTER_OPERATORS[op](ds.field(column), value)
+        expression = term if expression is None else expression & term
+    return expression
+
+
+def read_table(
+    path: str,
+    columns: Optional[Sequence[str]] = None,
+    filters: Sequence[Filter] = (),
+) -> "pd.DataFrame":
+    """
+    ``columns`` of ``path`` (all when None) as a DataFrame.
+
+    Rows failing ``filters`` are dropped where the filtered column is
+    numeric in the file; CSV files and text columns are returned unfiltered.
+    """
+    if file_format(path) == 'csv':
+        import pandas as pd
+
+        return pd.read_csv(path, usecols=list(columns) if columns is not None else None)
+
+    dataset = _dataset(path)
+    table = dataset.to_table(
+        columns=list(columns) if columns is not None else None,
+        filter=_filter_expression(dataset, filters) if filters else None,
+    )
+    return table.to_pandas()
+
+
+def read_chunks(path: str, chunk_rows: int, block_bytes: int = 32 * 1024 * 1024) -> Iterator["pd.DataFrame"]:
+    """
+    Every column of ``path`` in chunks of about ``chunk_rows`` rows (CSV
+    chunks are about ``block_bytes`` of text when pyarrow is installed).
+
+    CSV columns are returned as text, with empty cells as nulls: types
+    inferred per block would differ between chunks, and a column that is
+    empty in the first block would be typed null and fail on a later value.
+    Callers parse the columns they use (see ``CSVProcessor.extract_columns``).
+    """
+    fmt = file_format(path)
+    if fmt != 'csv':
+        for batch in _dataset(path).to_batches(batch_size=chunk_rows):
+            if batch.num_rows:
+                yield batch.to_pandas()
+        return
+
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+    except ImportError:
+        import pandas as pd
+
+        yield from pd.read_csv(path, chunksize=chunk_rows, dtype=str)
+        return
+    columns = column_names(path)
+    reader = pa_csv.open_csv(
+        path,
+        read_options=pa_csv.ReadOptions(block_size=block_bytes),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={name: pa.string() for name in columns},
+            strings_can_be_null=True,
+        ),
+    )
+    for batch in reader:
+        yield batch.to_pandas()
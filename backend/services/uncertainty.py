@@ -0,0 +1,275 @@
+"""
+Monte Carlo propagation of input uncertainty through the corrosion models.
+
+Each input (temperature, pH, NaCl) is a fixed number or a distribution:
+
+    {"distribution": "normal", "mean": 40, "std": 2}
+    {"distribution": "uniform", "min": 6.0, "max": 7.0}
+    {"distribution": "triangular", "min": 3.0, "mode": 3.5, "max": 4.5}
+    {"distribution": "histogram", "edges": [20, 30, 40, 50], "counts": [5, 12, 3]}
+
+Samples are drawn and evaluated in chunks. Only running moments, exact
+exceedance counts and a log-spaced histogram of the rate are kept, so memory
+does not grow with the number of samples. Percentiles are read from the
+histogram and are within ``QUANTILE_RELATIVE_ERROR`` of the exact values.
+"""
+
+import math
+import time
+from typing import Dict, Mapping, Optional, Sequence
+
+import numpy as np
+
+try:
+    from config import Config
+    from services.corrosion_calculator import CorrosionRateCalculator
+    from services.model_trainer import CorrosionModelTrainer
+except ModuleNotFoundError:
+    from backend.config import Config
+    from backend.services.corrosion_calculator import CorrosionRateCalculator
+    from backend.services.model_trainer import CorrosionModelTrainer
+
+INPUTS = ('temperature', 'ph', 'nacl_percentage')
+DISTRIBUTIONS = ('normal', 'uniform', 'triangular', 'histogram')
+
+# Physical limits samples are clipped to
+INPUT_LIMITS = {
+    'temperature': (-273.15, math.inf),
+    'ph': (0.0, 14.0),
+    'nacl_percentage': (0.0, math.inf),
+}
+
+DEFAULT_SAMPLES = 100_000
+CHUNK_SAMPLES = 65_536
+DEFAULT_PERCENTILES = (0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+# Rate histogram: log-spaced bins from the model floor up to 1000 mm/yr
+HISTOGRAM_LOW, HISTOGRAM_HIGH, HISTOGRAM_BINS = 1e-6, 1e3, 8192
+QUANTILE_RELATIVE_ERROR = 10 ** ((math.log10(HISTOGRAM_HIGH) - math.log10(HISTOGRAM_LOW)) / HISTOGRAM_BINS) - 1
+
+
+class InputDistribution:
+    """One uncertain input; ``sample(rng, size)`` draws values."""
+
+    def __init__(self, name: str, spec):
+        self.name = name
+        if not isinstance(spec, Mapping):
+            self.kind, self.value = 'fixed', float(spec)
+            return
+
+        self.kind = spec.get('distribution')
+        if self.kind not in DISTRIBUTIONS:
+            raise ValueError(f"{name}: distribution must be one of {', '.join(DISTRIBUTIONS)}")
+        try:
+            self._parse(spec)
+        except KeyError as e:
+            raise ValueError(f"{name}: {self.kind} distribution needs {e}") from e
+
+    def _parse(self, spec: Mapping) -> None:
+        name = self.name
+        if self.kind == 'normal':
+            self.mean, self.std = float(spec['mean']), float(spec['std'])
+            if self.std < 0:
+                raise ValueError(f"{name}: std must not be negative")
+        elif self.kind == 'uniform':
+            self.low, self.high = float(spec['min']), float(spec['max'])
+            if not self.low <= self.high:
+                raise ValueError(f"{name}: min must not exceed max")
+        elif self.kind == 'triangular':
+            self.low, self.mode, self.high = float(spec['min']), float(spec['mode']), float(spec['max'])
+            if not self.low <= self.mode <= self.high or self.low == self.high:
+                raise ValueError(f"{name}: need min <= mode <= max and min < max")
+        else:
+            self.edges = np.asarray(spec['edges'], dtype=float)
+            counts = np.asarray(spec['counts'], dtype=float)
+            if self.edges.size != counts.size + 1 or counts.size == 0:
+                raise ValueError(f"{name}: histogram needs one more edge than counts")
+            if np.any(np.diff(self.edges) <= 0) or np.any(counts < 0) or counts.sum() <= 0:
+                raise ValueError(f"{name}: edges must increase and counts be non-negative")
+            self.probabilities = counts / counts.sum()
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        if self.kind == 'fixed':
+            return np.full(size, self.value)
+        if self.kind == 'normal':
+            return rng.normal(self.mean, self.std, size)
+        if self.kind == 'uniform':
+            return rng.uniform(self.low, self.high, size)
+        if self.kind == 'triangular':
+            return rng.triangular(self.low, self.mode, self.high, size)
+        # Histogram: pick a bin by weight, then uniform within it
+        bins = rng.choice(self.probabilities.size, size=size, p=self.probabilities)
+        return self.edges[bins] + rng.random(size) * (self.edges[bins + 1] - self.edges[bins])
+
+    def mean_value(self) -> float:
+        if self.kind == 'fixed':
+            return self.value
+        if self.kind == 'normal':
+            return self.mean
+        if self.kind == 'uniform':
+            return (self.low + self.high) / 2
+        if self.kind == 'triangular':
+            return (self.low + self.mode + self.high) / 3
+        centres = (self.edges[:-1] + self.edges[1:]) / 2
+        return float(np.dot(centres, self.probabilities))
+
+    def describe(self) -> Dict:
+        if self.kind == 'fixed':
+            return {'distribution': 'fixed', 'value': self.value}
+        fields = {
+            'normal': ('mean', 'std'),
+            'uniform': ('low', 'high'),
+            'triangular': ('low', 'mode', 'high'),
+            'histogram': (),
+        }[self.kind]
+        description = {'distribution': self.kind, 'mean': round(self.mean_value(), 6)}
+        description.update({field: getattr(self, field) for field in fields})
+        return description
+
+
+class UncertaintyPropagation:
+    """Vectorized Monte Carlo runs of the calculator's models."""
+
+    @staticmethod
+    def is_probabilistic(data: Mapping) -> bool:
+        """True when a calculation request asks for the Monte Carlo mode."""
+        return 'monte_carlo' in data or any(isinstance(data.get(name), Mapping) for name in INPUTS)
+
+    @classmethod
+    def run(
+        cls,
+        inputs: Mapping,
+        material: str = '',
+        medium: Optional[str] = None,
+        samples: int = DEFAULT_SAMPLES,
+        thresholds: Sequence[float] = (),
+        percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+        seed: Optional[int] = None,
+    ) -> Dict:
+        """
+        Propagate the input distributions and summarize the rate distribution.
+
+        The model is chosen like the calculator does: the trained model when
+        NaCl is given and positive on average, the legacy model otherwise.
+        Raises ValueError for invalid distributions or options.
+        """
+        if not 1 <= samples <= Config.MONTE_CARLO_MAX_SAMPLES:
+            raise ValueError(f"samples must be between 1 and {Config.MONTE_CARLO_MAX_SAMPLES}")
+        if any(not 0 <= p <= 1 for p in percentiles):
+            raise ValueError("percentiles must be between 0 and 1")
+        thresholds = [float(t) for t in thresholds]
+
+        distributions = {}
+        for name in INPUTS:
+            if inputs.get(name) is not None:
+                distributions[name] = InputDistribution(name, inputs[name])
+        if 'temperature' not in distributions:
+            raise ValueError("temperature is required")
+        if 'ph' not in distributions:
+            distributions['ph'] = InputDistribution('ph', 7.0)
+
+        model_data = CorrosionRateCalculator._load_or_train_model()
+        nacl = distributions.get('nacl_percentage')
+        use_learned = model_data is not None and nacl is not None and nacl.mean_value() > 0
+
+        started = time.perf_counter()
+        rng = np.random.default_rng(seed)
+        edges = np.logspace(math.log10(HISTOGRAM_LOW), math.log10(HISTOGRAM_HIGH), HISTOGRAM_BINS + 1)
+        histogram = np.zeros(HISTOGRAM_BINS, dtype=np.int64)
+        exceed = np.zeros(len(thresholds), dtype=np.int64)
+        clipped = {name: 0 for name in distributions}
+        total = total_squares = 0.0
+        low, high = math.inf, -math.inf
+        # Moments are summed around the first chunk's mean to keep the variance accurate
+        shift = None
+
+        for start in range(0, samples, CHUNK_SAMPLES):
+            size = min(CHUNK_SAMPLES, samples - start)
+            values = {}
+            for name, distribution in distributions.items():
+                drawn = distribution.sample(rng, size)
+                lower, upper = INPUT_LIMITS[name]
+                outside = (drawn < lower) | (drawn > upper)
+                clipped[name] += int(outside.sum())
+                values[name] = np.clip(drawn, lower, upper)
+
+            if use_learned:
+                rates = CorrosionModelTrainer.predict(
+                    values['nacl_percentage'], values['temperature'] + 273.15, values['ph'],
+                    model_data['parameters'],
+                )
+            else:
+                rates = CorrosionRateCalculator.legacy_rate(
+                    values['temperature'], values['ph'], values.get('nacl_percentage'), material, medium,
+                )
+                rates = np.broadcast_to(rates, (size,))
+
+            if shift is None:
+                shift = float(rates.mean())
+            centred = rates - shift
+            total += float(centred.sum())
+            total_squares += float(np.dot(centred, centred))
+            low, high = min(low, float(rates.min())), max(high, float(rates.max()))
+            for i, threshold in enumerate(thresholds):
+                exceed[i] += int(np.count_nonzero(rates > threshold))
+            index = np.searchsorted(edges, rates, side='right') - 1
+            histogram += np.bincount(np.clip(index, 0, HISTOGRAM_BINS - 1), minlength=HISTOGRAM_BINS)
+
+        mean = shift + total / samples
+        variance = (total_squares - total * total / samples) / (samples - 1) if samples > 1 else 0.0
+        cumulative = np.cumsum(histogram)
+        rate_summary = {
+            'mean': round(mean, 6),
+            'std': round(math.sqrt(max(variance, 0.0)), 6),
+            'min': round(low, 6),
+            'max': round(high, 6),
+        }
+        for fraction in percentiles:
+            rate_summary[f"p{fraction * 100:g}"] = round(
+                cls._histogram_quantile(cumulative, edges, fraction, low, high), 6
+            )
+
+        exceedance = []
+        for threshold, count in zip(thresholds, exceed):
+            probability = count / samples
+            # Normal-approximation standard error of the estimated probability
+            exceedance.append({
+                'threshold_mm_per_yr': threshold,
+                'probability': round(float(probability), 6),
+                'standard_error': round(math.sqrt(probability * (1 - probability) / samples), 6),
+            })
+
+        point = CorrosionRateCalculator.calculate_corrosion_rate(
+            material=material or '',
+            temperature=distributions['temperature'].mean_value(),
+            ph=distributions['ph'].mean_value(),
+            nacl_percentage=nacl.mean_value() if nacl is not None else None,
+            medium=medium,
+        )
+        return {
+            'mode': 'monte_carlo',
+            'samples': samples,
+            'seed': seed,
+            'model': 'arrhenius_power_law' if use_learned else 'legacy_empirical',
+            'inputs': {name: d.describe() for name, d in distributions.items()},
+            'clipped_samples': {name: count for name, count in clipped.items() if count},
+            'rate_mm_per_yr': rate_summary,
+            'rate_mpy_mean': round(mean * 39.37, 4),
+            'exceedance': exceedance,
+            'quantile_relative_error': round(QUANTILE_RELATIVE_ERROR, 5),
+            'point_estimate_at_means': point['corrosion_rate_mm_per_yr'],
+            'seconds': round(time.perf_counter() - started, 4),
+        }
+
+    @staticmethod
+    def _histogram_quantile(cumulative, edges, fraction, low, high) -> float:
+        """Quantile read from the histogram (geometric interpolation within the bin)."""
+        total = cumulative[-1]
+        rank = fraction * total
+        index = int(np.searchsorted(cumulative, rank, side='left'))
+        index = min(index, cumulative.size - 1)
+        before = cumulative[index - 1] if index else 0
+        in_bin = cumulative[index] - before
+        position = (rank - before) / in_bin if in_bin else 0.5
+        value = edges[index] * (edges[index + 1] / edges[index]) ** position
+        return float(min(max(value, low), high))
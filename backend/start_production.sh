@@ -0,0 +1,21 @@
+#!/bin/bash
+
+# Script to start the Flask backend with multiple worker processes (production)
+
+echo "Starting Corrosion Rate Backend (production)..."
+
+if [ ! -d "venv" ]; then
+    echo "Creating virtual environment..."
+    python3 -m venv venv
+fi
+
+source venv/bin/activate
+
+if [ ! -f "venv/.deps_installed" ]; then
+    echo "Installing dependencies..."
+    pip install -r requirements.txt
+    touch venv/.deps_installed
+fi
+
+# Worker count defaults to the number of CPU cores; override with WEB_CONCURRENCY.
+exec gunicorn -c gunicorn.conf.py app:app
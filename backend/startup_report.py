@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Measure how long importing the API takes and which modules dominate it."""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from services.startup import HEAVY_MODULES
+
+
+def measure_imports(module: str = "app"):
+    """Import ``module`` in a fresh interpreter with ``-X importtime`` and parse the log."""
+    probe = (
+        "import json, sys, time\n"
+        "started = time.perf_counter()\n"
+        f"import {module}\n"
+        "elapsed = time.perf_counter() - started\n"
+        f"print(json.dumps({{'seconds': elapsed, 'heavy': [m for m in {list(HEAVY_MODULES)!r} "
+        "if m in sys.modules]}))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        # Nested imports are indented by two spaces per level after the "| " separator
+        indent = len(name) - len(name.lstrip(" "))
+        modules.append(
+            {
+                "module": name.strip(),
+                "depth": max(indent - 1, 0) // 2,
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+            }
+        )
+    summary = json.loads(result.stdout.strip().splitlines()[-1])
+    return summary, modules
+
+
+def direct_imports(modules, module: str):
+    """Entries imported directly by ``module`` (children are logged before their parent)."""
+    children = []
+    for entry in modules:
+        if entry["depth"] == 0:
+            if entry["module"] == module:
+                return children
+            children = []
+        elif entry["depth"] == 1:
+            children.append(entry)
+    return []
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--module", default="app")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--output", help="Write the report as JSON")
+    args = parser.parse_args()
+
+    summary, modules = measure_imports(args.module)
+    top_level = direct_imports(modules, args.module)
+    slowest = sorted(top_level, key=lambda m: m["cumulative_ms"], reverse=True)[: args.top]
+
+    report = {
+        "module": args.module,
+        "import_seconds": round(summary["seconds"], 4),
+        "heavy_modules_loaded": summary["heavy"],
+        "slowest_top_level_imports": slowest,
+    }
+
+    print(f"Importing {args.module} took {report['import_seconds'] * 1000:.1f} ms")
+    print(f"Heavy modules loaded: {', '.join(report['heavy_modules_loaded']) or 'none'}")
+    for entry in slowest:
+        print(f"  {entry['cumulative_ms']:9.1f} ms  {entry['module']}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
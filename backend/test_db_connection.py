@@ -13,6 +13,9 @@ def test_connection():
     print("=" * 50)
     print()
     
+    if Config.DB_BACKEND.lower() == 'sqlite':
+        return test_sqlite_database()
+
     # Test config
     print("📋 إعدادات قاعدة البيانات:")
     db_config = Config.get_db_config()
@@ -91,6 +94,22 @@ def test_connection():
         print()
         return False
 
+def test_sqlite_database():
+    print(f"📋 قاعدة بيانات SQLite المدمجة: {Config.SQLITE_PATH}")
+    print()
+    try:
+        db = DatabaseConnection()
+        required_tables = ['corrosion_samples', 'calculated_corrosion_rates', 'csv_uploads']
+        for table in required_tables:
+            result = db.execute_query(f"SELECT COUNT(*) as count FROM {table}")
+            print(f"   ✅ {table} ({result[0]['count']} صف)")
+        print()
+        print("✅ كل شيء يعمل بشكل صحيح!")
+        return True
+    except Exception as e:
+        print(f"❌ خطأ في قاعدة بيانات SQLite: {e}")
+        return False
+
 if __name__ == "__main__":
     success = test_connection()
     sys.exit(0 if success else 1)
@@ -14,6 +14,9 @@ class ApiService {
   // static const String baseUrl = 'http://localhost:5001/api';  // Web/Desktop
   // static const String baseUrl = 'http://192.168.0.14:5001/api';  // Physical devices or iOS Simulator
 
+  // How long to wait for a background job (e.g. clearing the database) before giving up
+  static const Duration jobTimeout = Duration(minutes: 10);
+
   Future<List<CorrosionSample>> getSamples({
     String? material,
     double? minTemp,
@@ -196,12 +199,29 @@ class ApiService {
     try {
       final response = await http.delete(Uri.parse('$baseUrl/clear-database'));
 
-      if (response.statusCode == 200) {
-        return json.decode(response.body);
-      } else {
+      if (response.statusCode != 202) {
         final error = json.decode(response.body);
         throw Exception(error['error'] ?? 'Failed to clear database');
       }
+
+      // Clearing runs as a background job on the server; poll until it finishes.
+      final jobId = json.decode(response.body)['job']['id'];
+      final deadline = DateTime.now().add(jobTimeout);
+      while (DateTime.now().isBefore(deadline)) {
+        final jobResponse = await http.get(Uri.parse('$baseUrl/jobs/$jobId'));
+        final job = json.decode(jobResponse.body);
+        if (jobResponse.statusCode != 200) {
+          throw Exception(job['error'] ?? 'Failed to read clear job status');
+        }
+        if (job['status'] == 'completed') {
+          return Map<String, dynamic>.from(job['result'] ?? {});
+        }
+        if (job['status'] == 'failed') {
+          throw Exception(job['error'] ?? 'Failed to clear database');
+        }
+        await Future.delayed(const Duration(milliseconds: 500));
+      }
+      throw Exception('Timed out waiting for the database clear to finish');
     } catch (e) {
       throw Exception('Error clearing database: $e');
     }